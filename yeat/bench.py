@@ -0,0 +1,107 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import gzip
+import json
+from pathlib import Path
+from statistics import median
+import subprocess
+import time
+import toml
+from yeat.config.config import AssemblyConfiguration
+from yeat.workflow import get_config_data, snakemake_command, write_snakemake_config
+
+BENCH_ALGORITHMS = ("spades", "megahit", "unicycler", "flye")
+BENCH_READ_TYPES = ("illumina", "ont_simplex")
+PHASES = ("load", "parse", "targets", "dag")
+STUB_READ = "@read1\nACGT\n+\nIIII\n"
+WORKFLOW_SETTINGS = {
+    "seed": 1,
+    "threads": 1,
+    "dry_run": True,
+    "copy_input": False,
+    "checksum": None,
+    "max_mem_mb": None,
+    "compression_level": 6,
+    "temp_intermediates": False,
+    "project_quast": False,
+    "pipelined": False,
+}
+
+
+def synthetic_config_data(num_samples, algorithms, read_types=BENCH_READ_TYPES):
+    samples = dict()
+    for i in range(num_samples):
+        data = {read_type: [f"reads/sample{i}_{read_type}.fastq.gz"] for read_type in read_types}
+        samples[f"sample{i}"] = data
+    assemblers = {f"{algorithm}_default": {"algorithm": algorithm} for algorithm in algorithms}
+    return {"samples": samples, "assemblers": assemblers}
+
+
+def write_stub_config(workdir, num_samples, algorithms, read_types=BENCH_READ_TYPES):
+    workdir = Path(workdir)
+    (workdir / "reads").mkdir(parents=True, exist_ok=True)
+    data = synthetic_config_data(num_samples, algorithms, read_types)
+    for sample in data["samples"].values():
+        for read_type, fastqs in sample.items():
+            fastq = workdir / fastqs[0]
+            if not fastq.exists():
+                with gzip.open(fastq, "wt") as fh:
+                    fh.write(STUB_READ)
+            sample[read_type] = str(fastq)
+    config = workdir / "config.toml"
+    with open(config, "w") as fh:
+        toml.dump(data, fh)
+    return config
+
+
+def time_call(function, repeats=1):
+    timings, result = list(), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return median(timings), result
+
+
+def run_benchmark(num_samples, algorithms, workdir, repeats=3, dag=True):
+    case_dir = Path(workdir) / f"{num_samples}x{len(algorithms)}"
+    config = write_stub_config(case_dir, num_samples, algorithms)
+    timings = dict()
+    timings["load"], data = time_call(lambda: get_config_data(config), repeats)
+    parse = lambda: AssemblyConfiguration.parse_snakemake_config(data)
+    timings["parse"], asm_cfg = time_call(parse, repeats)
+    timings["targets"], _ = time_call(lambda: asm_cfg.targets, repeats)
+    if dag:
+        run_dir = str(case_dir / "wd")
+        snakemake_config = write_snakemake_config(data, run_dir, **WORKFLOW_SETTINGS)
+        command = snakemake_command(snakemake_config, run_dir, dry_run=True) + ["--quiet"]
+        dry_run = lambda: subprocess.run(command, capture_output=True, check=True)
+        timings["dag"], _ = time_call(dry_run, repeats)
+    return timings
+
+
+def compare_timings(results, baseline, tolerance=0.25):
+    regressions = list()
+    for case, timings in results.items():
+        for phase, elapsed in timings.items():
+            reference = baseline.get(case, {}).get(phase)
+            if reference and elapsed > reference * (1 + tolerance):
+                regressions.append((case, phase, reference, elapsed))
+    return regressions
+
+
+def read_results(path):
+    with open(path, "r") as fh:
+        return json.load(fh)
+
+
+def write_results(results, path):
+    with open(path, "w") as fh:
+        json.dump(results, fh, indent=4)
@@ -21,6 +21,15 @@ def main(args=None):
         workdir=args.workdir,
         dry_run=args.dry_run,
         copy_input=args.copy_input,
+        checksum=args.checksum,
+        mem_gb=args.mem_gb,
+        compression_level=args.compression_level,
+        temp_intermediates=args.temp_intermediates,
+        project_quast=args.project_quast,
+        pipelined=args.pipelined,
+        qc_cache=args.qc_cache,
+        qc_cache_size_gb=args.qc_cache_size_gb,
         slurm=args.slurm,
         max_jobs=args.jobs,
+        verbose=args.verbose,
     )
@@ -13,6 +13,7 @@ from pathlib import Path
 from random import randint
 import sys
 import toml
+from yeat.workflow.qc.aux import CHECKSUMS
 
 
 def get_parser(exit_on_error=True):
@@ -47,6 +48,11 @@ def options(parser):
         action="version",
         version=f"YEAT v{version('yeat')}",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="print timing information while loading the config file",
+    )
     parser.add_argument(
         "--init",
         action=InitAction,
@@ -73,6 +79,13 @@ def workflow_configuration(parser):
         metavar="T",
         type=int,
     )
+    workflow.add_argument(
+        "--mem-gb",
+        default=None,
+        help="maximum amount of memory in GB that concurrently running jobs may use; memory requests of individual jobs are capped at this value; by default, memory is not limited",
+        metavar="M",
+        type=int,
+    )
     workflow.add_argument(
         "-w",
         "--workdir",
@@ -90,7 +103,50 @@ def workflow_configuration(parser):
     workflow.add_argument(
         "--copy_input",
         action="store_true",
-        help="copy input Fastq files to the working directory to ensure complete data provenance; by default, input Fastq files are symbolically linked to the working directory",
+        help="copy input Fastq files to the working directory to ensure complete data provenance; copies are reflinked where the filesystem allows; by default, input Fastq files are symbolically linked to the working directory",
+    )
+    workflow.add_argument(
+        "--checksum",
+        choices=CHECKSUMS,
+        default=None,
+        help="record a checksum of each input Fastq file, computed with algorithm A while it is copied, in a file alongside the copy; by default, no checksum is recorded",
+        metavar="A",
+    )
+    workflow.add_argument(
+        "--compression-level",
+        choices=range(1, 10),
+        default=6,
+        help="gzip compression level L (1-9) for Fastq files written by quality control; by default, L=6",
+        metavar="L",
+        type=int,
+    )
+    workflow.add_argument(
+        "--qc-cache",
+        default=None,
+        help="directory of a quality control cache shared between runs and working directories; quality control results for unchanged inputs and settings are linked from the cache instead of being recomputed; by default, no cache is used",
+        metavar="DIR",
+    )
+    workflow.add_argument(
+        "--qc-cache-size-gb",
+        default=100,
+        help="evict the least recently used quality control results once the cache exceeds G gigabytes; by default, G=100",
+        metavar="G",
+        type=int,
+    )
+    workflow.add_argument(
+        "--temp-intermediates",
+        action="store_true",
+        help="write filtered reads with fast compression and delete them once downsampling is complete; by default, all intermediate Fastq files are kept",
+    )
+    workflow.add_argument(
+        "--project-quast",
+        action="store_true",
+        help="also run QUAST once across the assemblies of all samples; by default, QUAST runs once per sample",
+    )
+    workflow.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="run each sample's input copy, filtering, downsampling, and assembly ahead of reporting-only jobs (FastQC, QUAST, Bandage), one sample after another in config order, so that the first assemblies finish early; with --slurm, each sample's path to assembly is also submitted as a single group job; by default, jobs are scheduled without regard to sample",
     )
 
 
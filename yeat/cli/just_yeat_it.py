@@ -27,6 +27,14 @@ def main(args=None):
         workdir=args.workdir,
         dry_run=args.dry_run,
         copy_input=args.copy_input,
+        checksum=args.checksum,
+        mem_gb=args.mem_gb,
+        compression_level=args.compression_level,
+        temp_intermediates=args.temp_intermediates,
+        project_quast=args.project_quast,
+        pipelined=args.pipelined,
+        qc_cache=args.qc_cache,
+        qc_cache_size_gb=args.qc_cache_size_gb,
     )
 
 
@@ -108,6 +116,11 @@ def downsample_configuration(parser):
         metavar="C",
         type=check_positive,
     )
+    illumina.add_argument(
+        "--fused-downsample",
+        action="store_true",
+        help="filter and downsample in a single pass, writing only the downsampled reads; requires filtering and downsampling to be enabled",
+    )
 
 
 def check_positive(value):
@@ -170,6 +183,7 @@ def get_config_data(args):
                 "target_num_reads": args.target_num_reads,
                 "genome_size": args.genome_size,
                 "target_coverage_depth": args.target_coverage_depth,
+                "fused_downsample": args.fused_downsample,
             },
         },
         "assemblers": {
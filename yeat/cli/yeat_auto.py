@@ -14,7 +14,16 @@ from yeat.config.auto_pop import AutoPop
 def main(args=None):
     if args is None:
         args = get_parser().parse_args()  # pragma: no cover
-    autopop = AutoPop(args.samples, args.seq_path, args.files)
+    autopop = AutoPop(
+        args.samples,
+        args.seq_path,
+        args.files,
+        threads=args.threads,
+        include=args.include,
+        exclude=args.exclude,
+        max_depth=args.max_depth,
+        verbose=args.verbose,
+    )
     autopop.write_config_file()
 
 
@@ -41,6 +50,40 @@ def options(parser):
         metavar="FQ",
         nargs="+",
     )
+    parser.add_argument(
+        "--include",
+        default=None,
+        help="only use FASTQ files under --seq-path whose names match one of these glob patterns",
+        metavar="GLOB",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--exclude",
+        default=None,
+        help="skip files and directories under --seq-path whose names match one of these glob patterns",
+        metavar="GLOB",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--max-depth",
+        default=None,
+        help="search at most D directory levels below --seq-path; by default, there is no limit",
+        metavar="D",
+        type=int,
+    )
+    parser.add_argument(
+        "-t",
+        "--threads",
+        default=1,
+        help="number of T threads used to list directories and inspect FASTQ headers; by default, T=1",
+        metavar="T",
+        type=int,
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="report the number of files scanned under --seq-path and the scan rate",
+    )
 
 
 def positional_args(parser):
@@ -0,0 +1,106 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from argparse import ArgumentParser
+import sys
+from tempfile import TemporaryDirectory
+from yeat.bench import (
+    BENCH_ALGORITHMS,
+    PHASES,
+    compare_timings,
+    read_results,
+    run_benchmark,
+    write_results,
+)
+
+
+def main(args=None):
+    if args is None:
+        args = get_parser().parse_args()  # pragma: no cover
+    with TemporaryDirectory() as tmpdir:
+        workdir = args.workdir or tmpdir
+        results = dict()
+        print("Case", *PHASES, sep="\t")
+        for num_samples in args.samples:
+            timings = run_benchmark(
+                num_samples, args.assemblers, workdir, args.repeats, not args.no_dag
+            )
+            case = f"{num_samples}x{len(args.assemblers)}"
+            results[case] = timings
+            print(case, *(f"{timings.get(phase, 0):.3f}" for phase in PHASES), sep="\t")
+    if args.output:
+        write_results(results, args.output)
+    if args.baseline:
+        regressions = compare_timings(results, read_results(args.baseline), args.tolerance)
+        for case, phase, reference, elapsed in regressions:
+            print(
+                f"[yeat-bench] {case} {phase}: {elapsed:.3f}s vs {reference:.3f}s", file=sys.stderr
+            )
+        if regressions:
+            sys.exit(1)
+
+
+def get_parser(exit_on_error=True):
+    parser = ArgumentParser(exit_on_error=exit_on_error)
+    parser._optionals.title = "options"
+    parser.add_argument(
+        "--samples",
+        default=[10, 100],
+        help="number of synthetic samples in each benchmark case; by default, N=10 100",
+        metavar="N",
+        nargs="+",
+        type=int,
+    )
+    parser.add_argument(
+        "--assemblers",
+        default=list(BENCH_ALGORITHMS),
+        help=f"assembly algorithms configured for every sample; by default, {' '.join(BENCH_ALGORITHMS)}",
+        metavar="A",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--repeats",
+        default=3,
+        help="number of times each phase is timed; the median is reported; by default, R=3",
+        metavar="R",
+        type=int,
+    )
+    parser.add_argument(
+        "--no-dag",
+        action="store_true",
+        help="skip timing the Snakemake dry run that builds the job DAG",
+    )
+    parser.add_argument(
+        "-w",
+        "--workdir",
+        default=None,
+        help="directory for stub reads and configs; by default, a temporary directory is used",
+        metavar="W",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="write timings to a JSON file, for use as a later baseline",
+        metavar="JSON",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="compare timings to a previous --output file and exit with an error on regressions",
+        metavar="JSON",
+    )
+    parser.add_argument(
+        "--tolerance",
+        default=0.25,
+        help="fraction by which a timing may exceed its baseline before it counts as a regression; by default, F=0.25",
+        metavar="F",
+        type=float,
+    )
+    return parser
@@ -0,0 +1,60 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from collections import deque
+
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        self.goto = [dict()]
+        self.pattern = [None]
+        for pattern in patterns:
+            self.add(pattern)
+        self.fail = [0] * len(self.goto)
+        self.output = [None] * len(self.goto)
+        self.link()
+
+    def add(self, pattern):
+        node = 0
+        for char in pattern:
+            if char not in self.goto[node]:
+                self.goto[node][char] = len(self.goto)
+                self.goto.append(dict())
+                self.pattern.append(None)
+            node = self.goto[node][char]
+        self.pattern[node] = pattern
+
+    def link(self):
+        # Breadth-first, so each node's failure target is linked before the node itself; output
+        # points to the nearest node on the failure chain that completes a pattern
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fail = self.goto[state].get(char, 0)
+                self.fail[child] = fail
+                self.output[child] = fail if self.pattern[fail] is not None else self.output[fail]
+                queue.append(child)
+
+    def matches(self, text):
+        found = set()
+        goto, fail, pattern, output = self.goto, self.fail, self.pattern, self.output
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if pattern[node] is not None else output[node]
+            while match:
+                found.add(pattern[match])
+                match = output[match]
+        return found
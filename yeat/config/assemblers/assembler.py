@@ -7,15 +7,25 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+from ..resources import Resources
 from ..sample import Sample
-from pydantic import BaseModel, field_validator
-from typing import Optional, Dict
+from pathlib import Path
+from pydantic import BaseModel, field_validator, model_validator
+from typing import ClassVar, Optional, Dict
+
+
+REPORT_TARGETS = {"quast": "quast/report.html", "stats": "stats/report.tsv"}
 
 
 class Assembler(BaseModel):
+    default_resources: ClassVar[Resources] = Resources(threads=16, mem_mb=32768, runtime=1440)
+    memory_scale: ClassVar[float] = 8  # MB of RAM per MB of compressed input reads
+    graph_patterns: ClassVar[tuple] = ()  # assembly graphs for Bandage, relative to label_dir
     label: str
     arguments: Optional[str]
     samples: Dict[str, Sample]
+    resources: Optional[Resources] = None
+    report: str = "quast"
 
     @field_validator("samples")
     @classmethod
@@ -25,11 +35,38 @@ class Assembler(BaseModel):
             raise AssemblerConfigurationError(message)
         return samples
 
+    @field_validator("report")
+    @classmethod
+    def has_valid_report(cls, report):
+        if report not in REPORT_TARGETS:
+            message = f"Unknown report '{report}'; expected one of {sorted(REPORT_TARGETS)}"
+            raise AssemblerConfigurationError(message)
+        return report
+
+    @model_validator(mode="after")
+    def has_resources(self):
+        if self.resources is None:
+            self.resources = self.default_resources
+        return self
+
     @classmethod
     def parse_data(cls, label, data, samples):
         arguments = data.get("arguments")
         selected_samples = cls.select_samples(data, samples)
-        return cls(label=label, arguments=arguments, samples=selected_samples)
+        resources = cls.parse_resources(data)
+        report = data.get("report", "quast")
+        return cls(
+            label=label,
+            arguments=arguments,
+            samples=selected_samples,
+            resources=resources,
+            report=report,
+        )
+
+    @classmethod
+    def parse_resources(cls, data):
+        overrides = {key: data[key] for key in Resources.model_fields if key in data}
+        return Resources.parse_data(overrides, cls.default_resources)
 
     @classmethod
     def select_samples(cls, data, samples):
@@ -48,6 +85,18 @@ class Assembler(BaseModel):
     def extra_args(self):
         return self.arguments or ""
 
+    def report_target(self, label_dir):
+        return f"{label_dir}/{REPORT_TARGETS[self.report]}"
+
+    def graph_files(self, label_dir):
+        graphs = list()
+        for pattern in self.graph_patterns:
+            graphs.extend(sorted(str(path) for path in Path(label_dir).glob(pattern)))
+        return graphs
+
+    def estimate_mem_mb(self, input_size_mb):
+        return max(self.resources.mem_mb, int(self.memory_scale * input_size_mb))
+
 
 class AssemblerConfigurationError(ValueError):
     pass
@@ -8,11 +8,15 @@
 # -------------------------------------------------------------------------------------------------
 
 from .assembler import Assembler
-from glob import glob
+from yeat.config.resources import Resources
 from yeat.config.sample import ONT_PLATFORMS
 
 
 class CanuAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=65536, runtime=2880)
+    memory_scale = 4
+    graph_patterns = ("unitigging/4-unitigger/*.gfa",)
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_long_reads
@@ -22,7 +26,7 @@ class CanuAssembler(Assembler):
         targets = list()
         for sample in self.samples.values():
             label_dir = f"analysis/{sample.label}/yeat/canu/{self.label}"
-            targets.append(f"{label_dir}/quast/report.html")
+            targets.append(self.report_target(label_dir))
             targets.append(f"{label_dir}/bandage/.done")
         return targets
 
@@ -46,6 +50,3 @@ class CanuAssembler(Assembler):
         if long_read_type in ONT_PLATFORMS:
             return ["-nanopore", long_reads[0]]
         return ["-pacbio-hifi", long_reads[0]]
-
-    def gfa_files(self, sample):
-        return glob(f"analysis/{sample}/yeat/canu/{self.label}/unitigging/4-unitigger/*.gfa")
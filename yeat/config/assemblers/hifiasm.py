@@ -8,10 +8,14 @@
 # -------------------------------------------------------------------------------------------------
 
 from .assembler import Assembler
-from glob import glob
+from yeat.config.resources import Resources
 
 
 class HifiasmAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=32768, runtime=720)
+    memory_scale = 8
+    graph_patterns = ("*.gfa",)
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_long_reads
@@ -21,7 +25,7 @@ class HifiasmAssembler(Assembler):
         targets = list()
         for sample in self.samples.values():
             label_dir = f"analysis/{sample.label}/yeat/hifiasm/{self.label}"
-            targets.append(f"{label_dir}/quast/report.html")
+            targets.append(self.report_target(label_dir))
             targets.append(f"{label_dir}/bandage/.done")
         return targets
 
@@ -47,6 +51,3 @@ class HifiasmAssembler(Assembler):
         if long_read_type in ["ont_simplex", "ont_duplex"]:
             return ["--ont", long_reads[0]]
         return [long_reads[0]]
-
-    def gfa_files(self, sample):
-        return glob(f"analysis/{sample}/yeat/hifiasm/{self.label}/*.gfa")
@@ -8,10 +8,14 @@
 # -------------------------------------------------------------------------------------------------
 
 from .assembler import Assembler
-from glob import glob
+from yeat.config.resources import Resources
 
 
 class HifiasmMetaAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=65536, runtime=1440)
+    memory_scale = 12
+    graph_patterns = ("*.gfa",)
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_long_reads
@@ -21,7 +25,7 @@ class HifiasmMetaAssembler(Assembler):
         targets = list()
         for sample in self.samples.values():
             label_dir = f"analysis/{sample.label}/yeat/hifiasm_meta/{self.label}"
-            targets.append(f"{label_dir}/quast/report.html")
+            targets.append(self.report_target(label_dir))
             targets.append(f"{label_dir}/bandage/.done")
         return targets
 
@@ -38,6 +42,3 @@ class HifiasmMetaAssembler(Assembler):
         long_read_type = self.samples[sample].best_long_read_type
         long_reads = reads[long_read_type]
         return f"{long_reads[0]}"
-
-    def gfa_files(self, sample):
-        return glob(f"analysis/{sample}/yeat/hifiasm_meta/{self.label}/*.gfa")
@@ -10,10 +10,14 @@
 from .assembler import Assembler
 from pathlib import Path
 import re
-import subprocess
+from yeat.config.resources import Resources
 
 
 class MEGAHITAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=16384, runtime=720)
+    memory_scale = 4
+    graph_patterns = ("intermediate_contigs/k*.contigs.fa",)
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_illumina
@@ -23,12 +27,12 @@ class MEGAHITAssembler(Assembler):
         targets = list()
         for sample in self.samples.values():
             label_dir = f"analysis/{sample.label}/yeat/megahit/{self.label}"
-            targets.append(f"{label_dir}/quast/report.html")
+            targets.append(self.report_target(label_dir))
             targets.append(f"{label_dir}/bandage/.done")
         return targets
 
     def input_files(self, sample):
-        reads = self.samples[sample].data["illumina"]
+        reads = self.samples[sample].read_groups("illumina")
         downsample_dir = f"analysis/{sample}/qc/illumina/downsample"
         if len(reads) == 1:
             return {"illumina": [f"{downsample_dir}/read.fastq.gz"]}
@@ -46,24 +50,11 @@ class MEGAHITAssembler(Assembler):
             return ["-r", illumina_reads[0]]
         return ["-1", illumina_reads[0], "-2", illumina_reads[1]]
 
-    def gfa_files(self, sample):
-        gfa_files = []
-        intermediates_dir = Path(
-            f"analysis/{sample}/yeat/megahit/{self.label}/intermediate_contigs"
-        )
-        fa_files = intermediates_dir.glob("k*.contigs.fa")
-        for fa in fa_files:
-            match = re.match(r"k(\d+)\.contigs\.fa", fa.name)
-            if not match:
-                continue
-            kmer = match.group(1)
-            fastg = intermediates_dir / f"{fa.stem}.fastg"
-            with open(fastg, "w") as out_file:
-                subprocess.run(
-                    ["megahit_toolkit", "contig2fastg", kmer, str(fa)],
-                    stdout=out_file,
-                    stderr=subprocess.PIPE,
-                    check=True,
-                )
-            gfa_files.append(str(fastg))
-        return gfa_files
+    def graph_files(self, label_dir):
+        # Intermediate contigs are converted to FASTG, one k-mer size per job, by rule megahit_fastg
+        graphs = list()
+        for contigs in super().graph_files(label_dir):
+            contigs = Path(contigs)
+            if re.fullmatch(r"k\d+\.contigs\.fa", contigs.name) and contigs.stat().st_size > 0:
+                graphs.append(str(contigs.with_suffix(".fastg")))
+        return graphs
@@ -8,9 +8,13 @@
 # -------------------------------------------------------------------------------------------------
 
 from .assembler import Assembler
+from yeat.config.resources import Resources
 
 
 class PenguiNAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=32768, runtime=1440)
+    memory_scale = 8
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_illumina
@@ -19,11 +23,12 @@ class PenguiNAssembler(Assembler):
     def targets(self):
         targets = list()
         for sample in self.samples.values():
-            targets.append(f"analysis/{sample.label}/yeat/penguin/{self.label}/quast/report.html")
+            label_dir = f"analysis/{sample.label}/yeat/penguin/{self.label}"
+            targets.append(self.report_target(label_dir))
         return targets
 
     def input_files(self, sample):
-        reads = self.samples[sample].data["illumina"]
+        reads = self.samples[sample].read_groups("illumina")
         downsample_dir = f"analysis/{sample}/qc/illumina/downsample"
         if len(reads) == 1:
             return {"illumina": [f"{downsample_dir}/read.fastq.gz"]}
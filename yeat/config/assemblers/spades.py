@@ -8,11 +8,15 @@
 # -------------------------------------------------------------------------------------------------
 
 from .assembler import Assembler
-from glob import glob
+from yeat.config.resources import Resources
 from yeat.config.sample import ONT_PLATFORMS
 
 
 class SPAdesAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=32768, runtime=720)
+    memory_scale = 12
+    graph_patterns = ("*.gfa", "*.fastg")
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_illumina
@@ -22,7 +26,7 @@ class SPAdesAssembler(Assembler):
         targets = list()
         for sample in self.samples.values():
             label_dir = f"analysis/{sample.label}/yeat/spades/{self.label}"
-            targets.append(f"{label_dir}/quast/report.html")
+            targets.append(self.report_target(label_dir))
             targets.append(f"{label_dir}/bandage/.done")
         return targets
 
@@ -35,7 +39,7 @@ class SPAdesAssembler(Assembler):
         return infiles
 
     def get_illumina_files(self, sample_path, sample_obj):
-        reads = sample_obj.data["illumina"]
+        reads = sample_obj.read_groups("illumina")
         downsample_dir = f"{sample_path}/illumina/downsample"
         if len(reads) == 1:
             return {"illumina": [f"{downsample_dir}/read.fastq.gz"]}
@@ -69,7 +73,3 @@ class SPAdesAssembler(Assembler):
             elif long_read_type in ONT_PLATFORMS:
                 return ["--nanopore", long_reads[0]]
         return list()
-
-    def gfa_files(self, sample):
-        label_dir = f"analysis/{sample}/yeat/spades/{self.label}"
-        return glob(f"{label_dir}/*.gfa") + glob(f"{label_dir}/*.fastg")
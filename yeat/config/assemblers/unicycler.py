@@ -8,10 +8,14 @@
 # -------------------------------------------------------------------------------------------------
 
 from .assembler import Assembler
-from glob import glob
+from yeat.config.resources import Resources
 
 
 class UnicyclerAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=32768, runtime=1440)
+    memory_scale = 12
+    graph_patterns = ("*.gfa",)
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_illumina or sample.has_long_reads
@@ -21,7 +25,7 @@ class UnicyclerAssembler(Assembler):
         targets = list()
         for sample in self.samples.values():
             label_dir = f"analysis/{sample.label}/yeat/unicycler/{self.label}"
-            targets.append(f"{label_dir}/quast/report.html")
+            targets.append(self.report_target(label_dir))
             targets.append(f"{label_dir}/bandage/.done")
         return targets
 
@@ -34,7 +38,7 @@ class UnicyclerAssembler(Assembler):
         return infiles
 
     def get_illumina_files(self, sample_path, sample_obj):
-        reads = sample_obj.data.get("illumina", [])
+        reads = sample_obj.read_groups("illumina") if sample_obj.has_illumina else []
         downsample_dir = f"{sample_path}/illumina/downsample"
         if len(reads) == 1:
             return {"illumina": [f"{downsample_dir}/read.fastq.gz"]}
@@ -69,6 +73,3 @@ class UnicyclerAssembler(Assembler):
             long_reads = reads[long_read_type]
             return ["-l", long_reads[0]]
         return list()
-
-    def gfa_files(self, sample):
-        return glob(f"analysis/{sample}/yeat/unicycler/{self.label}/*.gfa")
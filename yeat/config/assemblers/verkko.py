@@ -8,11 +8,15 @@
 # -------------------------------------------------------------------------------------------------
 
 from .assembler import Assembler
-from glob import glob
+from yeat.config.resources import Resources
 from yeat.config.sample import BEST_LR_ORDER
 
 
 class VerkkoAssembler(Assembler):
+    default_resources = Resources(threads=16, mem_mb=65536, runtime=2880)
+    memory_scale = 10
+    graph_patterns = ("*.gfa",)
+
     @staticmethod
     def _check_sample_compatibility(sample):
         return sample.has_long_reads
@@ -22,7 +26,7 @@ class VerkkoAssembler(Assembler):
         targets = list()
         for sample in self.samples.values():
             label_dir = f"analysis/{sample.label}/yeat/verkko/{self.label}"
-            targets.append(f"{label_dir}/quast/report.html")
+            targets.append(self.report_target(label_dir))
             targets.append(f"{label_dir}/bandage/.done")
         return targets
 
@@ -50,6 +54,3 @@ class VerkkoAssembler(Assembler):
         if "ont_ultralong" in reads:
             args.extend(["--nano", reads["ont_ultralong"][0]])
         return args
-
-    def gfa_files(self, sample):
-        return glob(f"analysis/{sample}/yeat/verkko/{self.label}/*.gfa")
@@ -7,12 +7,24 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+from .aho_corasick import AhoCorasick
+from .globs import MAGIC
+from .read_sniffer import ReadInfo, sniff_fastq
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+import os
 from pathlib import Path
+import re
 import sys
+import time
 import toml
 
 
 EXTENSIONS = (".fastq", ".fastq.gz", ".fq", ".fq.gz")
+FILE_MATE = re.compile(r"(?:_R|_|\.)([12])(?:_\d{3})?\.f(?:ast)?q(?:\.gz)?$")
+FILE_LANE = re.compile(r"_L(\d{3})_")
 
 
 class AutoPopError(ValueError):
@@ -20,12 +32,29 @@ class AutoPopError(ValueError):
 
 
 class AutoPop:
-    def __init__(self, samples, seq_path, files):
+    def __init__(
+        self,
+        samples,
+        seq_path,
+        files,
+        threads=1,
+        include=None,
+        exclude=None,
+        max_depth=None,
+        verbose=False,
+    ):
+        self.threads = threads
+        self.include = include or []
+        self.exclude = exclude or []
+        self.max_depth = max_depth
+        self.verbose = verbose
         self.samples = self.get_samples(samples)
+        self.index = AhoCorasick(self.samples)
         self.check_samples()
         self.check_seq_path(seq_path)
         self.files = [Path(f) for f in files] if files is not None else self.get_files(seq_path)
         self.check_files()
+        self.listings = dict()
         self.files_to_samples = self.organize_files_to_samples()
 
     def get_samples(self, samples):
@@ -35,13 +64,18 @@ class AutoPop:
         return list(sorted(samples))
 
     def check_samples(self):
-        for s1_index, s1 in enumerate(self.samples):
-            for s2_index, s2 in enumerate(self.samples):
-                if s1 == s2 and s1_index == s2_index:
-                    continue
-                if s1 in s2:
-                    message = f"cannot correctly process a sample name that is a substring of another sample name: {s1} vs. {s2}"
-                    raise AutoPopError(message)
+        indices = defaultdict(list)
+        for index, sample in enumerate(self.samples):
+            indices[sample].append(index)
+        conflicts = list()
+        for s2_index, s2 in enumerate(self.samples):
+            for s1 in self.index.matches(s2):
+                conflicts.extend((i, s2_index) for i in indices[s1] if i != s2_index)
+        if conflicts:
+            s1_index, s2_index = min(conflicts)
+            s1, s2 = self.samples[s1_index], self.samples[s2_index]
+            message = f"cannot correctly process a sample name that is a substring of another sample name: {s1} vs. {s2}"
+            raise AutoPopError(message)
 
     def check_seq_path(self, seq_path):
         if not seq_path:
@@ -50,23 +84,71 @@ class AutoPop:
             raise FileNotFoundError(seq_path)
 
     def get_files(self, seq_path):
-        files = []
-        for file in self.traverse(seq_path):
-            if not file.name.endswith(EXTENSIONS):
+        start = time.perf_counter()
+        files, num_scanned = [], 0
+        for entry in self.traverse(seq_path):
+            num_scanned += 1
+            if not entry.name.endswith(EXTENSIONS):
                 continue
-            files.append(file)
+            if self.include and not self.matches_any(entry.name, self.include):
+                continue
+            files.append(entry.path)
         files.sort()
-        return files
+        if self.verbose:
+            elapsed = time.perf_counter() - start
+            rate = num_scanned / elapsed if elapsed else 0
+            message = f"[yeat-auto] scanned {num_scanned} files in {self.num_directories} directories in {elapsed:.3f}s ({rate:.0f} files/s); {len(files)} FASTQ files selected"
+            print(message, file=sys.stderr)
+        return [Path(file) for file in files]
 
     def traverse(self, dirpath):
-        dirpath = Path(dirpath)
-        if not dirpath.is_dir():
+        # Breadth-first, one level at a time, so the subdirectories of a level can be listed
+        # concurrently; the file type cached in each DirEntry avoids a stat per entry
+        self.num_directories = 0
+        if not os.path.isdir(dirpath):
             return  # pragma: no cover
-        for subpath in dirpath.iterdir():
-            if subpath.is_dir():
-                yield from self.traverse(subpath)
-            else:
-                yield subpath
+        level, depth = [os.fspath(dirpath)], 0
+        linked = {os.path.realpath(dirpath)}
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            while level:
+                self.num_directories += len(level)
+                subdirs = []
+                for entries in executor.map(self.scan_directory, level):
+                    for entry in entries:
+                        if self.matches_any(entry.name, self.exclude):
+                            continue
+                        if entry.is_dir():
+                            if entry.is_symlink() and not self.follow_link(entry, linked):
+                                continue
+                            subdirs.append(entry.path)
+                        else:
+                            yield entry
+                depth += 1
+                if self.max_depth is not None and depth > self.max_depth:
+                    break
+                level = subdirs
+
+    @staticmethod
+    def scan_directory(path):
+        try:
+            with os.scandir(path) as entries:
+                return list(entries)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return []
+
+    @staticmethod
+    def follow_link(entry, linked):
+        # Skip links to a directory already walked through a link, or to an ancestor of the link
+        target = os.path.realpath(entry.path)
+        parent = os.path.realpath(os.path.dirname(entry.path))
+        if target in linked or os.path.commonpath([target, parent]) == target:
+            return False
+        linked.add(target)
+        return True
+
+    @staticmethod
+    def matches_any(name, patterns):
+        return any(fnmatchcase(name, pattern) for pattern in patterns)
 
     def check_files(self):
         for file in self.files:
@@ -74,16 +156,88 @@ class AutoPop:
                 raise FileNotFoundError(file)
 
     def organize_files_to_samples(self):
+        sample_files = {sample: list() for sample in self.samples}
+        for file in self.files:
+            for sample in self.index.matches(str(file)):
+                sample_files[sample].append(str(file))
+        paths = sorted({path for files in sample_files.values() for path in files})
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            read_info = dict(zip(paths, executor.map(self.read_info, paths)))
         files_to_samples = dict()
         for sample in self.samples:
-            temp = [str(file) for file in self.files if sample in str(file)]
-            if len(temp) != 2:
-                message = f"sample {sample}: expected 2 FASTQ files for paired-end data, found {len(temp)}"
+            files = sample_files[sample]
+            if not files:
+                message = f"sample {sample}: no FASTQ files found"
                 raise AutoPopError(message)
-            prefix, suffix = self.find_common_prefix_suffix(temp)
-            files_to_samples[sample] = f"{prefix}*{suffix}"
+            read_types = defaultdict(list)
+            for path in files:
+                read_types[read_info[path].read_type].append(path)
+            if "illumina" in read_types:
+                self.check_illumina(sample, read_types["illumina"], read_info)
+            files_to_samples[sample] = {
+                read_type: self.read_path(read_types[read_type])
+                for read_type in sorted(read_types)
+            }
         return files_to_samples
 
+    @staticmethod
+    def read_info(path):
+        # Files that cannot be inspected are assumed to hold Illumina reads, as they were before
+        # header sniffing; mate and lane fall back to the usual file naming conventions
+        info = sniff_fastq(path) or ReadInfo("illumina")
+        if info.read_type != "illumina":
+            return info
+        name = os.path.basename(path)
+        mate, lane = info.mate, info.lane
+        if mate is None and FILE_MATE.search(name):
+            mate = int(FILE_MATE.search(name).group(1))
+        if lane is None and FILE_LANE.search(name):
+            lane = int(FILE_LANE.search(name).group(1))
+        return ReadInfo("illumina", mate, lane)
+
+    def check_illumina(self, sample, files, read_info):
+        # Single-end runs also report mate 1 in their headers, so reads count as paired only if a
+        # second mate is present or the file names say so
+        mates = [read_info[path].mate for path in files]
+        named = any(FILE_MATE.search(os.path.basename(path)) for path in files)
+        if 2 not in mates and not named:
+            return
+        r1, r2 = mates.count(1), mates.count(2)
+        if r1 + r2 != len(files) or r1 != r2:
+            expected = 2 * max(r1, r2, 1)
+            message = f"sample {sample}: expected {expected} FASTQ files for paired-end data, found {len(files)}"
+            raise AutoPopError(message)
+        lanes = [read_info[path].lane for path in files]
+        r1_lanes = sorted(lane or 0 for lane, mate in zip(lanes, mates) if mate == 1)
+        r2_lanes = sorted(lane or 0 for lane, mate in zip(lanes, mates) if mate == 2)
+        if r1_lanes != r2_lanes:
+            message = f"sample {sample}: R1 and R2 FASTQ files are from different lanes"
+            raise AutoPopError(message)
+
+    def read_path(self, files):
+        if len(files) == 1:
+            return files[0]
+        # Use a glob only if it matches exactly these files in their directory
+        prefix, suffix = self.find_common_prefix_suffix(files)
+        directory = os.path.dirname(files[0])
+        if MAGIC.search(prefix + suffix) or any(os.path.dirname(f) != directory for f in files):
+            return sorted(files)
+        names = self.list_directory(directory)
+        name_prefix = prefix[len(directory) + 1 :] if directory else prefix
+        matched = 0
+        for name in names[bisect_left(names, name_prefix) :]:
+            if not name.startswith(name_prefix):
+                break
+            matched += name.endswith(suffix) and len(name) >= len(name_prefix) + len(suffix)
+        return f"{prefix}*{suffix}" if matched == len(files) else sorted(files)
+
+    def list_directory(self, directory):
+        # The glob is expanded against everything in the directory, including files that were
+        # left out by --include, --exclude or --files, so it is checked against all of them
+        if directory not in self.listings:
+            self.listings[directory] = sorted(os.listdir(directory or "."))
+        return self.listings[directory]
+
     def find_common_prefix_suffix(self, strings):
         prefix = strings[0]
         suffix = strings[0]
@@ -105,7 +259,12 @@ class AutoPop:
 
     def get_config_data(self):
         samples = {}
-        for label, regex_path in self.files_to_samples.items():
-            samples[label] = {"illumina": regex_path}
-        assemblers = {"spades_default": {"algorithm": "spades"}}
+        for label, read_paths in self.files_to_samples.items():
+            samples[label] = dict(read_paths)
+        read_types = {read_type for data in samples.values() for read_type in data}
+        assemblers = dict()
+        if "illumina" in read_types:
+            assemblers["spades_default"] = {"algorithm": "spades"}
+        if read_types - {"illumina"}:
+            assemblers["flye_default"] = {"algorithm": "flye"}
         return {"samples": samples, "assemblers": assemblers}
@@ -10,9 +10,23 @@
 from .assemblers import ALGORITHM_CONFIGS
 from .assemblers.assembler import Assembler
 from .global_settings import GlobalSettings
+from .resources import (
+    DOWNSAMPLE_MEMORY_SCALE,
+    FASTQ_GZIP_RATIO,
+    GENOME_SIZE_MEMORY_SCALE,
+    PIPELINE_STAGES,
+    QC_RESOURCES,
+    Resources,
+)
 from .sample import Sample
-from pydantic import BaseModel, ConfigDict, field_validator
-from typing import Dict
+from .sample_sheet import read_sample_sheet
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from types import MappingProxyType
+from typing import Dict, NamedTuple, Optional
+
+
+ALGORITHM_NAMES = {config: algorithm for algorithm, config in ALGORITHM_CONFIGS.items()}
 
 
 class AssemblyConfiguration(BaseModel):
@@ -20,6 +34,9 @@ class AssemblyConfiguration(BaseModel):
     global_settings: GlobalSettings
     samples: Dict[str, Sample]
     assemblers: Dict[str, Assembler]
+    resources: Dict[str, Resources] = Field(default_factory=lambda: dict(QC_RESOURCES))
+    max_mem_mb: Optional[int] = None
+    pipelined: bool = False
 
     @field_validator("samples")
     @classmethod
@@ -35,12 +52,60 @@ class AssemblyConfiguration(BaseModel):
             raise ConfigurationError("Config has no assemblers")
         return assemblers
 
+    @model_validator(mode="after")
+    def resolve_inputs(self):
+        # Rule input functions run once per job during DAG construction; resolve them up front
+        self.input_table
+        self.contigs_table
+        return self
+
+    @cached_property
+    def input_table(self):
+        table = dict()
+        for label, assembler in self.assemblers.items():
+            for sample in assembler.samples:
+                infiles = assembler.input_files(sample)
+                bowtie2_args = None
+                if hasattr(assembler, "bowtie2_input_args"):
+                    bowtie2_args = assembler.bowtie2_input_args(sample)
+                table[(label, sample)] = AssemblerInputs(
+                    files=tuple(path for files in infiles.values() for path in files),
+                    args=assembler.input_args(sample),
+                    bowtie2_args=bowtie2_args,
+                )
+        return MappingProxyType(table)
+
+    @cached_property
+    def contigs_table(self):
+        table = {sample: dict() for sample in self.samples}
+        for label, assembler in self.assemblers.items():
+            if assembler.report != "quast":
+                continue
+            algorithm = ALGORITHM_NAMES[type(assembler)]
+            for sample in assembler.samples:
+                table[sample][label] = f"analysis/{sample}/yeat/{algorithm}/{label}/contigs.fasta"
+        return MappingProxyType(
+            {sample: MappingProxyType(paths) for sample, paths in table.items()}
+        )
+
+    @cached_property
+    def sample_ranks(self):
+        return MappingProxyType({label: rank for rank, label in enumerate(self.samples)})
+
     @classmethod
-    def parse_snakemake_config(cls, config):
+    def parse_snakemake_config(cls, config, max_mem_mb=None, pipelined=False):
         global_settings = cls._parse_global_settings(config)
         samples = cls._parse_samples(config, global_settings)
         assemblers = cls._parse_assemblers(config, samples)
-        return cls(global_settings=global_settings, samples=samples, assemblers=assemblers)
+        resources = cls._parse_resources(config)
+        return cls(
+            global_settings=global_settings,
+            samples=samples,
+            assemblers=assemblers,
+            resources=resources,
+            max_mem_mb=max_mem_mb,
+            pipelined=pipelined,
+        )
 
     @staticmethod
     def _parse_global_settings(config):
@@ -50,8 +115,17 @@ class AssemblyConfiguration(BaseModel):
     @staticmethod
     def _parse_samples(config, global_settings):
         samples = dict()
-        for label, data in config["samples"].items():
+        for label, data in config.get("samples", {}).items():
             samples[label] = Sample.parse_data(label, data, global_settings)
+        if "sample_sheet" in config:
+            sheet_samples = read_sample_sheet(config["sample_sheet"], global_settings)
+            duplicates = sorted(samples.keys() & sheet_samples.keys())
+            if duplicates:
+                message = (
+                    f"Sample(s) defined in both the config and the sample sheet: {duplicates}"
+                )
+                raise ConfigurationError(message)
+            samples.update(sheet_samples)
         return samples
 
     @staticmethod
@@ -62,6 +136,17 @@ class AssemblyConfiguration(BaseModel):
             assemblers[label] = assembler_class.parse_data(label, data, samples)
         return assemblers
 
+    @staticmethod
+    def _parse_resources(config):
+        data = config.get("resources", {})
+        unknown_rules = set(data) - set(QC_RESOURCES)
+        if unknown_rules:
+            raise ConfigurationError(f"Unknown rule(s) in resources: {unknown_rules}")
+        resources = dict()
+        for rule, defaults in QC_RESOURCES.items():
+            resources[rule] = Resources.parse_data(data.get(rule, {}), defaults)
+        return resources
+
     @classmethod
     def select(self, algorithm):
         if algorithm not in ALGORITHM_CONFIGS:
@@ -80,9 +165,18 @@ class AssemblyConfiguration(BaseModel):
     def get_sample_input_files(self, sample, read_type):
         return self.samples[sample].data[read_type]
 
+    def get_sample_read_groups(self, sample, read_type):
+        return self.samples[sample].read_groups(read_type)
+
     def get_sample_skip_filter(self, sample):
         return self.samples[sample].skip_filter
 
+    def get_sample_fused_downsample(self, sample):
+        return self.samples[sample].fused_downsample
+
+    def get_sample_prefer_longest(self, sample):
+        return self.samples[sample].prefer_longest
+
     def get_sample_quality(self, sample):
         return self.samples[sample].quality
 
@@ -95,24 +189,105 @@ class AssemblyConfiguration(BaseModel):
     def get_sample_genome_size(self, sample):
         return self.samples[sample].genome_size
 
+    def get_sample_genome_size_bases(self, sample):
+        return self.samples[sample].genome_size_bases
+
+    def get_sample_needs_genome_size(self, sample):
+        return self.samples[sample].needs_genome_size
+
     def get_sample_target_coverage_depth(self, sample):
         return self.samples[sample].target_coverage_depth
 
+    def get_sample_bandage_max_nodes(self, sample):
+        return self.samples[sample].bandage_max_nodes
+
+    def get_sample_bandage_max_edges(self, sample):
+        return self.samples[sample].bandage_max_edges
+
+    def get_sample_contigs(self, sample):
+        return dict(self.contigs_table[sample])
+
+    def get_project_contigs(self):
+        contigs = dict()
+        for sample in self.samples:
+            for label, path in self.get_sample_contigs(sample).items():
+                contigs[f"{sample}.{label}"] = path
+        return contigs
+
     def get_assembler_input_files(self, label, sample):
-        infiles = self.assemblers[label].input_files(sample)
-        input_files = []
-        for files in infiles.values():
-            input_files.extend(files)
-        return input_files
+        return list(self.input_table[(label, sample)].files)
 
     def get_assembler_input_args(self, label, sample):
-        return self.assemblers[label].input_args(sample)
+        return self.input_table[(label, sample)].args
 
     def get_assembler_extra_args(self, label):
         return self.assemblers[label].extra_args
 
     def get_assembler_bowtie2_input_args(self, label, sample):
-        return self.assemblers[label].bowtie2_input_args(sample)
+        return self.input_table[(label, sample)].bowtie2_args
+
+    def get_assembler_graph_files(self, label, label_dir):
+        return self.assemblers[label].graph_files(label_dir)
+
+    def get_assembler_threads(self, label):
+        return self.assemblers[label].resources.threads
+
+    def get_assembler_mem_mb(self, label, input_size_mb=0):
+        mem_mb = self.assemblers[label].estimate_mem_mb(input_size_mb)
+        return self._cap_mem_mb(mem_mb)
+
+    def get_assembler_runtime(self, label):
+        return self.assemblers[label].resources.runtime
+
+    def get_rule_threads(self, rule):
+        return self.resources[rule].threads
+
+    def get_rule_mem_mb(self, rule):
+        return self._cap_mem_mb(self.resources[rule].mem_mb)
+
+    def get_genome_size_mem_mb(self, sample, input_size_mb=0):
+        mem_mb = self.resources["genome_size"].mem_mb
+        if self.get_sample_genome_size_bases(sample) == 0:
+            mem_mb = max(mem_mb, int(GENOME_SIZE_MEMORY_SCALE * input_size_mb))
+        return self._cap_mem_mb(mem_mb)
+
+    def get_downsample_mem_mb(self, sample, input_size_mb=0):
+        mem_mb = self.resources["downsample"].mem_mb
+        if self.get_sample_target_num_reads(sample) == 0:
+            kept_mb = FASTQ_GZIP_RATIO * input_size_mb
+            genome_size = self.get_sample_genome_size(sample)
+            if genome_size:
+                num_bases = genome_size * self.get_sample_target_coverage_depth(sample)
+                kept_mb = min(kept_mb, 2 * num_bases / 1024**2)
+            mem_mb = max(mem_mb, int(DOWNSAMPLE_MEMORY_SCALE * kept_mb))
+        return self._cap_mem_mb(mem_mb)
+
+    def get_rule_runtime(self, rule):
+        return self.resources[rule].runtime
+
+    def get_rule_priority(self, rule, sample):
+        # Later stages outrank earlier ones so that a sample's reads move on to assembly as soon
+        # as they can; within a stage, samples go in config order (the fraction is below 1)
+        if not self.pipelined or rule not in PIPELINE_STAGES:
+            return 0
+        rank = self.sample_ranks[sample]
+        return PIPELINE_STAGES[rule] + (len(self.samples) - rank) / (len(self.samples) + 1)
+
+    def get_rule_group(self):
+        if not self.pipelined:
+            return None
+        return "sample_{sample}"
+
+    def _cap_mem_mb(self, mem_mb):
+        if self.max_mem_mb is None:
+            return mem_mb
+        return min(mem_mb, self.max_mem_mb)
+
+
+class AssemblerInputs(NamedTuple):
+    files: tuple
+    args: str
+    bowtie2_args: Optional[str] = None
 
 
 class ConfigurationError(ValueError):
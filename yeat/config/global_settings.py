@@ -16,9 +16,14 @@ class GlobalSettings(BaseModel):
     target_coverage_depth: Optional[int] = 150
     target_num_reads: Optional[int] = -1  # -1 disable, 0 auto
     genome_size: Optional[int] = 0  # 0 auto
+    genome_size_bases: Optional[int] = 100_000_000  # 0 all reads
     min_length: Optional[int] = 100
     quality: Optional[int] = 10
     skip_filter: Optional[bool] = True
+    fused_downsample: Optional[bool] = False
+    prefer_longest: Optional[bool] = False
+    bandage_max_nodes: Optional[int] = 50_000  # 0 no limit
+    bandage_max_edges: Optional[int] = 100_000  # 0 no limit
 
     @classmethod
     def parse_data(cls, data):
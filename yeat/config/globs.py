@@ -0,0 +1,64 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+import glob
+import os
+import re
+
+MAGIC = re.compile(r"[*?[]")
+
+
+def resolve_globs(patterns, threads=1):
+    # Many samples share a run folder, so each directory is listed once for all of its patterns
+    parents, resolved = dict(), dict()
+    for pattern in set(patterns):
+        parent, name = os.path.split(pattern)
+        if parent not in parents:
+            parents[parent] = os.path.realpath(parent or ".")
+        resolved[pattern] = (parents[parent], name)
+    directories = sorted({directory for directory, name in resolved.values()})
+    with ThreadPoolExecutor(max_workers=max(1, min(threads, len(directories)))) as pool:
+        listings = dict(zip(directories, pool.map(list_directory, directories)))
+    sorted_names = {directory: sorted(entries) for directory, entries in listings.items()}
+    matches = dict()
+    for pattern, (directory, name) in resolved.items():
+        entries = listings[directory]
+        if glob.has_magic(name):
+            names = match_names(sorted_names[directory], name)
+            matches[pattern] = [os.path.join(directory, match) for match in names]
+        elif name not in entries:
+            matches[pattern] = []
+        elif entries[name]:
+            matches[pattern] = [os.path.realpath(os.path.join(directory, name))]
+        else:
+            matches[pattern] = [os.path.join(directory, name)]
+    return matches, len(directories)
+
+
+def match_names(sorted_names, pattern):
+    # Only names sharing the pattern's literal prefix can match; find them by bisection
+    prefix = MAGIC.split(pattern, 1)[0]
+    matched = list()
+    for name in sorted_names[bisect_left(sorted_names, prefix) :]:
+        if not name.startswith(prefix):
+            break
+        if fnmatchcase(name, pattern):
+            matched.append(name)
+    return matched
+
+
+def list_directory(path):
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name: entry.is_symlink() for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return dict()
@@ -0,0 +1,89 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import gzip
+import re
+from typing import NamedTuple, Optional
+import zlib
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+SNIFF_BYTES = 65536  # decompressed bytes read from the start of each file
+SNIFF_RECORDS = 8
+LONG_READ_LENGTH = 1000
+HIFI_MIN_QUALITY = 20
+ILLUMINA_NAME = re.compile(rb"^[^:\s]+:\d+:[^:\s]+:(\d+):\d+:\d+:\d+$")  # Casava 1.8+
+ILLUMINA_COMMENT = re.compile(rb"^([12]):[YN]:\d+:")
+ILLUMINA_LEGACY = re.compile(rb"^[^:\s]+:(\d+):\d+:\d+:\d+(?:#\S*)?/([12])$")
+PACBIO_CCS = re.compile(rb"^m\d+\w*/\d+/ccs(?:/(?:fwd|rev))?$")
+ONT_COMMENT = re.compile(rb"(?:^|\s)(?:runid|start_time|ch|flow_cell_id)=")
+MATE_NAME = re.compile(rb"/([12])$")
+
+
+class ReadInfo(NamedTuple):
+    read_type: str
+    mate: Optional[int] = None
+    lane: Optional[int] = None
+
+
+def sniff_fastq(path, max_bytes=SNIFF_BYTES, max_records=SNIFF_RECORDS):
+    # Only the first max_bytes of decompressed data are read, so the cost per file is bounded
+    # no matter how large the file is; unreadable or non-FASTQ files give None
+    try:
+        with open(path, "rb") as fh:
+            magic = fh.read(2)
+            fh.seek(0)
+            if magic == GZIP_MAGIC:
+                with gzip.GzipFile(fileobj=fh) as gz:
+                    data = gz.read(max_bytes)
+            else:
+                data = fh.read(max_bytes)
+    except (OSError, EOFError, zlib.error):
+        return None
+    if not data.startswith(b"@"):
+        return None
+    lines = data.split(b"\n")
+    headers, lengths, qualities = list(), list(), list()
+    for start in range(0, len(lines), 4):
+        record = lines[start : start + 4]
+        if len(headers) == max_records or not record[0].startswith(b"@"):
+            break
+        headers.append(record[0][1:].rstrip(b"\r"))
+        if len(record) > 1:
+            lengths.append(len(record[1].rstrip(b"\r")))
+        if len(record) == 4 and start + 4 < len(lines):
+            qualities.append(record[3].rstrip(b"\r"))
+    return classify_reads(headers, lengths, qualities)
+
+
+def classify_reads(headers, lengths, qualities):
+    name, _, comment = headers[0].partition(b" ")
+    if PACBIO_CCS.match(name):
+        return ReadInfo("pacbio_hifi")
+    if ONT_COMMENT.search(comment):
+        return ReadInfo("ont_duplex" if b";" in name else "ont_simplex")
+    match = ILLUMINA_NAME.match(name)
+    if match:
+        mate = ILLUMINA_COMMENT.match(comment)
+        return ReadInfo("illumina", int(mate.group(1)) if mate else None, int(match.group(1)))
+    match = ILLUMINA_LEGACY.match(name)
+    if match:
+        return ReadInfo("illumina", int(match.group(2)), int(match.group(1)))
+    if lengths and sum(lengths) / len(lengths) > LONG_READ_LENGTH:
+        if qualities and mean_quality(qualities) >= HIFI_MIN_QUALITY:
+            return ReadInfo("pacbio_hifi")
+        return ReadInfo("ont_simplex")
+    mate = MATE_NAME.search(name)
+    return ReadInfo("illumina", int(mate.group(1)) if mate else None)
+
+
+def mean_quality(qualities):
+    total = sum(sum(quality) for quality in qualities)
+    length = sum(len(quality) for quality in qualities)
+    return total / length - 33 if length else 0
@@ -0,0 +1,57 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from pydantic import BaseModel, ConfigDict, PositiveInt
+
+
+class Resources(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    threads: PositiveInt = 1
+    mem_mb: PositiveInt = 1024
+    runtime: PositiveInt = 60  # minutes
+
+    @classmethod
+    def parse_data(cls, data, defaults):
+        return cls(**(defaults.model_dump() | data))
+
+
+QC_RESOURCES = {
+    "copy_input": Resources(threads=2, mem_mb=1024, runtime=60),
+    "fastqc": Resources(threads=2, mem_mb=2048, runtime=60),
+    "fastp": Resources(threads=4, mem_mb=4096, runtime=120),
+    "chopper": Resources(threads=4, mem_mb=2048, runtime=120),
+    "genome_size": Resources(threads=1, mem_mb=2048, runtime=60),
+    "downsample": Resources(threads=4, mem_mb=8192, runtime=120),
+    "quast": Resources(threads=1, mem_mb=4096, runtime=60),
+    "stats": Resources(threads=1, mem_mb=2048, runtime=30),
+    "contig2fastg": Resources(threads=1, mem_mb=2048, runtime=30),
+    "bandage": Resources(threads=4, mem_mb=4096, runtime=60),
+}
+
+# Without a cap on the bases it reads, the genome size k-mer sketch grows with the input: about
+# 0.5 MB of hashes per MB of compressed reads, and up to 4x that while they are counted
+GENOME_SIZE_MEMORY_SCALE = 2
+
+# The downsample rule holds the reads it keeps until they are written. For a coverage target that
+# is genome size x depth bases, as sequence and qualities (2 bytes per base); when the genome size
+# is only estimated at run time, it is bounded by the reads themselves, at up to 4 bytes of Fastq
+# per byte of gzip. Python objects add about half again
+DOWNSAMPLE_MEMORY_SCALE = 1.5
+FASTQ_GZIP_RATIO = 4
+
+# In pipelined mode, rules on the path to an assembly are ranked by how close they are to it;
+# rules that only report on reads or assemblies keep the default priority of 0
+PIPELINE_STAGES = {
+    "copy_input": 1,
+    "fastp": 2,
+    "chopper": 2,
+    "genome_size": 2,
+    "downsample": 3,
+    "assembly": 4,
+}
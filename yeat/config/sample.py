@@ -10,12 +10,15 @@
 from .global_settings import GlobalSettings
 from pathlib import Path
 from pydantic import BaseModel, field_validator
+import re
 from typing import Dict, Union
 
 
 ONT_PLATFORMS = {"ont_simplex", "ont_duplex", "ont_ultralong"}
 READ_TYPES = ONT_PLATFORMS | {"illumina", "pacbio_hifi"}
 BEST_LR_ORDER = ("pacbio_hifi", "ont_duplex", "ont_simplex", "ont_ultralong")
+MATE_TOKEN = re.compile(r"(?<=[._])R?([12])(?=[._])")
+LANE_TOKEN = re.compile(r"(?<=_)L(\d+)(?=[._])")
 
 
 class Sample(BaseModel):
@@ -54,12 +57,7 @@ class Sample(BaseModel):
             if not reads:
                 message = f"Unable to find FASTQ files for sample '{label}' at path: {read_paths}"
                 raise SampleConfigurationError(message)
-            if len(reads) > 2:
-                message = (
-                    f"Found too many FASTQ files for sample '{label}' at path: {read_paths}. "
-                    f"Expected at most 2, found {len(reads)}."
-                )
-                raise SampleConfigurationError(message)
+            group_reads(label, read_type, reads)
             data[read_type] = reads
 
     @staticmethod
@@ -96,6 +94,14 @@ class Sample(BaseModel):
     def genome_size(self):
         return self.data.get("genome_size", 0)
 
+    @property
+    def genome_size_bases(self):
+        return self.data.get("genome_size_bases", 100_000_000)
+
+    @property
+    def needs_genome_size(self):
+        return self.target_num_reads == 0 and self.genome_size == 0
+
     @property
     def min_length(self):
         return self.data.get("min_length", 100)
@@ -108,6 +114,26 @@ class Sample(BaseModel):
     def skip_filter(self):
         return self.data.get("skip_filter", True)
 
+    @property
+    def fused_downsample(self):
+        fused = self.data.get("fused_downsample", False)
+        return fused and self.target_num_reads != -1 and not self.skip_filter
+
+    @property
+    def prefer_longest(self):
+        return self.data.get("prefer_longest", False)
+
+    @property
+    def bandage_max_nodes(self):
+        return self.data.get("bandage_max_nodes", 50_000)
+
+    @property
+    def bandage_max_edges(self):
+        return self.data.get("bandage_max_edges", 100_000)
+
+    def read_groups(self, read_type):
+        return group_reads(self.label, read_type, self.data[read_type])
+
     @property
     def best_long_read_type(self):
         for read_type in BEST_LR_ORDER:
@@ -121,9 +147,8 @@ class Sample(BaseModel):
         for read_type in READ_TYPES:
             if read_type not in self.data:
                 continue
-            fastqs = self.data[read_type]
             fastqc_dir = f"analysis/{self.label}/qc/{read_type}/fastqc"
-            if len(fastqs) == 2:
+            if len(self.read_groups(read_type)) == 2:
                 fastq_paths.append(f"{fastqc_dir}/R1_fastqc.html")
                 fastq_paths.append(f"{fastqc_dir}/R2_fastqc.html")
                 continue
@@ -131,5 +156,35 @@ class Sample(BaseModel):
         return fastq_paths
 
 
+def group_reads(label, read_type, reads):
+    # Files of each mate: [R1 files, R2 files] for paired-end Illumina reads, else [files]. Two
+    # Illumina files from one lane are a pair, as always; otherwise (lanes, flowcells) the files
+    # are paired up by the R1/R2 (or _1/_2) token in their names
+    if read_type != "illumina" or len(reads) == 1:
+        return [list(reads)]
+    if len(reads) == 2 and not is_lane_series(reads):
+        return [[reads[0]], [reads[1]]]
+    mates = {"1": list(), "2": list()}
+    for read in reads:
+        name = Path(read).name
+        tokens = list(MATE_TOKEN.finditer(name))
+        if tokens:
+            mate = tokens[-1]
+            mates[mate.group(1)].append((name[: mate.start()] + name[mate.end() :], read))
+    if not mates["2"]:
+        return [list(reads)]
+    r1, r2 = sorted(mates["1"]), sorted(mates["2"])
+    if len(r1) + len(r2) != len(reads) or [stem for stem, _ in r1] != [stem for stem, _ in r2]:
+        names = [Path(read).name for read in reads]
+        message = f"Unable to pair Illumina FASTQ files for sample '{label}' by their R1/R2 file names: {names}"
+        raise SampleConfigurationError(message)
+    return [[read for _, read in r1], [read for _, read in r2]]
+
+
+def is_lane_series(reads):
+    lanes = [LANE_TOKEN.search(Path(read).name) for read in reads]
+    return all(lanes) and len({lane.group(1) for lane in lanes}) > 1
+
+
 class SampleConfigurationError(ValueError):
     pass
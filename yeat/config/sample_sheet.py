@@ -0,0 +1,125 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from .global_settings import GlobalSettings
+from .globs import resolve_globs
+from .sample import READ_TYPES, Sample, SampleConfigurationError, group_reads
+import csv
+import os
+from pathlib import Path
+
+
+SETTING_TYPES = {name: type(field.default) for name, field in GlobalSettings.model_fields.items()}
+BOOLEAN_VALUES = {"true": True, "yes": True, "1": True, "false": False, "no": False, "0": False}
+MAX_REPORTED_ERRORS = 20
+
+
+def read_sample_sheet(path, global_settings, threads=1):
+    # Rows are checked as they are read and every problem is reported together; the Sample
+    # objects are then built without a second round of pydantic validation
+    path = Path(path)
+    errors, rows, patterns = list(), dict(), set()
+    with open(path, "r", newline="") as fh:
+        reader = csv.reader(fh, delimiter="," if path.suffix.lower() == ".csv" else "\t")
+        header = check_header(next(reader, None), path)
+        for line, row in enumerate(reader, 2):
+            if not any(cell.strip() for cell in row):
+                continue
+            if len(row) != len(header):
+                errors.append((line, f"expected {len(header)} columns, found {len(row)}"))
+                continue
+            label, data = parse_row(dict(zip(header, row)), line, str(path.parent), rows, errors)
+            if label is not None:
+                rows[label] = (line, data)
+                for read_type in data.keys() & READ_TYPES:
+                    patterns.update(data[read_type])
+    matches, _ = resolve_globs(patterns, threads)
+    defaults = global_settings.model_dump()
+    samples = dict()
+    for label, (line, data) in rows.items():
+        for read_type in data.keys() & READ_TYPES:
+            reads = sorted({read for pattern in data[read_type] for read in matches[pattern]})
+            paths = ";".join(data[read_type])
+            if not reads:
+                message = f"unable to find FASTQ files for sample '{label}' at path: {paths}"
+                errors.append((line, message))
+            try:
+                group_reads(label, read_type, reads)
+            except SampleConfigurationError as error:
+                errors.append((line, str(error)))
+            data[read_type] = [Path(read) for read in reads]
+        samples[label] = Sample.model_construct(label=label, data=defaults | data)
+    if errors:
+        raise SampleSheetError(format_errors(path, errors))
+    return samples
+
+
+def check_header(header, path):
+    if not header:
+        raise SampleSheetError(f"empty sample sheet: {path}")
+    header = [column.strip() for column in header]
+    if header[0] != "sample":
+        raise SampleSheetError(f"first column of sample sheet {path} must be 'sample'")
+    unknown = [column for column in header[1:] if column not in READ_TYPES | SETTING_TYPES.keys()]
+    if unknown:
+        raise SampleSheetError(f"unknown column(s) in sample sheet {path}: {unknown}")
+    if len(set(header)) != len(header):
+        raise SampleSheetError(f"duplicate column(s) in sample sheet {path}")
+    if not set(header) & READ_TYPES:
+        raise SampleSheetError(f"sample sheet {path} has no read type columns")
+    return header
+
+
+def parse_row(row, line, sheet_dir, rows, errors):
+    label = row.pop("sample").strip()
+    if not label:
+        errors.append((line, "missing sample name"))
+        return None, None
+    if label in rows:
+        errors.append((line, f"sample '{label}' already defined on line {rows[label][0]}"))
+        return None, None
+    data = dict()
+    for column, value in row.items():
+        value = value.strip()
+        if not value:
+            continue
+        if column in READ_TYPES:
+            data[column] = [os.path.join(sheet_dir, path.strip()) for path in value.split(";")]
+            continue
+        try:
+            data[column] = parse_setting(column, value)
+        except ValueError:
+            expected = SETTING_TYPES[column].__name__
+            message = f"invalid {column} '{value}' for sample '{label}'; expected {expected}"
+            errors.append((line, message))
+    if not data.keys() & READ_TYPES:
+        errors.append((line, f"sample '{label}' has no reads"))
+        return None, None
+    return label, data
+
+
+def parse_setting(column, value):
+    if SETTING_TYPES[column] is bool:
+        if value.lower() not in BOOLEAN_VALUES:
+            raise ValueError(value)
+        return BOOLEAN_VALUES[value.lower()]
+    return SETTING_TYPES[column](value)
+
+
+def format_errors(path, errors):
+    lines = [f"{len(errors)} problem(s) in sample sheet {path}:"]
+    errors = sorted(errors, key=lambda error: error[0])
+    lines.extend(f"  line {line}: {message}" for line, message in errors[:MAX_REPORTED_ERRORS])
+    if len(errors) > MAX_REPORTED_ERRORS:
+        lines.append(f"  ... and {len(errors) - MAX_REPORTED_ERRORS} more")
+    return "\n".join(lines)
+
+
+class SampleSheetError(ValueError):
+    pass
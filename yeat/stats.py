@@ -0,0 +1,121 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import csv
+import json
+
+CHUNK_SIZE = 16 * 1024**2
+MIN_CONTIG = 500  # QUAST default
+
+
+def read_fasta_composition(path, chunk_size=CHUNK_SIZE):
+    import numpy as np
+
+    lengths, gc_counts, n_counts = list(), list(), list()
+    remainder = b""
+    with open(path, "rb") as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            data = remainder + chunk
+            if not chunk:
+                remainder = b""
+                if data and not data.endswith(b"\n"):
+                    data += b"\n"
+            else:
+                end = data.rfind(b"\n") + 1
+                data, remainder = data[:end], data[end:]
+            if data:
+                counts = _count_chunk(np.frombuffer(data, dtype=np.uint8), len(lengths) > 0)
+                for totals, new in zip((lengths, gc_counts, n_counts), counts):
+                    if totals and len(new):
+                        totals[-1] += int(new[0])
+                    totals.extend(new[1:].tolist())
+            if not chunk:
+                break
+    return np.array(lengths, dtype=np.int64), np.array(gc_counts), np.array(n_counts)
+
+
+def _count_chunk(data, in_record):
+    # Element 0 counts bases that continue the record left open by the previous chunk
+    import numpy as np
+
+    line_starts = np.concatenate(([True], data[:-1] == ord("\n")))
+    header_starts = np.flatnonzero((data == ord(">")) & line_starts)
+    newlines = np.flatnonzero(data == ord("\n"))
+    header_ends = newlines[np.searchsorted(newlines, header_starts)]
+    # Segments alternate: leading sequence, header 1, sequence 1, header 2, sequence 2, ...
+    bounds = np.empty(2 * len(header_starts) + 1, dtype=np.int64)
+    bounds[0] = 0
+    bounds[1::2] = header_starts
+    bounds[2::2] = header_ends
+    upper = data & 0xDF
+    masks = (
+        (upper - ord("A")) < 26,
+        (upper == ord("G")) | (upper == ord("C")),
+        upper == ord("N"),
+    )
+    counts = list()
+    for mask in masks:
+        segments = np.add.reduceat(mask.view(np.uint8), bounds, dtype=np.int64)
+        if len(header_starts) and header_starts[0] == 0:
+            segments[0] = 0
+        counts.append(np.concatenate((segments[:1], segments[2::2])))
+    if not in_record and counts[0][0] > 0:
+        raise FastaFormatError("sequence found before the first FASTA header")
+    return tuple(counts)
+
+
+def assembly_stats(lengths, gc_counts, n_counts, min_contig=MIN_CONTIG):
+    import numpy as np
+
+    order = np.argsort(lengths)[::-1]
+    lengths, gc_counts, n_counts = lengths[order], gc_counts[order], n_counts[order]
+    large = lengths >= min_contig
+    stats = {
+        "# contigs (>= 0 bp)": int(len(lengths)),
+        "Total length (>= 0 bp)": int(lengths.sum()),
+        "# contigs": int(large.sum()),
+        "Largest contig": int(lengths[0]) if len(lengths) else 0,
+        "Total length": int(lengths[large].sum()),
+    }
+    total_length = stats["Total length"]
+    acgt = total_length - int(n_counts[large].sum())
+    stats["GC (%)"] = round(100 * int(gc_counts[large].sum()) / acgt, 2) if acgt else 0.0
+    for fraction in (50, 90):
+        nx, lx = _nx(lengths[large], fraction)
+        stats[f"N{fraction}"] = nx
+        stats[f"L{fraction}"] = lx
+    n_per_100_kbp = 100000 * int(n_counts[large].sum()) / total_length if total_length else 0.0
+    stats["# N's per 100 kbp"] = round(n_per_100_kbp, 2)
+    return stats
+
+
+def _nx(sorted_lengths, fraction):
+    import numpy as np
+
+    if len(sorted_lengths) == 0:
+        return 0, 0
+    cumulative = np.cumsum(sorted_lengths)
+    index = int(np.searchsorted(cumulative, cumulative[-1] * fraction / 100))
+    return int(sorted_lengths[index]), index + 1
+
+
+def write_assembly_stats(fasta, label, tsv, json_file, min_contig=MIN_CONTIG):
+    stats = assembly_stats(*read_fasta_composition(fasta), min_contig=min_contig)
+    with open(tsv, "w", newline="") as fh:
+        writer = csv.writer(fh, delimiter="\t", lineterminator="\n")
+        writer.writerow(("Assembly", label))
+        writer.writerows(stats.items())
+    with open(json_file, "w") as fh:
+        json.dump({"assembly": label, **stats}, fh, indent=4)
+    return stats
+
+
+class FastaFormatError(ValueError):
+    pass
@@ -7,9 +7,11 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+import gzip
 from importlib.resources import files
 import multiprocessing
 from pathlib import Path
+from random import Random
 from yeat.cli import main, cli
 from yeat.config.assemblers import ALGORITHM_CONFIGS
 from yeat.config.config import AssemblyConfiguration
@@ -58,3 +60,14 @@ def final_contig_files_exist(wd, config_path):
             search_dir = Path(f"{wd}/analysis/{sample_label}/yeat/{algo_key}/{assembler_label}")
             matches = list(search_dir.glob(contig_file))
             assert len(matches) == 1
+
+
+def write_fastq(path, num_reads, length=100, seed=42, mate=None, header=None, quality="I"):
+    rng = Random(seed)
+    suffix = f"/{mate}" if mate else ""
+    header = header or f"read{{i}}{suffix}"
+    with gzip.open(path, "wt") as fh:
+        for i in range(num_reads):
+            sequence = "".join(rng.choices("ACGT", k=length))
+            print(f"@{header.format(i=i)}\n{sequence}\n+\n{quality * length}", file=fh)
+    return path
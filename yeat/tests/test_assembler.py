@@ -11,6 +11,7 @@ from pydantic import ValidationError
 import pytest
 from yeat.config.assemblers.assembler import AssemblerConfigurationError
 from yeat.config.assemblers.flye import FlyeAssembler
+from yeat.config.assemblers.megahit import MEGAHITAssembler
 from yeat.config.sample import Sample
 
 
@@ -56,3 +57,77 @@ def test_select_samples_manual_selection_not_avaliable():
     message = "Sample 'sample2' not found in provided samples"
     with pytest.raises(AssemblerConfigurationError, match=message):
         FlyeAssembler.select_samples(data, samples)
+
+
+@pytest.mark.parametrize(
+    "data,threads,mem_mb,runtime",
+    [
+        ({"algorithm": "flye"}, 16, 32768, 1440),
+        ({"algorithm": "flye", "threads": 4}, 4, 32768, 1440),
+        ({"algorithm": "flye", "threads": 4, "mem_mb": 8192, "runtime": 30}, 4, 8192, 30),
+    ],
+)
+def test_parse_resources(data, threads, mem_mb, runtime):
+    samples = {"sample1": Sample(label="sample1", data={"ont_simplex": ["READ.fastq.gz"]})}
+    assembler = FlyeAssembler.parse_data("flye_default", data, samples)
+    assert assembler.resources.threads == threads
+    assert assembler.resources.mem_mb == mem_mb
+    assert assembler.resources.runtime == runtime
+
+
+def test_default_resources():
+    samples = {"sample1": Sample(label="sample1", data={"ont_simplex": ["READ.fastq.gz"]})}
+    assembler = FlyeAssembler(label="flye_default", arguments="", samples=samples)
+    assert assembler.resources == FlyeAssembler.default_resources
+
+
+@pytest.mark.parametrize("input_size_mb,expected", [(0, 32768), (1024, 32768), (8192, 49152)])
+def test_estimate_mem_mb(input_size_mb, expected):
+    samples = {"sample1": Sample(label="sample1", data={"ont_simplex": ["READ.fastq.gz"]})}
+    assembler = FlyeAssembler(label="flye_default", arguments="", samples=samples)
+    assert assembler.estimate_mem_mb(input_size_mb) == expected
+
+
+@pytest.mark.parametrize(
+    "data,target",
+    [
+        ({"algorithm": "flye"}, "analysis/sample1/yeat/flye/flye_default/quast/report.html"),
+        (
+            {"algorithm": "flye", "report": "stats"},
+            "analysis/sample1/yeat/flye/flye_default/stats/report.tsv",
+        ),
+    ],
+)
+def test_report_target(data, target):
+    samples = {"sample1": Sample(label="sample1", data={"ont_simplex": ["READ.fastq.gz"]})}
+    assembler = FlyeAssembler.parse_data("flye_default", data, samples)
+    assert assembler.targets[0] == target
+
+
+def test_invalid_report():
+    samples = {"sample1": Sample(label="sample1", data={"ont_simplex": ["READ.fastq.gz"]})}
+    data = {"algorithm": "flye", "report": "busco"}
+    with pytest.raises(ValidationError, match=r"Unknown report 'busco'"):
+        FlyeAssembler.parse_data("flye_default", data, samples)
+
+
+def test_graph_files(tmp_path):
+    for name in ("assembly_graph.gfa", "40-polishing/filtered_contigs.gfa", "flye.log"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("S\t1\tACGT\n")
+    samples = {"sample1": Sample(label="sample1", data={"ont_simplex": ["READ.fastq.gz"]})}
+    assembler = FlyeAssembler(label="flye_default", arguments="", samples=samples)
+    graphs = [f"{tmp_path}/40-polishing/filtered_contigs.gfa", f"{tmp_path}/assembly_graph.gfa"]
+    assert assembler.graph_files(tmp_path) == graphs
+
+
+def test_megahit_graph_files(tmp_path):
+    intermediates_dir = tmp_path / "intermediate_contigs"
+    intermediates_dir.mkdir()
+    for name in ("k21.contigs.fa", "k29.contigs.fa", "k21.addi.fa"):
+        (intermediates_dir / name).write_text(">contig\nACGT\n")
+    (intermediates_dir / "k39.contigs.fa").touch()
+    samples = {"sample1": Sample(label="sample1", data={"illumina": ["READ.fastq.gz"]})}
+    assembler = MEGAHITAssembler(label="megahit_default", arguments="", samples=samples)
+    graphs = [str(intermediates_dir / f"k{kmer}.contigs.fastg") for kmer in (21, 29)]
+    assert assembler.graph_files(tmp_path) == graphs
@@ -7,9 +7,12 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+import gzip
+import hashlib
 import pytest
-from yeat.tests import data_file
-from yeat.workflow.qc.aux import copy_input
+from yeat.tests import data_file, write_fastq
+from yeat.workflow.qc import aux
+from yeat.workflow.qc.aux import CopyInputError, copy_input, copy_inputs, link_input
 
 
 @pytest.mark.parametrize("do_copy, expected_symlink", [(True, False), (False, True)])
@@ -19,3 +22,97 @@ def test_copy_input(tmp_path, do_copy, expected_symlink):
     copy_input(src_file, dest_file, do_copy)
     assert dest_file.exists()
     assert dest_file.is_symlink() == expected_symlink
+
+
+@pytest.mark.parametrize("do_copy", [True, False])
+def test_copy_input_concatenates_lanes(tmp_path, do_copy):
+    lanes = [write_fastq(tmp_path / f"L00{lane}.fastq.gz", 10, seed=lane) for lane in (1, 2, 3)]
+    dest_file = tmp_path / "R1.fastq.gz"
+    copy_input(lanes, dest_file, do_copy)
+    assert not dest_file.is_symlink()
+    assert dest_file.stat().st_size == sum(lane.stat().st_size for lane in lanes)
+    with gzip.open(dest_file, "rb") as fh:
+        observed = fh.read()
+    expected = b"".join(gzip.open(lane, "rb").read() for lane in lanes)
+    assert observed == expected
+    assert observed.count(b"@read") == 30
+
+
+def test_copy_input_single_file_list(tmp_path):
+    dest_file = tmp_path / "read.fastq.gz"
+    copy_input([data_file("short_reads_1.fastq.gz")], dest_file, False)
+    assert dest_file.is_symlink()
+
+
+def test_copy_input_mixed_compression(tmp_path):
+    compressed = write_fastq(tmp_path / "L001.fastq.gz", 1)
+    plain = tmp_path / "L002.fastq"
+    plain.write_text("@read0\nACGT\n+\nIIII\n")
+    with pytest.raises(CopyInputError, match="cannot combine gzip-compressed and uncompressed"):
+        copy_input([compressed, plain], tmp_path / "R1.fastq.gz", False)
+
+
+def fail(*args):
+    raise OSError("operation not supported")
+
+
+@pytest.mark.parametrize("reflink", [True, False])
+def test_copy_input_strategy(tmp_path, monkeypatch, reflink):
+    if not reflink:
+        monkeypatch.setattr(aux.fcntl, "ioctl", fail)
+    else:
+        monkeypatch.setattr(aux.fcntl, "ioctl", lambda dst, op, src: None)
+    src_file = write_fastq(tmp_path / "src.fastq.gz", 100)
+    dest_file = tmp_path / "R1.fastq.gz"
+    copy_input(src_file, dest_file, True)
+    assert not dest_file.is_symlink()
+    assert dest_file.stat().st_ino != src_file.stat().st_ino
+    assert src_file.stat().st_nlink == 1
+    if not reflink:
+        assert dest_file.read_bytes() == src_file.read_bytes()
+
+
+def test_copy_input_parallel_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(aux.fcntl, "ioctl", fail)
+    monkeypatch.setattr(aux, "CHUNK_SIZE", 1000)
+    src_file = write_fastq(tmp_path / "src.fastq", 500)
+    dest_file = tmp_path / "read.fastq"
+    copy_input(src_file, dest_file, True, threads=4)
+    assert dest_file.read_bytes() == src_file.read_bytes()
+
+
+@pytest.mark.parametrize("do_copy", [True, False])
+@pytest.mark.parametrize("checksum", ["sha256", "md5"])
+def test_copy_input_checksum(tmp_path, do_copy, checksum):
+    lanes = [write_fastq(tmp_path / f"L00{lane}.fastq.gz", 10, seed=lane) for lane in (1, 2)]
+    jobs = [(lanes[0], tmp_path / "R1.fastq.gz"), (lanes, tmp_path / "R2.fastq.gz")]
+    copy_inputs(jobs, do_copy, checksum, threads=2)
+    for _, dest_file in jobs:
+        expected = hashlib.new(checksum, dest_file.read_bytes()).hexdigest()
+        observed = (tmp_path / f"{dest_file.name}.{checksum}").read_text()
+        assert observed == f"{expected}  {dest_file.name}\n"
+
+
+def test_copy_input_unsupported_checksum(tmp_path):
+    src_file = write_fastq(tmp_path / "src.fastq.gz", 1)
+    with pytest.raises(CopyInputError, match="unsupported checksum 'crc32'"):
+        copy_input(src_file, tmp_path / "read.fastq.gz", False, checksum="crc32")
+
+
+def test_link_input(tmp_path):
+    src_file = tmp_path / "reads.fastq.gz"
+    src_file.write_text("READS")
+    symlink = tmp_path / "symlink.fastq.gz"
+    symlink.symlink_to(src_file.name)
+    dest_file = tmp_path / "linked.fastq.gz"
+    link_input(symlink, dest_file)
+    symlink.unlink()
+    assert dest_file.is_symlink()
+    assert dest_file.read_text() == "READS"
+    assert src_file.stat().st_nlink == 1
+    temp_file = tmp_path / "chopper.fastq.gz"
+    temp_file.write_text("FILTERED")
+    link_input(temp_file, tmp_path / "downsample.fastq.gz")
+    temp_file.unlink()
+    assert not (tmp_path / "downsample.fastq.gz").is_symlink()
+    assert (tmp_path / "downsample.fastq.gz").read_text() == "FILTERED"
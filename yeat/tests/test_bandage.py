@@ -0,0 +1,99 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import csv
+import os
+import pytest
+import sys
+from yeat.workflow.bandage import (
+    BandageError,
+    graph_size,
+    read_graph_manifest,
+    render_graphs,
+    write_graph_manifest,
+)
+
+FAKE_BANDAGE = """#!{python}
+import sys
+if sys.argv[2].endswith("bad.gfa"):
+    sys.exit("cannot load graph")
+with open(sys.argv[3], "w") as fh:
+    fh.write("jpg")
+"""
+FASTG = """>EDGE_1_length_100_cov_10:EDGE_2_length_50_cov_8',EDGE_3_length_80_cov_9;
+ACGT
+>EDGE_1_length_100_cov_10':EDGE_3_length_80_cov_9';
+ACGT
+>EDGE_2_length_50_cov_8;
+ACGT
+>EDGE_3_length_80_cov_9:EDGE_2_length_50_cov_8;
+ACGT
+"""
+
+
+def write_gfa(path, num_nodes):
+    lines = ["H\tVN:Z:1.0"]
+    lines.extend(f"S\t{node}\tACGT" for node in range(num_nodes))
+    lines.extend(f"L\t{node}\t+\t{node + 1}\t+\t0M" for node in range(num_nodes - 1))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def fake_bandage(tmp_path, monkeypatch):
+    bandage = tmp_path / "bin" / "Bandage"
+    bandage.parent.mkdir()
+    bandage.write_text(FAKE_BANDAGE.format(python=sys.executable))
+    bandage.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bandage.parent}:{os.environ['PATH']}")
+
+
+def test_graph_size_gfa(tmp_path):
+    gfa = write_gfa(tmp_path / "graph.gfa", 10)
+    assert graph_size(gfa) == (10, 9)
+    assert graph_size(gfa, max_nodes=4) == (5, 0)
+
+
+def test_graph_size_fastg(tmp_path):
+    fastg = tmp_path / "k21.contigs.fastg"
+    fastg.write_text(FASTG)
+    assert graph_size(fastg) == (3, 3)
+
+
+def test_render_graphs(tmp_path, fake_bandage):
+    label_dir = tmp_path / "spades_default"
+    graphs = [write_gfa(label_dir / f"graph{num_nodes}.gfa", num_nodes) for num_nodes in (5, 50)]
+    graphs.append(write_gfa(label_dir / "sub" / "graph.gfa", 3))
+    (label_dir / "empty.gfa").touch()
+    graphs.append(label_dir / "empty.gfa")
+    status = tmp_path / "bandage" / ".done"
+    status.parent.mkdir()
+    render_graphs(graphs, label_dir, tmp_path / "bandage", status, threads=2, max_nodes=20)
+    assert (tmp_path / "bandage" / "graph5.jpg").exists()
+    assert (tmp_path / "bandage" / "sub" / "graph.jpg").exists()
+    assert not (tmp_path / "bandage" / "graph50.jpg").exists()
+    with open(status, newline="") as fh:
+        rows = list(csv.DictReader(fh, delimiter="\t"))
+    assert [row["Status"] for row in rows] == ["rendered", "skipped", "rendered"]
+
+
+def test_render_graphs_failure(tmp_path, fake_bandage):
+    graph = write_gfa(tmp_path / "bad.gfa", 3)
+    message = r"Bandage failed to render .*bad.gfa \(exit status 1\): cannot load graph"
+    with pytest.raises(BandageError, match=message):
+        render_graphs([graph], tmp_path, tmp_path / "bandage", tmp_path / ".done")
+
+
+def test_graph_manifest(tmp_path):
+    graphs = ["assembly_graph.gfa", "sub dir/graph.gfa"]
+    write_graph_manifest(graphs, tmp_path / "graphs.txt")
+    assert read_graph_manifest(tmp_path / "graphs.txt") == graphs
+    write_graph_manifest([], tmp_path / "empty.txt")
+    assert read_graph_manifest(tmp_path / "empty.txt") == []
@@ -0,0 +1,67 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import json
+import pytest
+from yeat.bench import compare_timings, run_benchmark, write_stub_config
+from yeat.cli.yeat_bench import get_parser, main
+from yeat.config.config import AssemblyConfiguration
+from yeat.workflow import get_config_data
+
+
+def run_yeat_bench(arglist):
+    args = get_parser().parse_args(arglist)
+    main(args)
+
+
+def test_write_stub_config(tmp_path):
+    config = write_stub_config(tmp_path, 5, ["spades", "flye"])
+    data = get_config_data(config)
+    assert data["samples"]["sample3"]["ont_simplex"] == [
+        str(tmp_path / "reads/sample3_ont_simplex.fastq.gz")
+    ]
+    asm_cfg = AssemblyConfiguration.parse_snakemake_config(data)
+    assert len(asm_cfg.samples) == 5
+    assert len(asm_cfg.assemblers["flye_default"].samples) == 5
+
+
+def test_run_benchmark_without_dag(tmp_path):
+    timings = run_benchmark(3, ["spades"], tmp_path, repeats=1, dag=False)
+    assert list(timings) == ["load", "parse", "targets"]
+
+
+def test_compare_timings():
+    baseline = {"10x4": {"parse": 1.0, "dag": 10.0}}
+    results = {"10x4": {"parse": 1.2, "dag": 13.0, "load": 0.5}, "100x4": {"parse": 9.0}}
+    assert compare_timings(results, baseline) == [("10x4", "dag", 10.0, 13.0)]
+    assert compare_timings(results, baseline, tolerance=0.1) == [
+        ("10x4", "parse", 1.0, 1.2),
+        ("10x4", "dag", 10.0, 13.0),
+    ]
+
+
+def test_yeat_bench(capsys, tmp_path):
+    output = tmp_path / "timings.json"
+    arglist = ["--samples", "2", "--assemblers", "spades", "megahit", "--repeats", "1"]
+    run_yeat_bench(arglist + ["-w", str(tmp_path), "-o", str(output)])
+    out, err = capsys.readouterr()
+    assert out.splitlines()[0] == "Case\tload\tparse\ttargets\tdag"
+    assert out.splitlines()[1].startswith("2x2\t")
+    with open(output) as fh:
+        assert set(json.load(fh)["2x2"]) == {"load", "parse", "targets", "dag"}
+
+
+def test_yeat_bench_regression(capsys, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"2x1": {"parse": 1e-9}}))
+    arglist = ["--samples", "2", "--assemblers", "spades", "--repeats", "1", "--no-dag"]
+    with pytest.raises(SystemExit):
+        run_yeat_bench(arglist + ["--baseline", str(baseline)])
+    out, err = capsys.readouterr()
+    assert "[yeat-bench] 2x1 parse:" in err
@@ -0,0 +1,152 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import os
+import pytest
+import time
+from yeat.config.config import AssemblyConfiguration
+from yeat.tests import write_fastq
+from yeat.workflow import get_config_data, run_workflow
+from yeat.workflow.qc.cache import QCCache
+
+QC_FILES = [
+    "fastqc/R1_fastqc.html",
+    "fastqc/R2_fastqc.html",
+    "fastp/R1.fastq.gz",
+    "fastp/R2.fastq.gz",
+    "genome_size/report.tsv",
+    "downsample/R1.fastq.gz",
+    "downsample/R2.fastq.gz",
+    "downsample/R1.fqidx",
+    "downsample/R2.fqidx",
+]
+
+
+@pytest.fixture
+def config(tmp_path):
+    for mate in (1, 2):
+        write_fastq(tmp_path / f"reads_{mate}.fastq.gz", 10, mate=mate)
+    config = tmp_path / "config.toml"
+    config.write_text(
+        f'[samples.sample1]\nillumina = "{tmp_path}/reads_?.fastq.gz"\ntarget_num_reads = 5\n\n'
+        '[assemblers.spades_default]\nalgorithm = "spades"\n'
+    )
+    return config
+
+
+def parse_config(config):
+    return AssemblyConfiguration.parse_snakemake_config(get_config_data(config))
+
+
+def write_qc_dir(workdir, config):
+    qc_dir = workdir / "analysis/sample1/qc/illumina"
+    qc_dir.mkdir(parents=True)
+    for mate in (1, 2):
+        (qc_dir / f"R{mate}.fastq.gz").symlink_to(config.parent / f"reads_{mate}.fastq.gz")
+    for n, path in enumerate(QC_FILES):
+        (qc_dir / path).parent.mkdir(exist_ok=True)
+        (qc_dir / path).write_text(path)
+        os.utime(qc_dir / path, (time.time() + n, time.time() + n))
+    return qc_dir
+
+
+def get_key(config, seed=0, **options):
+    asm_cfg = parse_config(config)
+    return QCCache.key(asm_cfg.samples["sample1"], "illumina", seed, options)
+
+
+def test_key_is_stable(config):
+    assert get_key(config) == get_key(config)
+
+
+def test_key_changes_with_seed_and_settings(config):
+    key = get_key(config)
+    assert get_key(config, seed=1) != key
+    config.write_text(config.read_text().replace("target_num_reads = 5", "target_num_reads = 6"))
+    assert get_key(config) != key
+
+
+@pytest.mark.parametrize(
+    "option,values",
+    [
+        ("checksum", [None, "sha256", "md5"]),
+        ("copy_input", [False, True]),
+        ("compression_level", [1, 6]),
+        ("temp_intermediates", [False, True]),
+    ],
+)
+def test_key_changes_with_options(config, option, values):
+    keys = {get_key(config, **{option: value}) for value in values}
+    assert len(keys) == len(values)
+
+
+def test_restore_requires_same_options(tmp_path, config):
+    write_qc_dir(tmp_path / "wd1", config)
+    cache = QCCache(tmp_path / "cache")
+    cache.store_samples(parse_config(config), tmp_path / "wd1", 0, {"copy_input": False})
+    cache.restore_samples(parse_config(config), tmp_path / "wd2", 0, {"copy_input": True})
+    assert not (tmp_path / "wd2/analysis/sample1/qc/illumina").exists()
+    cache.restore_samples(parse_config(config), tmp_path / "wd3", 0, {"copy_input": False})
+    assert (tmp_path / "wd3/analysis/sample1/qc/illumina/R1.fastq.gz").is_symlink()
+
+
+def test_key_ignores_seed_without_downsampling(config):
+    config.write_text(config.read_text().replace("target_num_reads = 5", "target_num_reads = -1"))
+    assert get_key(config, seed=1) == get_key(config, seed=2)
+
+
+def test_key_changes_with_input(config):
+    key = get_key(config)
+    read = config.parent / "reads_1.fastq.gz"
+    os.utime(read, ns=(0, read.stat().st_mtime_ns + 1))
+    assert get_key(config) != key
+
+
+def test_store_and_restore(tmp_path, config):
+    qc_dir = write_qc_dir(tmp_path / "wd1", config)
+    cache = QCCache(tmp_path / "cache")
+    cache.store_samples(parse_config(config), tmp_path / "wd1", 0)
+    cache.restore_samples(parse_config(config), tmp_path / "wd2", 0)
+    restored = tmp_path / "wd2/analysis/sample1/qc/illumina"
+    assert (restored / "R1.fastq.gz").is_symlink()
+    for path in QC_FILES:
+        assert (restored / path).read_text() == path
+        assert (restored / path).stat().st_mtime == (qc_dir / path).stat().st_mtime
+
+
+def test_restore_miss(tmp_path, config):
+    cache = QCCache(tmp_path / "cache")
+    assert cache.restore(get_key(config), tmp_path / "wd/qc") is False
+    assert not (tmp_path / "wd/qc").exists()
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = QCCache(tmp_path / "cache")
+    for n, key in enumerate(("a", "b", "c")):
+        source = tmp_path / key
+        source.mkdir()
+        (source / "data").write_bytes(b"A" * 1000)
+        assert cache.store(key, source)
+        os.utime(cache.entries / key / "entry.json", (n, n))
+    assert cache.restore("a", tmp_path / "restored")
+    cache.max_size = 1500
+    cache.evict()
+    assert sorted(entry.name for entry in cache.entries.iterdir()) == ["a"]
+
+
+def test_cached_qc_is_not_rerun(capfd, tmp_path, config):
+    cache = QCCache(tmp_path / "cache")
+    write_qc_dir(tmp_path / "wd1", config)
+    cache.store_samples(parse_config(config), tmp_path / "wd1", 0)
+    cache.restore_samples(parse_config(config), tmp_path / "wd2", 0)
+    run_workflow(config, seed=0, workdir=str(tmp_path / "wd2"), dry_run=True)
+    out, err = capfd.readouterr()
+    assert "rule spades:" in out + err
+    assert "rule qc_paired_fastp:" not in out + err
+    assert "rule qc_paired_downsample:" not in out + err
@@ -9,7 +9,7 @@
 
 import pytest
 import toml
-from yeat.cli.cli import InitAction
+from yeat.cli.cli import InitAction, get_parser
 
 
 def test_display_config_template(capsys):
@@ -19,3 +19,13 @@ def test_display_config_template(capsys):
     out, err = capsys.readouterr()
     data = toml.loads(out)
     assert data == InitAction.config_template
+
+
+@pytest.mark.parametrize("level,valid", [("0", False), ("1", True), ("9", True), ("10", False)])
+def test_compression_level(level, valid):
+    arglist = ["--compression-level", level, "config.toml"]
+    if valid:
+        assert get_parser().parse_args(arglist).compression_level == int(level)
+    else:
+        with pytest.raises(SystemExit):
+            get_parser().parse_args(arglist)
@@ -0,0 +1,49 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import gzip
+import os
+import pytest
+from yeat.workflow.qc import compress
+from yeat.workflow.qc.compress import BGZF_EOF, BgzfWriter
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+@pytest.mark.parametrize("size", [0, 100, 3 * 1024 * 1024 + 7])
+def test_bgzf_writer(tmp_path, threads, size):
+    data = os.urandom(size // 2).hex().encode()
+    outfile = tmp_path / "out.gz"
+    with BgzfWriter(outfile, threads=threads) as writer:
+        writer.write(data[: len(data) // 3])
+        writer.write(data[len(data) // 3 :])
+    assert gzip.decompress(outfile.read_bytes()) == data
+    assert outfile.read_bytes().endswith(BGZF_EOF)
+
+
+@pytest.mark.parametrize(
+    "available,level,expected",
+    [
+        ({"bgzip", "pigz"}, 6, "bgzip -c -@ 4 -l 6"),
+        ({"pigz"}, 1, "pigz -c -p 4 -1"),
+        (set(), 6, "gzip -c -6"),
+        (set(), 0, "gzip -c -1"),
+    ],
+)
+def test_compress_command(monkeypatch, available, level, expected):
+    monkeypatch.setattr(compress, "which", lambda name: name if name in available else None)
+    assert compress.compress_command(threads=4, level=level) == expected
+
+
+@pytest.mark.parametrize("level", [0, 1, 9])
+def test_bgzf_writer_level(tmp_path, level):
+    data = b"@read1\nACGT\n+\nIIII\n" * 10000
+    outfile = tmp_path / "out.gz"
+    with BgzfWriter(outfile, level=level) as writer:
+        writer.write(data)
+    assert gzip.decompress(outfile.read_bytes()) == data
@@ -9,9 +9,14 @@
 
 from pydantic import ValidationError
 import pytest
+import time
+from yeat.bench import synthetic_config_data, write_stub_config
 from yeat.config.config import ConfigurationError, AssemblyConfiguration
 from yeat.config.global_settings import GlobalSettings
+from yeat.config.resources import QC_RESOURCES
 from yeat.config.sample import Sample
+from yeat.tests import data_file
+from yeat.workflow import get_config_data, run_workflow
 
 
 def test_has_one_sample():
@@ -31,3 +36,189 @@ def test_algorithm_not_supported():
     message = "Unknown assembly algorithm DNE"
     with pytest.raises(ConfigurationError, match=message):
         AssemblyConfiguration.select("DNE")
+
+
+def test_parse_resources():
+    config = {"resources": {"fastqc": {"threads": 8}, "quast": {"mem_mb": 16384, "runtime": 5}}}
+    resources = AssemblyConfiguration._parse_resources(config)
+    assert resources["fastqc"].threads == 8
+    assert resources["fastqc"].mem_mb == QC_RESOURCES["fastqc"].mem_mb
+    assert resources["quast"].mem_mb == 16384
+    assert resources["quast"].runtime == 5
+    assert resources["fastp"] == QC_RESOURCES["fastp"]
+
+
+def test_parse_resources_unknown_rule():
+    config = {"resources": {"DNE": {"threads": 8}}}
+    message = r"Unknown rule\(s\) in resources: \{'DNE'\}"
+    with pytest.raises(ConfigurationError, match=message):
+        AssemblyConfiguration._parse_resources(config)
+
+
+@pytest.mark.parametrize("data", [{"cores": 8}, {"threads": 0}, {"mem_mb": "lots"}])
+def test_parse_resources_invalid(data):
+    config = {"resources": {"fastqc": data}}
+    with pytest.raises(ValidationError):
+        AssemblyConfiguration._parse_resources(config)
+
+
+@pytest.mark.parametrize(
+    "max_mem_mb,input_size_mb,expected",
+    [(None, 0, 32768), (None, 4096, 49152), (16384, 0, 16384), (16384, 4096, 16384)],
+)
+def test_get_assembler_mem_mb(max_mem_mb, input_size_mb, expected):
+    config = {
+        "samples": {"sample1": {"illumina": ["READ1.fastq.gz", "READ2.fastq.gz"]}},
+        "assemblers": {"spades_default": {"algorithm": "spades"}},
+    }
+    asm_cfg = AssemblyConfiguration.parse_snakemake_config(config, max_mem_mb=max_mem_mb)
+    assert asm_cfg.get_assembler_mem_mb("spades_default", input_size_mb) == expected
+
+
+@pytest.mark.parametrize("max_mem_mb,expected", [(None, 4096), (1024, 1024)])
+def test_get_rule_mem_mb(max_mem_mb, expected):
+    config = {
+        "samples": {"sample1": {"illumina": ["READ1.fastq.gz", "READ2.fastq.gz"]}},
+        "assemblers": {"spades_default": {"algorithm": "spades"}},
+    }
+    asm_cfg = AssemblyConfiguration.parse_snakemake_config(config, max_mem_mb=max_mem_mb)
+    assert asm_cfg.get_rule_mem_mb("fastp") == expected
+
+
+@pytest.mark.parametrize(
+    "genome_size_bases,max_mem_mb,input_size_mb,expected",
+    [
+        (100_000_000, None, 10240, 2048),
+        (0, None, 512, 2048),
+        (0, None, 10240, 20480),
+        (0, 16384, 10240, 16384),
+    ],
+)
+def test_get_genome_size_mem_mb(genome_size_bases, max_mem_mb, input_size_mb, expected):
+    config = {
+        "samples": {
+            "sample1": {
+                "illumina": ["READ1.fastq.gz", "READ2.fastq.gz"],
+                "genome_size_bases": genome_size_bases,
+            }
+        },
+        "assemblers": {"spades_default": {"algorithm": "spades"}},
+    }
+    asm_cfg = AssemblyConfiguration.parse_snakemake_config(config, max_mem_mb=max_mem_mb)
+    assert asm_cfg.get_genome_size_mem_mb("sample1", input_size_mb) == expected
+
+
+@pytest.mark.parametrize(
+    "settings,max_mem_mb,input_size_mb,expected",
+    [
+        ({"target_num_reads": -1}, None, 20480, 8192),
+        ({"target_num_reads": 1000}, None, 20480, 8192),
+        ({"target_num_reads": 0}, None, 1024, 8192),
+        ({"target_num_reads": 0}, None, 20480, 122880),
+        ({"target_num_reads": 0}, 65536, 20480, 65536),
+        ({"target_num_reads": 0, "genome_size": 100_000_000}, None, 20480, 42915),
+        ({"target_num_reads": 0, "genome_size": 5_000_000}, None, 20480, 8192),
+    ],
+)
+def test_get_downsample_mem_mb(settings, max_mem_mb, input_size_mb, expected):
+    config = {
+        "samples": {"sample1": {"ont_simplex": ["READS.fastq.gz"], **settings}},
+        "assemblers": {"flye_default": {"algorithm": "flye"}},
+    }
+    asm_cfg = AssemblyConfiguration.parse_snakemake_config(config, max_mem_mb=max_mem_mb)
+    assert asm_cfg.get_downsample_mem_mb("sample1", input_size_mb) == expected
+
+
+def test_get_sample_contigs():
+    config = AssemblyConfiguration.parse_snakemake_config(
+        get_config_data(data_file("configs/hybrid.toml"))
+    )
+    assert list(config.get_sample_contigs("ecoli_k12")) == ["hifiasm_default", "verkko_default"]
+    for sample in config.samples:
+        contigs = config.get_sample_contigs(sample)
+        for label, path in contigs.items():
+            assert path.startswith(f"analysis/{sample}/yeat/")
+            assert path.endswith(f"/{label}/contigs.fasta")
+    project = config.get_project_contigs()
+    assert len(project) == sum(len(config.get_sample_contigs(sample)) for sample in config.samples)
+
+
+def test_get_rule_priority():
+    data = synthetic_config_data(3, ["spades"])
+    config = AssemblyConfiguration.parse_snakemake_config(data)
+    assert config.get_rule_priority("downsample", "sample0") == 0
+    assert config.get_rule_group() is None
+    config = AssemblyConfiguration.parse_snakemake_config(data, pipelined=True)
+    assert config.get_rule_group() == "sample_{sample}"
+    priority = config.get_rule_priority
+    assert priority("fastqc", "sample0") == priority("quast", "sample0") == 0
+    for sample in config.samples:
+        stages = ["copy_input", "fastp", "downsample", "assembly"]
+        priorities = [priority(stage, sample) for stage in stages]
+        assert 0 < priorities[0] < priorities[1] < priorities[2] < priorities[3]
+    assert (
+        priority("fastp", "sample0") > priority("fastp", "sample1") > priority("fastp", "sample2")
+    )
+    assert priority("downsample", "sample2") > priority("fastp", "sample0")
+
+
+BENCH_ALGORITHMS = [
+    "spades",
+    "megahit",
+    "unicycler",
+    "penguin",
+    "flye",
+    "canu",
+    "hifiasm",
+    "myloasm",
+]
+
+
+def test_resolved_inputs():
+    data = synthetic_config_data(3, ["spades", "penguin", "flye"])
+    config = AssemblyConfiguration.parse_snakemake_config(data)
+    for label, assembler in config.assemblers.items():
+        for sample in assembler.samples:
+            infiles = [path for files in assembler.input_files(sample).values() for path in files]
+            assert config.get_assembler_input_files(label, sample) == infiles
+            assert config.get_assembler_input_args(label, sample) == assembler.input_args(sample)
+    args = config.assemblers["penguin_default"].bowtie2_input_args("sample1")
+    assert config.get_assembler_bowtie2_input_args("penguin_default", "sample1") == args
+    assert config.get_assembler_bowtie2_input_args("spades_default", "sample1") is None
+    config.get_sample_contigs("sample0").clear()
+    assert len(config.get_sample_contigs("sample0")) == 3
+
+
+@pytest.mark.bench
+def test_bench_input_resolution():
+    data = synthetic_config_data(500, BENCH_ALGORITHMS)
+    start = time.perf_counter()
+    config = AssemblyConfiguration.parse_snakemake_config(data)
+    parse_time = time.perf_counter() - start
+    pairs = [(label, sample) for label in config.assemblers for sample in config.samples]
+    start = time.perf_counter()
+    for label, sample in pairs:
+        assembler = config.assemblers[label]
+        assembler.input_files(sample)
+        assembler.input_args(sample)
+    direct_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for label, sample in pairs:
+        config.get_assembler_input_files(label, sample)
+        config.get_assembler_input_args(label, sample)
+    lookup_time = time.perf_counter() - start
+    print(f"\nparse (500 samples x 8 assemblers): {parse_time:.3f}s")
+    print(
+        f"{len(pairs)} input resolutions: {direct_time:.4f}s direct, {lookup_time:.4f}s memoized"
+    )
+
+
+@pytest.mark.bench
+def test_bench_dag_build(capfd, tmp_path):
+    config = write_stub_config(tmp_path, 100, BENCH_ALGORITHMS)
+    start = time.perf_counter()
+    run_workflow(config, seed=1, workdir=str(tmp_path / "wd"), dry_run=True)
+    elapsed = time.perf_counter() - start
+    capfd.readouterr()
+    with capfd.disabled():
+        print(f"\nDAG build (100 samples x 8 assemblers): {elapsed:.3f}s")
@@ -7,9 +7,27 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+import gzip
+import os
 import pytest
-from yeat.workflow.qc.downsample import Downsample
-from yeat.tests import data_file
+from random import Random
+import subprocess
+import sys
+from yeat.workflow.qc import downsample, seek_index
+from yeat.workflow.qc.compress import BgzfWriter
+from yeat.workflow.qc.downsample import (
+    Downsample,
+    downsample_long,
+    downsample_paired,
+    filter_and_downsample,
+    indexed_sample,
+    reservoir_sample,
+    sample_bases,
+    sample_ranges,
+)
+from yeat.workflow.qc.fastq import FastqFormatError, open_fastq, read_fastq, read_name
+from yeat.workflow.qc.seek_index import FastqIndex
+from yeat.tests import data_file, write_fastq
 
 
 def test_downsample():
@@ -44,3 +62,238 @@ def test_get_num_reads(input_down):
     )
     down = downsample.get_num_reads()
     assert down == 3765000
+
+
+@pytest.mark.parametrize("num_records", [0, 1, 10, 100, 1000, 2000])
+def test_reservoir_sample(num_records):
+    records = list(range(1000))
+    sample = reservoir_sample(iter(records), num_records, seed=42)
+    assert len(sample) == min(num_records, 1000)
+    assert sample == sorted(set(sample))
+    assert sample == reservoir_sample(iter(records), num_records, seed=42)
+
+
+def test_reservoir_sample_seed():
+    records = list(range(1000))
+    assert reservoir_sample(iter(records), 10, seed=1) != reservoir_sample(iter(records), 10, 2)
+
+
+def test_downsample_paired(tmp_path):
+    r1 = write_fastq(tmp_path / "R1.fastq.gz", 500, mate=1)
+    r2 = write_fastq(tmp_path / "R2.fastq.gz", 500, seed=7, mate=2)
+    outputs = list()
+    for run in ("a", "b"):
+        r1_out = tmp_path / f"{run}_R1.fastq.gz"
+        r2_out = tmp_path / f"{run}_R2.fastq.gz"
+        downsample_paired(r1, r2, r1_out, r2_out, 50, seed=13, threads=4)
+        outputs.append(
+            (gzip.decompress(r1_out.read_bytes()), gzip.decompress(r2_out.read_bytes()))
+        )
+        with open_fastq(r1_out) as r1_handle, open_fastq(r2_out) as r2_handle:
+            names1 = [read_name(record) for record in read_fastq(r1_handle)]
+            names2 = [read_name(record) for record in read_fastq(r2_handle)]
+        assert len(names1) == 50
+        assert names1 == names2
+    assert outputs[0] == outputs[1]
+
+
+def write_bgzf_fastq(path, num_reads, **kwargs):
+    source = write_fastq(path.with_suffix(".src.gz"), num_reads, length=150, **kwargs)
+    with BgzfWriter(path) as writer:
+        writer.write(gzip.decompress(source.read_bytes()))
+    return path
+
+
+def test_sample_ranges():
+    bounds = [0, 10, 10, 25, 40, 41, 60]
+    ranges = sample_ranges(bounds, 20, seed=3)
+    assert ranges == sorted(ranges)
+    assert all(start in bounds and stop in bounds for start, stop in ranges)
+    assert sum(stop - start for start, stop in ranges) >= 20
+    assert ranges == sample_ranges(bounds, 20, seed=3)
+
+
+def test_downsample_paired_indexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(downsample, "MIN_SAMPLED_CHUNKS", 4)
+    r1 = write_bgzf_fastq(tmp_path / "R1.fastq.gz", 3000, mate=1)
+    r2 = write_bgzf_fastq(tmp_path / "R2.fastq.gz", 3000, seed=7, mate=2)
+    with open_fastq(r1) as fh:
+        names = {read_name(record) for record in read_fastq(fh)}
+    index_paths = [tmp_path / "R1.fqidx", tmp_path / "R2.fqidx"]
+    outputs = list()
+    for run in ("a", "b"):
+        r1_out = tmp_path / f"{run}_R1.fastq.gz"
+        r2_out = tmp_path / f"{run}_R2.fastq.gz"
+        downsample_paired(r1, r2, r1_out, r2_out, 300, 13, 4, index_paths=index_paths)
+        with open_fastq(r1_out) as r1_handle, open_fastq(r2_out) as r2_handle:
+            names1 = [read_name(record) for record in read_fastq(r1_handle)]
+            names2 = [read_name(record) for record in read_fastq(r2_handle)]
+        assert len(names1) == len(set(names1)) == 300
+        assert names1 == names2
+        assert set(names1) <= names
+        outputs.append(r1_out.read_bytes())
+    assert outputs[0] == outputs[1]
+    assert all(path.exists() for path in index_paths)
+
+
+@pytest.mark.parametrize("num_records,min_chunks", [(300, 100), (2000, 4), (3000, 4), (0, 4)])
+def test_indexed_sample_streams(tmp_path, monkeypatch, num_records, min_chunks):
+    monkeypatch.setattr(downsample, "MIN_SAMPLED_CHUNKS", min_chunks)
+    reads = write_bgzf_fastq(tmp_path / "read.fastq.gz", 3000)
+    assert indexed_sample([reads], [FastqIndex.build(reads)], num_records, seed=1) is None
+    assert indexed_sample([reads], [None], num_records, seed=1) is None
+
+
+def test_indexed_sample_read_count_mismatch(tmp_path):
+    r1 = write_bgzf_fastq(tmp_path / "R1.fastq.gz", 300, mate=1)
+    r2 = write_bgzf_fastq(tmp_path / "R2.fastq.gz", 301, mate=2)
+    with pytest.raises(FastqFormatError, match="different number of reads"):
+        indexed_sample([r1, r2], [FastqIndex.build(r1), FastqIndex.build(r2)], 10, seed=1)
+
+
+def test_downsample_long_indexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(downsample, "MIN_SAMPLED_CHUNKS", 4)
+    reads = write_bgzf_fastq(tmp_path / "read.fastq.gz", 3000)
+    output = tmp_path / "out.fastq.gz"
+    index_path = tmp_path / "read.fqidx"
+    downsample_long(reads, output, 13, num_reads=100, index_path=index_path)
+    with open_fastq(output) as fh:
+        assert len(list(read_fastq(fh))) == 100
+    assert FastqIndex.read(index_path).num_records == 3000
+
+
+@pytest.mark.parametrize("compression", ["bgzf", "gzip", "none"])
+def test_downsample_paired_reproducible(tmp_path, monkeypatch, compression):
+    # The same seed must select the same reads whether or not an index was left by an earlier run
+    monkeypatch.setattr(downsample, "MIN_SAMPLED_CHUNKS", 1)
+    monkeypatch.setattr(seek_index, "PLAIN_CHUNK_SIZE", 65536)
+    paths = list()
+    for mate in (1, 2):
+        path = write_bgzf_fastq(tmp_path / f"R{mate}.fastq.gz", 3000, seed=mate, mate=mate)
+        if compression != "bgzf":
+            data = gzip.decompress(path.read_bytes())
+            path.write_bytes(gzip.compress(data) if compression == "gzip" else data)
+        paths.append(path)
+    index_paths = [tmp_path / "R1.fqidx", tmp_path / "R2.fqidx"]
+    outputs = list()
+    for run in range(3):
+        if run == 2:
+            for index_path in index_paths:
+                index_path.unlink()
+        for index_path in index_paths:
+            index_path.touch()
+        out = [tmp_path / f"out{run}_R1.fastq.gz", tmp_path / f"out{run}_R2.fastq.gz"]
+        downsample_paired(*paths, *out, 300, seed=7, index_paths=index_paths)
+        outputs.append([gzip.decompress(path.read_bytes()) for path in out])
+    assert outputs[0] == outputs[1] == outputs[2]
+
+
+FAKE_FASTP = """#!{python}
+import gzip, json, sys
+args = sys.argv[1:]
+inputs = [args[args.index(flag) + 1] for flag in ("-i", "-I") if flag in args]
+with open(args[args.index("--json") + 1], "w") as fh:
+    json.dump({{"summary": {{"after_filtering": {{"total_reads": 1, "total_bases": 1}}}}}}, fh)
+handles = [gzip.open(path, "rb") for path in inputs]
+while True:
+    records = [b"".join(handle.readline() for _ in range(4)) for handle in handles]
+    if not records[0]:
+        break
+    for record in records:
+        sys.stdout.buffer.write(record)
+sys.exit({returncode})
+"""
+
+
+@pytest.fixture
+def fake_fastp(tmp_path, monkeypatch):
+    def install(returncode=0):
+        fastp = tmp_path / "bin" / "fastp"
+        fastp.parent.mkdir(exist_ok=True)
+        fastp.write_text(FAKE_FASTP.format(python=sys.executable, returncode=returncode))
+        fastp.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{fastp.parent}:{os.environ['PATH']}")
+
+    return install
+
+
+@pytest.mark.parametrize("num_inputs", [1, 2])
+def test_filter_and_downsample(tmp_path, fake_fastp, num_inputs):
+    fake_fastp()
+    inputs = [write_fastq(tmp_path / "R1.fastq.gz", 500, mate=1)]
+    inputs.append(write_fastq(tmp_path / "R2.fastq.gz", 500, seed=7, mate=2))
+    inputs = inputs[:num_inputs]
+    outputs = [tmp_path / f"out_R{mate}.fastq.gz" for mate in range(1, num_inputs + 1)]
+    report = tmp_path / "fastp" / "fastp.json"
+    log = tmp_path / "fastp" / "report.txt"
+    filter_and_downsample(inputs, outputs, 50, 13, ["--json", report], log, threads=2)
+    assert report.exists()
+    names = list()
+    for output in outputs:
+        with open_fastq(output) as fh:
+            names.append([read_name(record) for record in read_fastq(fh)])
+    assert len(names[0]) == 50
+    assert names[0] == names[-1]
+
+
+def test_filter_and_downsample_fastp_failure(tmp_path, fake_fastp):
+    fake_fastp(returncode=1)
+    reads = write_fastq(tmp_path / "R1.fastq.gz", 10)
+    report = tmp_path / "fastp.json"
+    with pytest.raises(subprocess.CalledProcessError):
+        filter_and_downsample(
+            [reads], [tmp_path / "out.fastq.gz"], 5, 13, ["--json", report], tmp_path / "log"
+        )
+
+
+def test_parse_reads(tmp_path):
+    reads = write_fastq(tmp_path / "R1.fastq.gz", 100, length=150)
+    downsample = Downsample.parse_reads(
+        genome_size=0,
+        mash_report=data_file("report.tsv"),
+        read_path=reads,
+        target_coverage_depth=150,
+        target_num_reads=0,
+    )
+    assert downsample.average_read_length == 150
+    assert downsample.get_num_reads() == 3137500
+
+
+def make_records(lengths):
+    return [
+        f"@read{i}\n{'A' * length}\n+\n{'I' * length}\n".encode()
+        for i, length in enumerate(lengths)
+    ]
+
+
+def test_get_num_bases():
+    downsample = Downsample.parse_long(0, data_file("report.tsv"), 50, 0)
+    assert downsample.get_num_bases() == 6275000 * 50
+
+
+@pytest.mark.parametrize("num_bases", [1, 500, 5000, 50000, 10**9])
+def test_sample_bases(num_bases):
+    records = make_records(Random(1).randint(10, 200) for _ in range(1000))
+    sample = sample_bases(iter(records), num_bases, seed=42)
+    total_bases = sum(len(record.split(b"\n")[1]) for record in sample)
+    smallest = min(len(record.split(b"\n")[1]) for record in sample)
+    assert total_bases >= min(num_bases, sum(len(record.split(b"\n")[1]) for record in records))
+    assert total_bases - smallest < num_bases
+    assert sample == [record for record in records if record in sample]
+    assert sample == sample_bases(iter(records), num_bases, seed=42)
+    assert sample_bases(iter(records), 0, seed=42) == []
+
+
+def test_sample_bases_longest():
+    lengths = [100, 5000, 200, 3000, 4000, 50]
+    sample = sample_bases(iter(make_records(lengths)), 8000, seed=42, longest=True)
+    assert [len(record.split(b"\n")[1]) for record in sample] == [5000, 4000]
+
+
+@pytest.mark.parametrize("num_reads,num_bases,expected", [(10, 0, 10), (0, 2000, 20)])
+def test_downsample_long(tmp_path, num_reads, num_bases, expected):
+    reads = write_fastq(tmp_path / "read.fastq.gz", 100)
+    output = tmp_path / "out.fastq.gz"
+    downsample_long(reads, output, 13, num_reads, num_bases, threads=2)
+    with open_fastq(output) as fh:
+        assert len(list(read_fastq(fh))) == expected
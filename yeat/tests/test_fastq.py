@@ -0,0 +1,115 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import pytest
+from yeat.tests import write_fastq
+from yeat.workflow.qc.fastq import (
+    FastqFormatError,
+    open_fastq,
+    read_fastq,
+    read_interleaved,
+    read_name,
+    read_pairs,
+)
+
+
+def test_read_fastq(tmp_path):
+    infile = write_fastq(tmp_path / "reads.fastq.gz", 10)
+    with open_fastq(infile) as fh:
+        records = list(read_fastq(fh))
+    assert len(records) == 10
+    assert records[0].startswith(b"@read0\n")
+    assert records[0].count(b"\n") == 4
+
+
+def test_read_fastq_uncompressed(tmp_path):
+    infile = tmp_path / "reads.fastq"
+    infile.write_text("@read1\nACGT\n+\nIIII\n")
+    with open_fastq(infile) as fh:
+        assert list(read_fastq(fh)) == [b"@read1\nACGT\n+\nIIII\n"]
+
+
+def test_read_fastq_truncated(tmp_path):
+    infile = tmp_path / "reads.fastq"
+    infile.write_text("@read1\nACGT\n+\n")
+    with open_fastq(infile) as fh:
+        with pytest.raises(FastqFormatError, match="truncated FASTQ record: @read1"):
+            list(read_fastq(fh))
+
+
+@pytest.mark.parametrize(
+    "record,name",
+    [
+        (b"@read1\nA\n+\nI\n", b"read1"),
+        (b"@read1/1\nA\n+\nI\n", b"read1"),
+        (b"@read1 1:N:0:ACGT\nA\n+\nI\n", b"read1"),
+    ],
+)
+def test_read_name(record, name):
+    assert read_name(record) == name
+
+
+def test_read_pairs(tmp_path):
+    r1 = write_fastq(tmp_path / "R1.fastq.gz", 10, mate=1)
+    r2 = write_fastq(tmp_path / "R2.fastq.gz", 10, seed=7, mate=2)
+    with open_fastq(r1) as r1_handle, open_fastq(r2) as r2_handle:
+        assert len(list(read_pairs(r1_handle, r2_handle))) == 10
+
+
+@pytest.mark.parametrize(
+    "num_r2,message",
+    [
+        (9, "paired FASTQ files contain a different number of reads"),
+        (11, "paired FASTQ files contain a different number of reads"),
+    ],
+)
+def test_read_pairs_different_length(tmp_path, num_r2, message):
+    r1 = write_fastq(tmp_path / "R1.fastq.gz", 10, mate=1)
+    r2 = write_fastq(tmp_path / "R2.fastq.gz", num_r2, mate=2)
+    with open_fastq(r1) as r1_handle, open_fastq(r2) as r2_handle:
+        with pytest.raises(FastqFormatError, match=message):
+            list(read_pairs(r1_handle, r2_handle))
+
+
+def test_read_pairs_out_of_sync(tmp_path):
+    r1 = tmp_path / "R1.fastq"
+    r2 = tmp_path / "R2.fastq"
+    r1.write_text("@read1/1\nA\n+\nI\n@read2/1\nA\n+\nI\n")
+    r2.write_text("@read1/2\nA\n+\nI\n@read3/2\nA\n+\nI\n")
+    with open_fastq(r1) as r1_handle, open_fastq(r2) as r2_handle:
+        with pytest.raises(FastqFormatError, match="paired reads out of sync: read2 vs. read3"):
+            list(read_pairs(r1_handle, r2_handle))
+
+
+def test_read_interleaved(tmp_path):
+    interleaved = tmp_path / "interleaved.fastq"
+    interleaved.write_text(
+        "@read1/1\nA\n+\nI\n@read1/2\nC\n+\nI\n@read2/1\nG\n+\nI\n@read2/2\nT\n+\nI\n"
+    )
+    with open_fastq(interleaved) as fh:
+        pairs = list(read_interleaved(fh))
+    assert [(read_name(r1), read_name(r2)) for r1, r2 in pairs] == [
+        (b"read1", b"read1"),
+        (b"read2", b"read2"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "contents,message",
+    [
+        ("@read1/1\nA\n+\nI\n", "interleaved FASTQ contains an odd number of reads"),
+        ("@read1/1\nA\n+\nI\n@read2/2\nA\n+\nI\n", "paired reads out of sync: read1 vs. read2"),
+    ],
+)
+def test_read_interleaved_invalid(tmp_path, contents, message):
+    interleaved = tmp_path / "interleaved.fastq"
+    interleaved.write_text(contents)
+    with open_fastq(interleaved) as fh:
+        with pytest.raises(FastqFormatError, match=message):
+            list(read_interleaved(fh))
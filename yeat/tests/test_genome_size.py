@@ -0,0 +1,84 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import gzip
+import numpy as np
+import pytest
+from random import Random
+from yeat.workflow.qc.genome_size import (
+    GenomeSizeEstimate,
+    kmer_coverage,
+    pack_kmers,
+    poisson_sf,
+    read_sequence_chunks,
+    write_genome_size_report,
+)
+from yeat.workflow.qc.mash import get_genome_size
+
+
+@pytest.fixture(scope="module")
+def genome_reads(tmp_path_factory):
+    rng = Random(7)
+    genome = "".join(rng.choices("ACGT", k=200_000))
+    path = tmp_path_factory.mktemp("reads") / "reads.fastq.gz"
+    with gzip.open(path, "wt") as fh:
+        for i in range(20_000):
+            start = rng.randrange(len(genome) - 100)
+            read = list(genome[start : start + 100])
+            read[rng.randrange(100)] = rng.choice("ACGT")
+            print(f"@read{i}\n{''.join(read)}\n+\n{'I' * 100}", file=fh)
+    return path
+
+
+@pytest.mark.parametrize("k", [1, 5, 8, 21, 31])
+def test_pack_kmers(k):
+    rng = Random(k)
+    sequence = rng.choices(range(4), k=100)
+    codes = np.array(sequence, dtype=np.uint64)
+    forward = [int("".join(map(str, sequence[i : i + k])), 4) for i in range(100 - k + 1)]
+    reverse = [
+        int("".join(str(3 - code) for code in reversed(sequence[i : i + k])), 4)
+        for i in range(100 - k + 1)
+    ]
+    assert pack_kmers(codes, k).tolist() == forward
+    assert pack_kmers(3 - codes, k, reverse=True).tolist() == reverse
+
+
+@pytest.mark.parametrize("max_bases", [0, 500_000])
+def test_estimate_genome_size(genome_reads, max_bases):
+    estimate = GenomeSizeEstimate.from_fastq([genome_reads], max_bases)
+    assert estimate.genome_size == pytest.approx(200_000, rel=0.1)
+
+
+def test_read_sequence_chunks_prefix(genome_reads):
+    chunks = list(read_sequence_chunks([genome_reads], max_bases=1050))
+    assert [len(chunk) for chunk in chunks] == [11]
+
+
+def test_estimate_is_strand_independent():
+    sequence = b"ACGTTGCAAGGCTTACGATCGGATCGATTTACG"
+    complement = sequence.translate(bytes.maketrans(b"ACGT", b"TGCA"))[::-1]
+    forward, reverse = GenomeSizeEstimate(k=5, scale=1), GenomeSizeEstimate(k=5, scale=1)
+    forward.add([sequence])
+    reverse.add([complement])
+    assert sorted(forward.hashes[0].tolist()) == sorted(reverse.hashes[0].tolist())
+
+
+@pytest.mark.parametrize("coverage", [0.5, 2.0, 20.0])
+def test_kmer_coverage(coverage):
+    truncated_mean = coverage * poisson_sf(1, coverage) / poisson_sf(2, coverage)
+    assert kmer_coverage(truncated_mean, 2) == pytest.approx(coverage, abs=1e-4)
+
+
+def test_write_genome_size_report(tmp_path, genome_reads):
+    report = tmp_path / "report.tsv"
+    write_genome_size_report([genome_reads], report, 500_000)
+    assert get_genome_size(report) == pytest.approx(200_000, rel=0.1)
+    write_genome_size_report([genome_reads], report, skip=True)
+    assert get_genome_size(report) == 0
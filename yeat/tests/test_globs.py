@@ -0,0 +1,76 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import pytest
+from yeat.config.globs import match_names, resolve_globs
+from yeat.workflow import get_config_data
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    for sample in ("s1", "s2", "s10"):
+        for mate in (1, 2):
+            (run_dir / f"{sample}_R{mate}.fastq.gz").touch()
+    (run_dir / "s1_R1.fastq.gz.md5").touch()
+    return run_dir
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_resolve_globs(run_dir, threads):
+    patterns = [f"{run_dir}/s1_R?.fastq.gz", f"{run_dir}/s1*_R1.fastq.gz", f"{run_dir}/missing*"]
+    matches, num_directories = resolve_globs(patterns, threads)
+    assert matches[patterns[0]] == [f"{run_dir}/s1_R1.fastq.gz", f"{run_dir}/s1_R2.fastq.gz"]
+    assert matches[patterns[1]] == [f"{run_dir}/s10_R1.fastq.gz", f"{run_dir}/s1_R1.fastq.gz"]
+    assert matches[patterns[2]] == []
+    assert num_directories == 1
+
+
+def test_resolve_globs_literal_paths(run_dir, tmp_path, monkeypatch):
+    (tmp_path / "link.fastq.gz").symlink_to(run_dir / "s2_R1.fastq.gz")
+    monkeypatch.chdir(tmp_path)
+    patterns = ["run/s2_R2.fastq.gz", "link.fastq.gz", "run/absent.fastq.gz", "nodir/*.fastq.gz"]
+    matches, num_directories = resolve_globs(patterns)
+    assert matches["run/s2_R2.fastq.gz"] == [str(run_dir / "s2_R2.fastq.gz")]
+    assert matches["link.fastq.gz"] == [str(run_dir / "s2_R1.fastq.gz")]
+    assert matches["run/absent.fastq.gz"] == []
+    assert matches["nodir/*.fastq.gz"] == []
+    assert num_directories == 3
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        ("b*", ["b", "ba", "bb"]),
+        ("[ab]", ["a", "b"]),
+        ("?a", ["ba", "ca"]),
+        ("c", []),
+    ],
+)
+def test_match_names(pattern, expected):
+    assert match_names(["a", "b", "ba", "bb", "ca"], pattern) == expected
+
+
+def test_get_config_data_verbose(capsys, run_dir, tmp_path):
+    config = tmp_path / "config.toml"
+    config.write_text(
+        f'[samples.s1]\nillumina = "{run_dir}/s1_R?.fastq.gz"\n\n'
+        f'[samples.s2]\nillumina = ["{run_dir}/s2_R1.fastq.gz", "{run_dir}/s2_R2.fastq.gz"]\n\n'
+        '[assemblers.spades_default]\nalgorithm = "spades"\n'
+    )
+    data = get_config_data(config, threads=2, verbose=True)
+    assert data["samples"]["s1"]["illumina"] == [
+        f"{run_dir}/s1_R1.fastq.gz",
+        f"{run_dir}/s1_R2.fastq.gz",
+    ]
+    assert data["samples"]["s2"]["illumina"][1] == f"{run_dir}/s2_R2.fastq.gz"
+    out, err = capsys.readouterr()
+    assert "[yeat] loaded 2 samples" in err
+    assert "resolved 1 read paths in 1 directories" in err
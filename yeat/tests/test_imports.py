@@ -0,0 +1,70 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import json
+import pytest
+from statistics import median
+import subprocess
+import sys
+import time
+from yeat.tests import data_file
+from yeat.workflow import run_workflow
+
+# Modules imported by the Snakefiles, and so by every Snakemake job and `run:` block
+WORKFLOW_MODULES = [
+    "yeat.cli",
+    "yeat.config.config",
+    "yeat.stats",
+    "yeat.workflow",
+    "yeat.workflow.bandage",
+    "yeat.workflow.qc.aux",
+    "yeat.workflow.qc.compress",
+    "yeat.workflow.qc.downsample",
+    "yeat.workflow.qc.genome_size",
+]
+HEAVY_MODULES = ["numpy", "pandas", "scipy"]
+
+
+def imported_modules(module):
+    code = f"import json, sys, {module}; print(json.dumps(list(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+    return set(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize("module", WORKFLOW_MODULES)
+def test_no_heavy_imports(module):
+    assert imported_modules(module).isdisjoint(HEAVY_MODULES)
+
+
+def time_command(command, repeats=5):
+    timings = list()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return median(timings)
+
+
+@pytest.mark.bench
+def test_bench_rule_startup():
+    code = "from yeat.workflow.qc.downsample import Downsample, downsample_paired"
+    elapsed = time_command([sys.executable, "-c", code])
+    print(f"\nrule startup: {elapsed:.3f}s")
+
+
+@pytest.mark.bench
+def test_bench_snakefile_parse(capfd, tmp_path):
+    timings = list()
+    for _ in range(5):
+        start = time.perf_counter()
+        run_workflow(data_file("configs/paired.toml"), workdir=str(tmp_path), dry_run=True)
+        timings.append(time.perf_counter() - start)
+    capfd.readouterr()
+    with capfd.disabled():
+        print(f"\nSnakefile parse and dry run: {median(timings):.3f}s")
@@ -31,6 +31,16 @@ def test_paired_end_assemblers_dry_run(tmp_path):
     run_yeat(arglist)
 
 
+def test_fused_downsample_dry_run(capfd, tmp_path):
+    wd = str(tmp_path)
+    arglist = ["-w", wd, "-n", "-d", "0", "-g", "5000000", "--fused-downsample"]
+    arglist += [data_file("short_reads_1.fastq.gz"), data_file("short_reads_2.fastq.gz")]
+    run_yeat(arglist)
+    out, err = capfd.readouterr()
+    assert "rule qc_paired_downsample:" in out + err
+    assert "rule qc_paired_fastp:" not in out + err
+
+
 @pytest.mark.long
 def test_paired_end_assemblers(capsys, tmp_path):
     wd = str(tmp_path)
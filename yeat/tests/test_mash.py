@@ -0,0 +1,46 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import pytest
+from yeat.tests import data_file
+from yeat.workflow.qc.mash import (
+    MashReportError,
+    get_genome_size,
+    read_mash_report,
+    write_mash_report,
+)
+
+
+def test_read_mash_report():
+    rows = read_mash_report(data_file("report.tsv"))
+    assert len(rows) == 1
+    assert rows[0]["Hashes"] == "1000"
+    assert rows[0]["ID"] == "analysis/illumina_reads/qc/illumina/R1.fastq.gz"
+
+
+def test_get_genome_size():
+    assert get_genome_size(data_file("report.tsv")) == 6275000
+
+
+@pytest.mark.parametrize(
+    "contents", ["", "#Hashes\tLength\tID\tComment\n", "#Hashes\tID\n1000\tr1\n"]
+)
+def test_get_genome_size_bad_report(tmp_path, contents):
+    report = tmp_path / "report.tsv"
+    report.write_text(contents)
+    with pytest.raises(MashReportError, match=r"mash report"):
+        get_genome_size(report)
+
+
+def test_write_mash_report(tmp_path):
+    report = tmp_path / "report.tsv"
+    write_mash_report(report, 1000, 6275000, "reads.fastq.gz", "[50200 seqs]")
+    assert read_mash_report(report) == [
+        {"Hashes": "1000", "Length": "6275000", "ID": "reads.fastq.gz", "Comment": "[50200 seqs]"}
+    ]
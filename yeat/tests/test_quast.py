@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import pytest
+from yeat.workflow.quast import QuastReportError, read_quast_report, split_quast_report
+
+REPORT = """Assembly\tspades_default\tmegahit_default
+# contigs (>= 0 bp)\t120\t95
+Total length (>= 0 bp)\t4641652\t4598120
+N50\t112000\t98000
+"""
+
+
+@pytest.fixture
+def report(tmp_path):
+    report = tmp_path / "quast" / "report.tsv"
+    report.parent.mkdir()
+    report.write_text(REPORT)
+    (tmp_path / "quast" / "report.html").write_text("<html></html>")
+    return report
+
+
+def test_read_quast_report(report):
+    metrics = read_quast_report(report)
+    assert list(metrics) == ["spades_default", "megahit_default"]
+    assert metrics["megahit_default"][2] == ("N50", "98000")
+
+
+def test_read_quast_report_invalid(tmp_path):
+    report = tmp_path / "report.tsv"
+    report.write_text("not\ta\treport\n")
+    with pytest.raises(QuastReportError, match=r"not a QUAST report"):
+        read_quast_report(report)
+
+
+def test_split_quast_report(tmp_path, report):
+    outdir = tmp_path / "spades" / "spades_default" / "quast"
+    split_quast_report(report, report.parent / "report.html", "spades_default", outdir)
+    assert (outdir / "report.tsv").read_text().splitlines() == [
+        "Assembly\tspades_default",
+        "# contigs (>= 0 bp)\t120",
+        "Total length (>= 0 bp)\t4641652",
+        "N50\t112000",
+    ]
+    assert "N50                     112000" in (outdir / "report.txt").read_text()
+    assert (outdir / "report.html").is_symlink()
+    assert (outdir / "report.html").read_text() == "<html></html>"
+    split_quast_report(report, report.parent / "report.html", "spades_default", outdir)
+
+
+def test_split_quast_report_missing_assembly(tmp_path, report):
+    outdir = tmp_path / "flye" / "flye_default" / "quast"
+    message = r"assembly 'flye_default' not found in .*; found: spades_default, megahit_default"
+    with pytest.raises(QuastReportError, match=message):
+        split_quast_report(report, report.parent / "report.html", "flye_default", outdir)
+    assert not outdir.exists()
@@ -0,0 +1,49 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import pytest
+from yeat.config.read_sniffer import ReadInfo, sniff_fastq
+from yeat.tests import data_file, write_fastq
+
+ILLUMINA = "A00123:8:H7YVWDSXY:{lane}:1101:{{i}}:1000 {mate}:N:0:ACGTACGT"
+ONT = "0a1b2c3d-4e5f-6a7b-8c9d-0e1f2a3b4c5d{{i}} runid=abc read={{i}} ch=42 start_time=2024-01-01"
+
+
+@pytest.mark.parametrize(
+    "header,length,quality,expected",
+    [
+        (ILLUMINA.format(lane=3, mate=2), 150, "I", ReadInfo("illumina", 2, 3)),
+        ("HWUSI-EAS100R:6:73:941:{i}#0/1", 36, "I", ReadInfo("illumina", 1, 6)),
+        ("SRR000001.{i} length=150", 150, "I", ReadInfo("illumina")),
+        ("read{i}/2", 100, "I", ReadInfo("illumina", 2)),
+        (ONT.format(), 5000, "+", ReadInfo("ont_simplex")),
+        ("a1;b2 runid=abc ch=7", 5000, "+", ReadInfo("ont_duplex")),
+        ("m64011_190830_220126/{i}/ccs", 15000, "~", ReadInfo("pacbio_hifi")),
+        ("read{i}", 12000, "~", ReadInfo("pacbio_hifi")),
+        ("read{i}", 30000, "+", ReadInfo("ont_simplex")),
+    ],
+)
+def test_sniff_fastq(tmp_path, header, length, quality, expected):
+    fastq = write_fastq(tmp_path / "reads.fastq.gz", 20, length, header=header, quality=quality)
+    assert sniff_fastq(fastq) == expected
+
+
+def test_sniff_plain_fastq(tmp_path):
+    fastq = tmp_path / "reads.fq"
+    fastq.write_text("@read1/1\nACGT\n+\nIIII\n")
+    assert sniff_fastq(fastq) == ReadInfo("illumina", 1)
+
+
+def test_sniff_not_fastq(tmp_path):
+    (tmp_path / "empty.fastq.gz").touch()
+    (tmp_path / "corrupt.fastq.gz").write_bytes(b"\x1f\x8bnot really gzip")
+    assert sniff_fastq(tmp_path / "empty.fastq.gz") is None
+    assert sniff_fastq(tmp_path / "corrupt.fastq.gz") is None
+    assert sniff_fastq(tmp_path / "missing.fastq.gz") is None
+    assert sniff_fastq(data_file("configs/paired.toml")) is None
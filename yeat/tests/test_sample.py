@@ -49,7 +49,7 @@ def test_check_read_paths_unable_to_find():
         Sample._check_read_paths(label, data)
 
 
-def test_check_read_paths_found_too_many(tmp_path):
+def test_check_read_paths_unable_to_pair(tmp_path):
     wd = tmp_path
     read1 = data_file("short_reads_1.fastq.gz")
     read2 = data_file("short_reads_2.fastq.gz")
@@ -57,12 +57,59 @@ def test_check_read_paths_found_too_many(tmp_path):
     copy(read2, wd / "short_reads_2.fastq.gz")
     (wd / "short_reads_3.fastq.gz").touch()
     label = "sample1"
-    data = {"illumina": str(wd / "short_reads_*.fastq.gz")}
-    message = f"Found too many FASTQ files for sample '{label}' at path:"
+    data = {"illumina": sorted(wd.glob("short_reads_*.fastq.gz"))}
+    message = f"Unable to pair Illumina FASTQ files for sample '{label}' by their R1/R2 file names"
     with pytest.raises(SampleConfigurationError, match=message):
         Sample._check_read_paths(label, data)
 
 
+@pytest.mark.parametrize(
+    "read_type,reads,expected",
+    [
+        ("illumina", ["a.fq"], [["a.fq"]]),
+        ("illumina", ["a.fq", "b.fq"], [["a.fq"], ["b.fq"]]),
+        ("illumina", ["s_L001_1.fq", "s_L001_2.fq"], [["s_L001_1.fq"], ["s_L001_2.fq"]]),
+        (
+            "illumina",
+            ["s1_L001_001.fastq.gz", "s1_L002_001.fastq.gz"],
+            [["s1_L001_001.fastq.gz", "s1_L002_001.fastq.gz"]],
+        ),
+        (
+            "illumina",
+            ["s_L001_R1_001.fq", "s_L001_R2_001.fq", "s_L002_R1_001.fq", "s_L002_R2_001.fq"],
+            [["s_L001_R1_001.fq", "s_L002_R1_001.fq"], ["s_L001_R2_001.fq", "s_L002_R2_001.fq"]],
+        ),
+        (
+            "illumina",
+            ["run2_1.fq", "run1_2.fq", "run1_1.fq", "run2_2.fq"],
+            [["run1_1.fq", "run2_1.fq"], ["run1_2.fq", "run2_2.fq"]],
+        ),
+        (
+            "illumina",
+            ["s_L1_R1.fq", "s_L2_R1.fq", "s_L3_R1.fq"],
+            [["s_L1_R1.fq", "s_L2_R1.fq", "s_L3_R1.fq"]],
+        ),
+        ("illumina", ["l1.fq", "l2.fq", "l3.fq"], [["l1.fq", "l2.fq", "l3.fq"]]),
+        ("ont_simplex", ["a_1.fq", "a_2.fq", "b.fq"], [["a_1.fq", "a_2.fq", "b.fq"]]),
+    ],
+)
+def test_read_groups(read_type, reads, expected):
+    sample = Sample(label="sample1", data={read_type: reads})
+    assert [[str(read) for read in mate] for mate in sample.read_groups(read_type)] == expected
+
+
+@pytest.mark.parametrize(
+    "reads",
+    [
+        ["s_L001_R1.fq", "s_L002_R1.fq", "s_L001_R2.fq", "s_L003_R2.fq"],
+        ["s_L1_R1.fq", "s_L2_R2.fq"],
+    ],
+)
+def test_read_groups_mismatched_lanes(reads):
+    with pytest.raises(SampleConfigurationError, match="Unable to pair"):
+        Sample._check_read_paths("sample1", {"illumina": reads})
+
+
 @pytest.mark.parametrize(
     "data,read_type",
     [
@@ -84,3 +131,37 @@ def test_check_read_paths_found_too_many(tmp_path):
 def test_best_long_read_type(data, read_type):
     sample = Sample(label="sample1", data=data)
     assert sample.best_long_read_type == read_type
+
+
+@pytest.mark.parametrize(
+    "settings,needs_genome_size",
+    [
+        ({}, False),
+        ({"target_num_reads": 0}, True),
+        ({"target_num_reads": 0, "genome_size": 5000000}, False),
+        ({"target_num_reads": 1000}, False),
+    ],
+)
+def test_needs_genome_size(settings, needs_genome_size):
+    sample = Sample(label="sample1", data={"illumina": ["READ.fastq.gz"], **settings})
+    assert sample.needs_genome_size == needs_genome_size
+
+
+@pytest.mark.parametrize(
+    "settings,fused",
+    [
+        ({"fused_downsample": True}, False),
+        ({"fused_downsample": True, "target_num_reads": 0}, False),
+        ({"fused_downsample": True, "target_num_reads": 0, "skip_filter": False}, True),
+        ({"target_num_reads": 0, "skip_filter": False}, False),
+    ],
+)
+def test_fused_downsample(settings, fused):
+    sample = Sample(label="sample1", data={"illumina": ["READ.fastq.gz"], **settings})
+    assert sample.fused_downsample == fused
+
+
+def test_bandage_limits():
+    sample = Sample(label="sample1", data={"illumina": ["READ.fastq.gz"], "bandage_max_nodes": 0})
+    assert sample.bandage_max_nodes == 0
+    assert sample.bandage_max_edges == 100_000
@@ -0,0 +1,143 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from pathlib import Path
+import pytest
+import time
+import toml
+from yeat.config.config import AssemblyConfiguration, ConfigurationError
+from yeat.config.global_settings import GlobalSettings
+from yeat.config.sample_sheet import SampleSheetError, read_sample_sheet
+from yeat.tests import data_file
+from yeat.workflow import get_config_data
+
+
+@pytest.fixture
+def reads(tmp_path):
+    reads = tmp_path / "reads"
+    reads.mkdir()
+    for sample in ("s1", "s2"):
+        for mate in (1, 2):
+            (reads / f"{sample}_R{mate}.fastq.gz").touch()
+        (reads / f"{sample}_ont.fastq.gz").touch()
+    return reads
+
+
+def write_sheet(path, rows, delimiter="\t"):
+    path.write_text("\n".join(delimiter.join(row) for row in rows) + "\n")
+    return path
+
+
+def test_read_tsv(tmp_path, reads):
+    rows = [
+        ["sample", "illumina", "ont_simplex", "min_length", "skip_filter"],
+        ["s1", "reads/s1_R?.fastq.gz", "reads/s1_ont.fastq.gz", "", "no"],
+        ["s2", "reads/s2_R1.fastq.gz;reads/s2_R2.fastq.gz", "", "500", ""],
+    ]
+    sheet = write_sheet(tmp_path / "samples.tsv", rows)
+    samples = read_sample_sheet(sheet, GlobalSettings())
+    assert list(samples) == ["s1", "s2"]
+    assert samples["s1"].data["illumina"] == [reads / "s1_R1.fastq.gz", reads / "s1_R2.fastq.gz"]
+    assert samples["s1"].data["ont_simplex"] == [reads / "s1_ont.fastq.gz"]
+    assert samples["s1"].skip_filter is False
+    assert samples["s1"].min_length == 100
+    assert samples["s1"].best_long_read_type == "ont_simplex"
+    assert samples["s2"].data["illumina"] == [reads / "s2_R1.fastq.gz", reads / "s2_R2.fastq.gz"]
+    assert samples["s2"].min_length == 500
+    assert samples["s2"].skip_filter is True
+    assert samples["s2"].best_long_read_type is None
+
+
+def test_read_csv(tmp_path, reads):
+    rows = [["sample", "ont_simplex"], ["s1", "reads/s1_ont.fastq.gz"], ["", ""]]
+    sheet = write_sheet(tmp_path / "samples.csv", rows, delimiter=",")
+    samples = read_sample_sheet(sheet, GlobalSettings(quality=20))
+    assert samples["s1"].data["ont_simplex"] == [reads / "s1_ont.fastq.gz"]
+    assert samples["s1"].quality == 20
+
+
+def test_errors_reported_together(tmp_path, reads):
+    rows = [
+        ["sample", "illumina", "quality", "skip_filter"],
+        ["s1", "reads/s1_R?.fastq.gz", "lots", ""],
+        ["s1", "reads/s2_R?.fastq.gz", "", ""],
+        ["", "reads/s2_R?.fastq.gz", "", ""],
+        ["s3", "", "", "maybe"],
+        ["s4", "reads/missing.fastq.gz", "", ""],
+        ["s5", "reads/*.fastq.gz", "", ""],
+        ["s6", "reads/s1_R1.fastq.gz"],
+    ]
+    sheet = write_sheet(tmp_path / "samples.tsv", rows)
+    with pytest.raises(SampleSheetError) as error:
+        read_sample_sheet(sheet, GlobalSettings())
+    message = str(error.value)
+    assert "8 problem(s)" in message
+    assert "line 2: invalid quality 'lots' for sample 's1'; expected int" in message
+    assert "line 3: sample 's1' already defined on line 2" in message
+    assert "line 4: missing sample name" in message
+    assert "line 5: invalid skip_filter 'maybe' for sample 's3'; expected bool" in message
+    assert "line 5: sample 's3' has no reads" in message
+    assert "line 6: unable to find FASTQ files for sample 's4'" in message
+    assert "line 7: Unable to pair Illumina FASTQ files for sample 's5'" in message
+    assert "line 8: expected 4 columns, found 2" in message
+
+
+@pytest.mark.parametrize(
+    "header,message",
+    [
+        ([], "empty sample sheet"),
+        (["label", "illumina"], "first column of sample sheet"),
+        (["sample", "illumina", "colour"], r"unknown column\(s\) in sample sheet"),
+        (["sample", "illumina", "illumina"], r"duplicate column\(s\) in sample sheet"),
+        (["sample", "quality"], "has no read type columns"),
+    ],
+)
+def test_invalid_header(tmp_path, header, message):
+    sheet = tmp_path / "samples.tsv"
+    sheet.write_text("\t".join(header))
+    with pytest.raises(SampleSheetError, match=message):
+        read_sample_sheet(sheet, GlobalSettings())
+
+
+def test_config_with_sample_sheet(tmp_path, reads):
+    rows = [["sample", "illumina"], ["s1", "reads/s1_R?.fastq.gz"]]
+    write_sheet(tmp_path / "samples.tsv", rows)
+    data = {
+        "sample_sheet": "samples.tsv",
+        "samples": {"s2": {"ont_simplex": str(reads / "s2_ont.fastq.gz")}},
+        "assemblers": {"spades_default": {"algorithm": "spades"}},
+    }
+    with open(tmp_path / "config.toml", "w") as fh:
+        toml.dump(data, fh)
+    data = get_config_data(tmp_path / "config.toml")
+    assert data["sample_sheet"] == str(tmp_path / "samples.tsv")
+    config = AssemblyConfiguration.parse_snakemake_config(data)
+    assert sorted(config.samples) == ["s1", "s2"]
+    assert config.samples["s1"].data["illumina"] == [
+        reads / "s1_R1.fastq.gz",
+        reads / "s1_R2.fastq.gz",
+    ]
+    assert config.targets
+    data["samples"] = {"s1": {"ont_simplex": [str(reads / "s1_ont.fastq.gz")]}}
+    with pytest.raises(ConfigurationError, match=r"defined in both .* \['s1'\]"):
+        AssemblyConfiguration.parse_snakemake_config(data)
+
+
+@pytest.mark.bench
+def test_bench_sample_sheet(tmp_path):
+    reads = Path(data_file("short_reads_1.fastq.gz")).parent
+    rows = [["sample", "illumina", "quality"]]
+    rows.extend([f"s{i}", f"{reads}/short_reads_?.fastq.gz", "20"] for i in range(10_000))
+    sheet = write_sheet(tmp_path / "samples.tsv", rows)
+    data = {"sample_sheet": str(sheet), "assemblers": {"spades_default": {"algorithm": "spades"}}}
+    start = time.perf_counter()
+    config = AssemblyConfiguration.parse_snakemake_config(data)
+    elapsed = time.perf_counter() - start
+    assert len(config.samples) == 10_000
+    print(f"\nparse (10000-sample sheet): {elapsed:.3f}s")
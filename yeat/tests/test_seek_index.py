@@ -0,0 +1,112 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import gzip
+import os
+import pytest
+from yeat.tests import write_fastq
+from yeat.workflow.qc import seek_index
+from yeat.workflow.qc.compress import BgzfWriter
+from yeat.workflow.qc.fastq import open_fastq, read_fastq
+from yeat.workflow.qc.seek_index import FastqIndex, FastqIndexError, LineReader
+
+
+def write_indexable(path, kind, num_reads=3000):
+    source = write_fastq(path.with_suffix(".src.gz"), num_reads, length=150)
+    data = gzip.decompress(source.read_bytes())
+    if kind == "bgzf":
+        with BgzfWriter(path) as writer:
+            writer.write(data)
+    elif kind == "members":
+        size = 100_003
+        members = [gzip.compress(data[i : i + size]) for i in range(0, len(data), size)]
+        path.write_bytes(b"".join(members))
+    else:
+        path.write_bytes(data)
+    with open_fastq(source) as fh:
+        return list(read_fastq(fh))
+
+
+@pytest.mark.parametrize("kind,num_chunks", [("bgzf", 15), ("members", 10), ("plain", 1)])
+@pytest.mark.parametrize("threads", [1, 4])
+def test_read_range(tmp_path, monkeypatch, kind, num_chunks, threads):
+    monkeypatch.setattr(seek_index, "BGZF_BLOCKS_PER_TASK", 2)
+    monkeypatch.setattr(seek_index, "PLAIN_CHUNK_SIZE", 65536)
+    path = tmp_path / "read.fastq.gz"
+    records = write_indexable(path, kind)
+    index = FastqIndex.build(path, threads)
+    assert index.num_records == 3000
+    assert index.num_chunks >= num_chunks
+    bounds = index.chunk_bounds()
+    assert bounds[0] == 0 and bounds[-1] == 3000 and bounds == sorted(bounds)
+    for start, stop in [(0, 1), (0, 3000), (1, 2), (257, 1031), (2999, 3000), (5, 5)]:
+        assert index.read_range(path, start, stop) == records[start:stop]
+    for chunk in range(index.num_chunks):
+        start, stop = bounds[chunk], bounds[chunk + 1]
+        assert index.read_range(path, start, stop) == records[start:stop]
+
+
+def test_single_member_gzip(tmp_path):
+    path = write_fastq(tmp_path / "read.fastq.gz", 100)
+    index = FastqIndex.build(path)
+    assert index.num_chunks == 1
+    assert index.num_records == 100
+
+
+def test_index_cache(tmp_path):
+    path = tmp_path / "read.fastq.gz"
+    write_indexable(path, "bgzf", 500)
+    index_path = tmp_path / "read.fqidx"
+    index = FastqIndex.load(path, index_path)
+    assert index_path.exists()
+    cached = FastqIndex.load(path, index_path)
+    assert (cached.offsets, cached.newlines) == (index.offsets, index.newlines)
+    write_indexable(path, "bgzf", 700)
+    os.utime(path, ns=(0, 0))
+    assert FastqIndex.load(path, index_path).num_records == 700
+    for contents in (b"corrupt", b""):
+        index_path.write_bytes(contents)
+        assert FastqIndex.load(path, index_path).num_records == 700
+        assert FastqIndex.read(index_path).num_records == 700
+
+
+@pytest.mark.parametrize("kind,indexed", [("bgzf", True), ("members", False), ("plain", True)])
+def test_load(tmp_path, kind, indexed):
+    path = tmp_path / "read.fastq.gz"
+    write_indexable(path, kind, 500)
+    index_path = tmp_path / "read.fqidx"
+    index_path.touch()
+    index = FastqIndex.load(path, index_path)
+    assert (index is not None) is indexed
+    assert (FastqIndex.read(index_path) is not None) is indexed
+
+
+@pytest.mark.parametrize("kind", ["bgzf", "members", "plain"])
+def test_line_reader(tmp_path, monkeypatch, kind):
+    monkeypatch.setattr(seek_index, "PLAIN_CHUNK_SIZE", 65536)
+    path = tmp_path / "read.fastq.gz"
+    records = write_indexable(path, kind)
+    with LineReader(path) as fh:
+        assert list(read_fastq(fh)) == records
+
+
+def test_line_reader_truncated(tmp_path):
+    path = write_fastq(tmp_path / "read.fastq.gz", 100)
+    path.write_bytes(path.read_bytes()[:-100])
+    with pytest.raises(FastqIndexError, match="truncated gzip member at offset 0"):
+        with LineReader(path) as fh:
+            list(fh)
+
+
+def test_invalid_bgzf_block(tmp_path):
+    path = tmp_path / "read.fastq.gz"
+    write_indexable(path, "bgzf", 500)
+    path.write_bytes(path.read_bytes() + b"garbage")
+    with pytest.raises(FastqIndexError, match="invalid BGZF block at offset"):
+        FastqIndex.build(path)
@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import json
+import os
+import pytest
+from random import Random
+from shutil import which
+import subprocess
+import time
+from yeat.stats import (
+    FastaFormatError,
+    assembly_stats,
+    read_fasta_composition,
+    write_assembly_stats,
+)
+from yeat.workflow.quast import read_quast_report
+
+FASTA = ">contig1 length=12\nACGTACGTGG\nCC\n>contig2\nAAAANNNNAA\n>contig3\n\n>contig4\nggcc\n"
+
+
+def test_read_fasta_composition(tmp_path):
+    fasta = tmp_path / "contigs.fasta"
+    fasta.write_text(FASTA)
+    lengths, gc_counts, n_counts = read_fasta_composition(fasta)
+    assert lengths.tolist() == [12, 10, 0, 4]
+    assert gc_counts.tolist() == [8, 0, 0, 4]
+    assert n_counts.tolist() == [0, 4, 0, 0]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 13, 1000])
+def test_read_fasta_composition_chunks(tmp_path, chunk_size):
+    fasta = tmp_path / "contigs.fasta"
+    fasta.write_text(FASTA.rstrip("\n"))
+    counts = read_fasta_composition(fasta, chunk_size=chunk_size)
+    assert [values.tolist() for values in counts] == [[12, 10, 0, 4], [8, 0, 0, 4], [0, 4, 0, 0]]
+
+
+@pytest.mark.parametrize("contents,num_contigs", [("", 0), (">contig1\n", 1)])
+def test_read_fasta_composition_empty(tmp_path, contents, num_contigs):
+    fasta = tmp_path / "contigs.fasta"
+    fasta.write_text(contents)
+    stats = assembly_stats(*read_fasta_composition(fasta))
+    assert stats["# contigs (>= 0 bp)"] == num_contigs
+    assert stats["Total length"] == 0
+    assert stats["N50"] == 0
+
+
+def test_read_fasta_composition_no_header(tmp_path):
+    fasta = tmp_path / "contigs.fasta"
+    fasta.write_text("ACGT\n>contig1\nACGT\n")
+    with pytest.raises(FastaFormatError, match=r"sequence found before the first FASTA header"):
+        read_fasta_composition(fasta)
+
+
+def test_assembly_stats(tmp_path):
+    fasta = tmp_path / "contigs.fasta"
+    fasta.write_text(FASTA)
+    stats = assembly_stats(*read_fasta_composition(fasta), min_contig=5)
+    assert stats == {
+        "# contigs (>= 0 bp)": 4,
+        "Total length (>= 0 bp)": 26,
+        "# contigs": 2,
+        "Largest contig": 12,
+        "Total length": 22,
+        "GC (%)": 44.44,
+        "N50": 12,
+        "L50": 1,
+        "N90": 10,
+        "L90": 2,
+        "# N's per 100 kbp": 18181.82,
+    }
+
+
+def test_write_assembly_stats(tmp_path):
+    fasta = tmp_path / "contigs.fasta"
+    fasta.write_text(FASTA)
+    tsv, json_file = tmp_path / "report.tsv", tmp_path / "report.json"
+    stats = write_assembly_stats(fasta, "spades_default", tsv, json_file, min_contig=5)
+    assert read_quast_report(tsv)["spades_default"][5] == ("GC (%)", "44.44")
+    with open(json_file) as fh:
+        assert json.load(fh) == {"assembly": "spades_default", **stats}
+
+
+def write_metagenome(path, num_contigs, seed=0):
+    rng = Random(seed)
+    with open(path, "w") as fh:
+        for i in range(num_contigs):
+            length = min(int(rng.paretovariate(1.2) * 300), 2_000_000)
+            sequence = "".join(rng.choices("ACGT", k=length))
+            lines = "\n".join(sequence[j : j + 80] for j in range(0, length, 80))
+            print(f">contig_{i}\n{lines}", file=fh)
+    return path
+
+
+@pytest.mark.bench
+def test_bench_stats_vs_quast(tmp_path):
+    num_contigs = int(os.environ.get("YEAT_BENCH_CONTIGS", 50000))
+    fasta = write_metagenome(tmp_path / "contigs.fasta", num_contigs)
+    size_mb = fasta.stat().st_size / 1024**2
+    start = time.perf_counter()
+    stats = write_assembly_stats(fasta, "bench", tmp_path / "report.tsv", tmp_path / "report.json")
+    elapsed = time.perf_counter() - start
+    print(f"\nyeat.stats: {size_mb:.0f} MB, {num_contigs} contigs in {elapsed:.2f}s")
+    if not which("quast.py"):
+        pytest.skip("quast.py not installed")
+    command = ["quast.py", str(fasta), "-l", "bench", "-o", str(tmp_path / "quast")]
+    start = time.perf_counter()
+    subprocess.run(command, capture_output=True, check=True)
+    print(f"quast.py: {time.perf_counter() - start:.2f}s")
+    quast = dict(read_quast_report(tmp_path / "quast" / "report.tsv")["bench"])
+    for metric in ("# contigs", "Largest contig", "Total length", "N50", "L50"):
+        assert int(quast[metric]) == stats[metric]
@@ -7,8 +7,9 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+import json
 import pytest
-from yeat.tests import data_file, run_yeat, get_core_count, final_contig_files_exist
+from yeat.tests import data_file, run_yeat, get_core_count, final_contig_files_exist, write_fastq
 
 
 @pytest.mark.parametrize(
@@ -28,6 +29,57 @@ def test_assemblers_dry_run(tmp_path, config):
     run_yeat(arglist)
 
 
+def test_mem_gb_dry_run(tmp_path):
+    wd = str(tmp_path)
+    arglist = ["-w", wd, "-n", "--mem-gb", "4", data_file("configs/paired.toml")]
+    run_yeat(arglist)
+    with open(tmp_path / "snakemake.cfg") as fh:
+        assert json.load(fh)["max_mem_mb"] == 4096
+
+
+@pytest.mark.parametrize(
+    "config", [data_file("configs/paired.toml"), data_file("configs/ont.toml")]
+)
+def test_temp_intermediates_dry_run(tmp_path, config):
+    wd = str(tmp_path)
+    arglist = ["-w", wd, "-n", "--temp-intermediates", "--compression-level", "1", config]
+    run_yeat(arglist)
+    with open(tmp_path / "snakemake.cfg") as fh:
+        data = json.load(fh)
+    assert data["temp_intermediates"] is True
+    assert data["compression_level"] == 1
+
+
+@pytest.mark.parametrize(
+    "config", [data_file("configs/hybrid.toml"), data_file("configs/single.toml")]
+)
+def test_pipelined_dry_run(tmp_path, config, capfd):
+    run_yeat(["-w", str(tmp_path), "-n", "--pipelined", config])
+    with open(tmp_path / "snakemake.cfg") as fh:
+        assert json.load(fh)["pipelined"] is True
+    out, err = capfd.readouterr()
+    assert "Group job sample_" in out + err
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        data_file("configs/paired.toml"),
+        data_file("configs/single.toml"),
+        data_file("configs/ont.toml"),
+    ],
+)
+def test_checksum_dry_run(tmp_path, config, capfd):
+    arglist = ["-w", str(tmp_path), "-n", "--copy_input", "--checksum", "sha256", config]
+    run_yeat(arglist)
+    out, err = capfd.readouterr()
+    assert ".fastq.gz.sha256" in out + err
+    with open(tmp_path / "snakemake.cfg") as fh:
+        data = json.load(fh)
+    assert data["copy_input"] is True
+    assert data["checksum"] == "sha256"
+
+
 @pytest.mark.long
 @pytest.mark.parametrize(
     "config",
@@ -78,3 +130,70 @@ def test_metagenomics_assemblers(capsys, tmp_path):
     arglist = ["-w", wd, "-t", cores, config]
     run_yeat(arglist)
     final_contig_files_exist(wd, config)
+
+
+def test_long_read_auto_downsample_dry_run(capfd, tmp_path):
+    config = tmp_path / "config.toml"
+    reads = data_file("ecolk12mg1655_R10_3_guppy_345_HAC.fastq.gz")
+    config.write_text(
+        f'[samples.sample1]\nont_simplex = "{reads}"\ntarget_num_reads = 0\nprefer_longest = true\n\n'
+        '[assemblers.flye_default]\nalgorithm = "flye"\n'
+    )
+    run_yeat(["-w", str(tmp_path), "-n", str(config)])
+    out, err = capfd.readouterr()
+    assert "rule qc_long_genome_size:" in out + err
+    assert "rule qc_long_downsample:" in out + err
+
+
+def test_project_quast_dry_run(capfd, tmp_path):
+    arglist = ["-w", str(tmp_path), "-n", "--project-quast", data_file("configs/paired.toml")]
+    run_yeat(arglist)
+    out, err = capfd.readouterr()
+    assert (out + err).count("rule quast_sample:") == 1
+    assert (out + err).count("rule quast_project:") == 1
+    assert (out + err).count("rule quast:") == 4
+
+
+def test_stats_report_dry_run(capfd, tmp_path):
+    config = tmp_path / "config.toml"
+    reads = data_file("short_reads_?.fastq.gz")
+    config.write_text(
+        f'[samples.sample1]\nillumina = "{reads}"\n\n'
+        '[assemblers.spades_default]\nalgorithm = "spades"\nreport = "stats"\n'
+    )
+    run_yeat(["-w", str(tmp_path), "-n", str(config)])
+    out, err = capfd.readouterr()
+    assert "rule stats:" in out + err
+    assert "rule quast_sample:" not in out + err
+
+
+def test_megahit_graphs_dry_run(capfd, tmp_path):
+    config = tmp_path / "config.toml"
+    reads = data_file("short_reads_?.fastq.gz")
+    config.write_text(
+        f'[samples.sample1]\nillumina = "{reads}"\n\n'
+        '[assemblers.megahit_default]\nalgorithm = "megahit"\n'
+    )
+    run_yeat(["-w", str(tmp_path), "-n", str(config)])
+    out, err = capfd.readouterr()
+    assert "checkpoint graph_manifest:" in out + err
+    assert "rule bandage:" in out + err
+
+
+def test_multi_lane_dry_run(capfd, tmp_path):
+    reads = tmp_path / "reads"
+    reads.mkdir()
+    for lane in (1, 2):
+        for mate in (1, 2):
+            write_fastq(reads / f"s1_L00{lane}_R{mate}_001.fastq.gz", 5, mate=mate)
+        write_fastq(reads / f"s1_ont_{lane}.fastq.gz", 5, 2000)
+    config = tmp_path / "config.toml"
+    config.write_text(
+        f'[samples.s1]\nillumina = "{reads}/s1_L00?_R?_001.fastq.gz"\n'
+        f'ont_simplex = "{reads}/s1_ont_*.fastq.gz"\n\n'
+        '[assemblers.unicycler_default]\nalgorithm = "unicycler"\n'
+    )
+    run_yeat(["-w", str(tmp_path / "wd"), "-n", str(config)])
+    out, err = capfd.readouterr()
+    assert "rule qc_paired_copy_input:" in out + err
+    assert "rule qc_long_copy_input:" in out + err
@@ -9,14 +9,18 @@
 
 import pytest
 import re
+import time
+import toml
 from yeat.cli.yeat_auto import get_parser, main
-from yeat.config.auto_pop import AutoPopError
-from yeat.tests import data_file
+from yeat.config.aho_corasick import AhoCorasick
+from yeat.config.auto_pop import AutoPop, AutoPopError
+from yeat.tests import data_file, write_fastq
 
 
 SHORT_READS = [data_file("short_reads_1.fastq.gz"), data_file("short_reads_2.fastq.gz")]
 ANIMAL_READS = [data_file("Animal_289_R1.fq.gz"), data_file("Animal_289_R2.fq.gz")]
 ALL_READS = SHORT_READS + ANIMAL_READS
+ILLUMINA = "A00123:8:H7YVWDSXY:{lane}:1101:{{i}}:1000 {mate}:N:0:ACGTACGT"
 
 
 def run_yeat_auto(arglist):
@@ -57,7 +61,7 @@ def test_bad_input_seq_path():
 def test_sequence_with_no_files():
     sample_name = "SAMPLE_NAME_WITHOUT_READS"
     arglist = [sample_name, "--seq-path", data_file("")]
-    message = f"sample {sample_name}: expected 2 FASTQ files for paired-end data, found 0"
+    message = f"sample {sample_name}: no FASTQ files found"
     with pytest.raises(AutoPopError, match=message):
         run_yeat_auto(arglist)
 
@@ -111,3 +115,186 @@ def test_sample_name_within_sample():
     message = "cannot correctly process a sample name that is a substring of another sample name: short vs. short_reads"
     with pytest.raises(AutoPopError, match=message):
         run_yeat_auto(arglist)
+
+
+def test_duplicate_sample_name():
+    arglist = ["short_reads", "short_reads", "--seq-path", data_file("")]
+    message = "substring of another sample name: short_reads vs. short_reads"
+    with pytest.raises(AutoPopError, match=message):
+        run_yeat_auto(arglist)
+
+
+def test_aho_corasick_matches():
+    index = AhoCorasick(["he", "she", "his", "hers", "s1", "s10"])
+    assert index.matches("ushers") == {"he", "she", "hers"}
+    assert index.matches("runs/s10_R1.fq.gz") == {"s1", "s10"}
+    assert index.matches("ahishers") == {"his", "she", "he", "hers"}
+    assert index.matches("nothing") == set()
+
+
+def write_run_dir(run_dir, num_samples):
+    for i in range(num_samples):
+        lane_dir = run_dir / f"lane{i % 4}"
+        lane_dir.mkdir(parents=True, exist_ok=True)
+        for mate in (1, 2):
+            fastq = lane_dir / f"Sample-{i:05d}_S{i}_L00{i % 4}_R{mate}_001.fastq.gz"
+            write_fastq(fastq, 2, 50, header=ILLUMINA.format(lane=i % 4, mate=mate))
+    return [f"Sample-{i:05d}_" for i in range(num_samples)]
+
+
+def test_auto_pop_run_dir(tmp_path):
+    samples = write_run_dir(tmp_path, 20)
+    autopop = AutoPop(samples, tmp_path, None)
+    assert len(autopop.files_to_samples) == 20
+    expected = f"{tmp_path}/lane3/Sample-00007_S7_L003_R*_001.fastq.gz"
+    assert autopop.files_to_samples["Sample-00007_"] == {"illumina": expected}
+
+
+def write_deep_run_dir(run_dir, depth):
+    nested = run_dir
+    for _ in range(depth):
+        nested = nested / "d"
+        nested.mkdir()
+    for mate in (1, 2):
+        (run_dir / f"outer_R{mate}.fastq.gz").touch()
+        (nested / f"inner_R{mate}.fastq.gz").touch()
+        (nested / f"inner_R{mate}.fastq.gz.md5").touch()
+    (run_dir / "d" / "loop").symlink_to(run_dir)
+    return nested
+
+
+def remove_deep_run_dir(run_dir, nested):
+    # shutil.rmtree, used by pytest to clean up, recurses once per directory level
+    (run_dir / "d" / "loop").unlink()
+    while nested != run_dir:
+        for path in nested.iterdir():
+            path.unlink()
+        nested.rmdir()
+        nested = nested.parent
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_deep_seq_path(tmp_path, threads, capsys):
+    nested = write_deep_run_dir(tmp_path, 1200)
+    arglist = ["inner", "outer", "--seq-path", str(tmp_path), "--threads", str(threads)]
+    try:
+        run_yeat_auto(arglist + ["--verbose"])
+    finally:
+        remove_deep_run_dir(tmp_path, nested)
+    out, err = capsys.readouterr()
+    assert f"{nested}/inner_R*.fastq.gz" in out
+    assert "[yeat-auto] scanned 6 files in 1201 directories in " in err
+    assert "files/s); 4 FASTQ files selected" in err
+
+
+@pytest.mark.parametrize(
+    "options,num_files",
+    [
+        ([], 4),
+        (["--max-depth", "2"], 2),
+        (["--exclude", "d"], 2),
+        (["--include", "*_R1.*"], 2),
+        (["--include", "inner*", "--exclude", "*.md5"], 2),
+    ],
+)
+def test_seq_path_filters(tmp_path, options, num_files):
+    write_deep_run_dir(tmp_path, 5)
+    args = get_parser().parse_args(["inner", "--seq-path", str(tmp_path)] + options)
+    include, exclude, max_depth = args.include, args.exclude, args.max_depth
+    autopop = AutoPop([], args.seq_path, None, 1, include, exclude, max_depth)
+    assert len(autopop.files) == num_files
+
+
+@pytest.mark.bench
+def test_bench_scan_seq_path(tmp_path):
+    for lane in range(8):
+        for tile in range(250):
+            tile_dir = tmp_path / f"lane{lane}" / "fastq" / f"tile{tile}"
+            tile_dir.mkdir(parents=True)
+            for mate in (1, 2):
+                (tile_dir / f"L{lane}_T{tile}_R{mate}.fastq.gz").touch()
+            (tile_dir / "stats.json").touch()
+    for threads in (1, 4):
+        start = time.perf_counter()
+        files = AutoPop([], tmp_path, None, threads=threads).files
+        elapsed = time.perf_counter() - start
+        assert len(files) == 4000
+        print(f"\nscan 2017 directories, 6000 files ({threads} threads): {elapsed:.3f}s")
+
+
+def test_mixed_run_dir(tmp_path, capsys):
+    for lane in (1, 2):
+        for mate in (1, 2):
+            header = ILLUMINA.format(lane=lane, mate=mate)
+            write_fastq(tmp_path / f"pe_S1_L00{lane}_R{mate}_001.fastq.gz", 5, header=header)
+    write_fastq(tmp_path / "se.fastq.gz", 5, header=ILLUMINA.format(lane=1, mate=1))
+    write_fastq(tmp_path / "hybrid_R1.fq.gz", 5, mate=1)
+    write_fastq(tmp_path / "hybrid_R2.fq.gz", 5, mate=2)
+    write_fastq(tmp_path / "hybrid_ont.fq.gz", 5, 5000, header="r{i} runid=1 ch=2", quality="+")
+    write_fastq(tmp_path / "hifi.fastq.gz", 5, 15000, header="m64011_1/{i}/ccs", quality="~")
+    run_yeat_auto(["pe", "se", "hybrid", "hifi", "--seq-path", str(tmp_path), "-t", "2"])
+    out, err = capsys.readouterr()
+    data = toml.loads(out)
+    assert data["samples"] == {
+        "hifi": {"pacbio_hifi": f"{tmp_path}/hifi.fastq.gz"},
+        "hybrid": {
+            "illumina": f"{tmp_path}/hybrid_R*.fq.gz",
+            "ont_simplex": f"{tmp_path}/hybrid_ont.fq.gz",
+        },
+        "pe": {"illumina": f"{tmp_path}/pe_S1_L00*_001.fastq.gz"},
+        "se": {"illumina": f"{tmp_path}/se.fastq.gz"},
+    }
+    assert data["assemblers"] == {
+        "spades_default": {"algorithm": "spades"},
+        "flye_default": {"algorithm": "flye"},
+    }
+
+
+def test_fastq_list_instead_of_glob(tmp_path):
+    for name in ("a_s1.fq.gz", "s1_b.fq.gz", "s2.fq.gz", "sub/s2.fq.gz"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        write_fastq(tmp_path / name, 5, 5000, header="r{i} runid=1 ch=2")
+    autopop = AutoPop(["s1", "s2"], tmp_path, None)
+    assert autopop.files_to_samples == {
+        "s1": {"ont_simplex": [f"{tmp_path}/a_s1.fq.gz", f"{tmp_path}/s1_b.fq.gz"]},
+        "s2": {"ont_simplex": [f"{tmp_path}/s2.fq.gz", f"{tmp_path}/sub/s2.fq.gz"]},
+    }
+
+
+def test_glob_respects_excluded_files(tmp_path):
+    for lane in (1, 2, 3):
+        for mate in (1, 2):
+            header = ILLUMINA.format(lane=lane, mate=mate)
+            write_fastq(tmp_path / f"s1_L00{lane}_R{mate}_001.fastq.gz", 5, header=header)
+    autopop = AutoPop(["s1"], tmp_path, None, exclude=["*L003*"])
+    expected = [
+        f"{tmp_path}/s1_L00{lane}_R{mate}_001.fastq.gz" for lane in (1, 2) for mate in (1, 2)
+    ]
+    assert autopop.files_to_samples == {"s1": {"illumina": expected}}
+    autopop = AutoPop(["s1"], tmp_path, None)
+    assert autopop.files_to_samples == {"s1": {"illumina": f"{tmp_path}/s1_L00*_001.fastq.gz"}}
+
+
+@pytest.mark.parametrize(
+    "lanes,message",
+    [
+        ([(1, 1), (1, 2), (2, 1)], "expected 4 FASTQ files for paired-end data, found 3"),
+        ([(1, 1), (2, 2)], "R1 and R2 FASTQ files are from different lanes"),
+    ],
+)
+def test_paired_lanes_mismatch(tmp_path, lanes, message):
+    for lane, mate in lanes:
+        header = ILLUMINA.format(lane=lane, mate=mate)
+        write_fastq(tmp_path / f"pe_L00{lane}_R{mate}.fastq.gz", 5, header=header)
+    with pytest.raises(AutoPopError, match=message):
+        AutoPop(["pe"], tmp_path, None)
+
+
+@pytest.mark.bench
+def test_bench_auto_pop(tmp_path):
+    samples = write_run_dir(tmp_path, 5000)
+    start = time.perf_counter()
+    autopop = AutoPop(samples, tmp_path, None)
+    elapsed = time.perf_counter() - start
+    assert len(autopop.files_to_samples) == 5000
+    print(f"\nyeat-auto (5000 samples, 10000 FASTQs): {elapsed:.3f}s")
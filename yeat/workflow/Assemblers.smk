@@ -8,6 +8,9 @@
 # -------------------------------------------------------------------------------------------------
 
 from pathlib import Path
+from yeat.stats import write_assembly_stats
+from yeat.workflow.bandage import read_graph_manifest, render_graphs, write_graph_manifest
+from yeat.workflow.quast import split_quast_report
 
 
 rule spades:
@@ -15,7 +18,13 @@ rule spades:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/spades/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/spades/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -35,7 +44,13 @@ rule megahit:
         contigs="analysis/{sample}/yeat/megahit/{label}/contigs.fasta",
     conda:
         "yeat-megahit"
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         temp_outdir="analysis/{sample}/yeat/megahit/{label}/megahit-temp",
         outdir="analysis/{sample}/yeat/megahit/{label}",
@@ -45,7 +60,7 @@ rule megahit:
         "analysis/{sample}/yeat/megahit/{label}/megahit.log",
     shell:
         """
-        megahit {params.input_args} -t {threads} -o {params.temp_outdir} {params.extra_args} > {log} 2>&1
+        megahit {params.input_args} -t {threads} -m $(({resources.mem_mb} * 1048576)) -o {params.temp_outdir} {params.extra_args} > {log} 2>&1
         mv {params.temp_outdir}/* {params.outdir}
         rm -r {params.temp_outdir}
         ln -s final.contigs.fa {output.contigs}
@@ -57,7 +72,13 @@ rule unicycler:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/unicycler/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/unicycler/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -76,7 +97,13 @@ rule penguin:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/penguin/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/penguin/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -99,7 +126,13 @@ rule flye:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/flye/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/flye/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -118,7 +151,13 @@ rule canu:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/canu/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/canu/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -127,7 +166,7 @@ rule canu:
         "analysis/{sample}/yeat/canu/{label}/canu.log",
     shell:
         """
-        canu {params.input_args} maxThreads={threads} -p {wildcards.sample} -d {params.outdir} {params.extra_args} useGrid=false > {log} 2>&1
+        canu {params.input_args} maxThreads={threads} maxMemory=$(({resources.mem_mb} / 1024)) -p {wildcards.sample} -d {params.outdir} {params.extra_args} useGrid=false > {log} 2>&1
         ln -s {wildcards.sample}.contigs.fasta {output.contigs}
         """
 
@@ -137,7 +176,13 @@ rule hifiasm:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/hifiasm/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         prefix="analysis/{sample}/yeat/hifiasm/{label}/asm",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -157,7 +202,13 @@ rule hifiasm_meta:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/hifiasm_meta/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         prefix="analysis/{sample}/yeat/hifiasm_meta/{label}/asm",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -177,7 +228,13 @@ rule metamdbg:
         reads=lambda wc: config["asm_cfg"].get_assembler_input_files(wc.label, wc.sample),
     output:
         contigs="analysis/{sample}/yeat/metamdbg/{label}/contigs.fasta",
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/metamdbg/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -198,7 +255,13 @@ rule verkko:
         contigs="analysis/{sample}/yeat/verkko/{label}/contigs.fasta",
     conda:
         "yeat-verkko"
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/verkko/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -207,7 +270,7 @@ rule verkko:
         "analysis/{sample}/yeat/verkko/{label}/verkko.log",
     shell:
         """
-        verkko -d {params.outdir} {params.input_args} {params.extra_args} > {log} 2>&1
+        verkko -d {params.outdir} {params.input_args} --local-cpus {threads} --local-memory $(({resources.mem_mb} / 1024)) {params.extra_args} > {log} 2>&1
         ln -s assembly.fasta {output.contigs}
         """
 
@@ -219,7 +282,13 @@ rule myloasm:
         contigs="analysis/{sample}/yeat/myloasm/{label}/contigs.fasta",
     conda:
         "yeat-myloasm"
-    threads: 128
+    threads: lambda wc: config["asm_cfg"].get_assembler_threads(wc.label)
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_assembler_mem_mb(wc.label, input.size_mb),
+        runtime=lambda wc: config["asm_cfg"].get_assembler_runtime(wc.label),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("assembly", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         outdir="analysis/{sample}/yeat/myloasm/{label}",
         input_args=lambda wc: config["asm_cfg"].get_assembler_input_args(wc.label, wc.sample),
@@ -233,38 +302,131 @@ rule myloasm:
         """
 
 
+rule quast_sample:
+    input:
+        contigs=lambda wc: list(config["asm_cfg"].get_sample_contigs(wc.sample).values()),
+    output:
+        report="analysis/{sample}/yeat/quast/report.tsv",
+        html="analysis/{sample}/yeat/quast/report.html",
+    wildcard_constraints:
+        sample="[^/]+",
+    threads: config["asm_cfg"].get_rule_threads("quast")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("quast"),
+        runtime=config["asm_cfg"].get_rule_runtime("quast"),
+    params:
+        outdir="analysis/{sample}/yeat/quast",
+        labels=lambda wc: ",".join(config["asm_cfg"].get_sample_contigs(wc.sample)),
+    log:
+        "analysis/{sample}/yeat/quast/quast.log",
+    shell:
+        """
+        quast.py {input.contigs} -l {params.labels} -t {threads} -o {params.outdir} > {log} 2>&1
+        """
+
+
+rule quast_project:
+    input:
+        contigs=list(config["asm_cfg"].get_project_contigs().values()),
+    output:
+        report="analysis/quast/report.tsv",
+        html="analysis/quast/report.html",
+    threads: config["asm_cfg"].get_rule_threads("quast")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("quast"),
+        runtime=config["asm_cfg"].get_rule_runtime("quast"),
+    params:
+        outdir="analysis/quast",
+        labels=",".join(config["asm_cfg"].get_project_contigs()),
+    log:
+        "analysis/quast/quast.log",
+    shell:
+        """
+        quast.py {input.contigs} -l {params.labels} -t {threads} -o {params.outdir} > {log} 2>&1
+        """
+
+
 rule quast:
     input:
-        contigs="analysis/{sample}/yeat/{algorithm}/{label}/contigs.fasta",
+        report=rules.quast_sample.output.report,
+        html=rules.quast_sample.output.html,
     output:
         report="analysis/{sample}/yeat/{algorithm}/{label}/quast/report.html",
+        tsv="analysis/{sample}/yeat/{algorithm}/{label}/quast/report.tsv",
     params:
         outdir="analysis/{sample}/yeat/{algorithm}/{label}/quast",
-    log:
-        "analysis/{sample}/yeat/{algorithm}/{label}/quast/quast.log",
+    run:
+        split_quast_report(input.report, input.html, wildcards.label, params.outdir)
+
+
+rule stats:
+    input:
+        contigs="analysis/{sample}/yeat/{algorithm}/{label}/contigs.fasta",
+    output:
+        tsv="analysis/{sample}/yeat/{algorithm}/{label}/stats/report.tsv",
+        json="analysis/{sample}/yeat/{algorithm}/{label}/stats/report.json",
+    threads: config["asm_cfg"].get_rule_threads("stats")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("stats"),
+        runtime=config["asm_cfg"].get_rule_runtime("stats"),
+    run:
+        write_assembly_stats(input.contigs, wildcards.label, output.tsv, output.json)
+
+
+localrules:
+    graph_manifest,
+
+
+checkpoint graph_manifest:
+    input:
+        contigs="analysis/{sample}/yeat/{algorithm}/{label}/contigs.fasta",
+    output:
+        manifest="analysis/{sample}/yeat/{algorithm}/{label}/graphs.txt",
+    params:
+        label_dir="analysis/{sample}/yeat/{algorithm}/{label}",
+    run:
+        write_graph_manifest(config["asm_cfg"].get_assembler_graph_files(wildcards.label, params.label_dir), output.manifest)
+
+
+rule megahit_fastg:
+    input:
+        contigs="analysis/{sample}/yeat/megahit/{label}/intermediate_contigs/k{kmer}.contigs.fa",
+        manifest="analysis/{sample}/yeat/megahit/{label}/graphs.txt",
+    output:
+        fastg="analysis/{sample}/yeat/megahit/{label}/intermediate_contigs/k{kmer}.contigs.fastg",
+    wildcard_constraints:
+        kmer=r"\d+",
+    conda:
+        "yeat-megahit"
+    threads: config["asm_cfg"].get_rule_threads("contig2fastg")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("contig2fastg"),
+        runtime=config["asm_cfg"].get_rule_runtime("contig2fastg"),
     shell:
         """
-        quast.py {input.contigs} -o {params.outdir} > {log} 2>&1
+        megahit_toolkit contig2fastg {wildcards.kmer} {input.contigs} > {output.fastg}
         """
 
 
+def bandage_graphs(wildcards):
+    manifest = checkpoints.graph_manifest.get(**wildcards).output.manifest
+    return read_graph_manifest(manifest)
+
+
 rule bandage:
     input:
         contigs="analysis/{sample}/yeat/{algorithm}/{label}/contigs.fasta",
+        graphs=bandage_graphs,
     output:
         status="analysis/{sample}/yeat/{algorithm}/{label}/bandage/.done",
+    threads: config["asm_cfg"].get_rule_threads("bandage")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("bandage"),
+        runtime=config["asm_cfg"].get_rule_runtime("bandage"),
     params:
         outdir="analysis/{sample}/yeat/{algorithm}/{label}/bandage",
         label_dir="analysis/{sample}/yeat/{algorithm}/{label}",
-        gfa_files=lambda wc: config["asm_cfg"].assemblers[wc.label].gfa_files(wc.sample),
+        max_nodes=lambda wc: config["asm_cfg"].get_sample_bandage_max_nodes(wc.sample),
+        max_edges=lambda wc: config["asm_cfg"].get_sample_bandage_max_edges(wc.sample),
     run:
-        for gfa in params.gfa_files:
-            file_path = Path(gfa)
-            if file_path.stat().st_size == 0:
-                continue
-            remaining_path = file_path.relative_to(params.label_dir)
-            new_path = remaining_path.with_suffix(".jpg")
-            output_file = Path(params.outdir) / new_path
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            shell(f"Bandage image {file_path} {output_file}")
-        shell("touch {output.status}")
+        render_graphs(input.graphs, params.label_dir, params.outdir, output.status, threads, params.max_nodes, params.max_edges)
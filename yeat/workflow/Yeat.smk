@@ -10,7 +10,7 @@
 from yeat.config.config import AssemblyConfiguration
 
 
-asm_cfg = AssemblyConfiguration.parse_snakemake_config(config["config"])
+asm_cfg = AssemblyConfiguration.parse_snakemake_config(config["config"], config["max_mem_mb"], config["pipelined"])
 config["asm_cfg"] = asm_cfg
 
 
@@ -20,6 +20,7 @@ include: "Assemblers.smk"
 rule all:
     input:
         asm_cfg.targets,
+        ["analysis/quast/report.html"] if config["project_quast"] and asm_cfg.get_project_contigs() else [],
 
 
 module qc_paired_workflow:
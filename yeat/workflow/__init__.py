@@ -12,8 +12,13 @@ import json
 from pathlib import Path
 from random import randint
 import subprocess
+import sys
+import time
 import toml
+from yeat.config.config import AssemblyConfiguration
+from yeat.config.globs import resolve_globs
 from yeat.config.sample import READ_TYPES
+from yeat.workflow.qc.cache import QCCache
 
 
 def run_workflow(
@@ -23,11 +28,65 @@ def run_workflow(
     workdir=".",
     dry_run=False,
     copy_input=False,
+    checksum=None,
     slurm=False,
     max_jobs=1024,
+    mem_gb=None,
+    compression_level=6,
+    temp_intermediates=False,
+    project_quast=False,
+    pipelined=False,
+    qc_cache=None,
+    qc_cache_size_gb=None,
+    verbose=False,
+):
+    max_mem_mb = None if mem_gb is None else mem_gb * 1024
+    config_data = get_config_data(config, threads, verbose)
+    snakemake_config = write_snakemake_config(
+        config_data,
+        workdir,
+        seed=seed,
+        threads=threads,
+        dry_run=dry_run,
+        copy_input=copy_input,
+        checksum=checksum,
+        max_mem_mb=max_mem_mb,
+        compression_level=compression_level,
+        temp_intermediates=temp_intermediates,
+        project_quast=project_quast,
+        pipelined=pipelined,
+    )
+    command = snakemake_command(
+        snakemake_config, workdir, threads, dry_run, slurm, max_jobs, max_mem_mb
+    )
+    cache = None
+    qc_options = dict(
+        copy_input=copy_input,
+        checksum=checksum,
+        compression_level=compression_level,
+        temp_intermediates=temp_intermediates,
+    )
+    if qc_cache and not dry_run:
+        cache = QCCache(qc_cache, qc_cache_size_gb)
+        asm_cfg = AssemblyConfiguration.parse_snakemake_config(config_data)
+        cache.restore_samples(asm_cfg, workdir, seed, qc_options)
+    process = subprocess.run(command)
+    if process.returncode != 0:
+        raise RuntimeError("Snakemake Failed")
+    if cache:
+        cache.store_samples(asm_cfg, workdir, seed, qc_options)
+
+
+def snakemake_command(
+    snakemake_config,
+    workdir,
+    threads=1,
+    dry_run=False,
+    slurm=False,
+    max_jobs=1024,
+    max_mem_mb=None,
 ):
     snakefile = files("yeat") / "workflow" / "Yeat.smk"
-    snakemake_config = write_snakemake_config(config, seed, threads, workdir, dry_run, copy_input)
     command = [
         "snakemake",
         "--snakefile",
@@ -43,23 +102,15 @@ def run_workflow(
         command.extend(("--executor", "slurm", "--jobs", max_jobs))
     else:
         command.extend(("--cores", threads))
+        if max_mem_mb is not None:
+            command.extend(("--resources", f"mem_mb={max_mem_mb}"))
     if dry_run:
         command.append("--dryrun")
-    command = list(map(str, command))
-    process = subprocess.run(command)
-    if process.returncode != 0:
-        raise RuntimeError("Snakemake Failed")
+    return list(map(str, command))
 
 
-def write_snakemake_config(config, seed, threads, workdir, dry_run, copy_input):
-    snakemake_config = {
-        "config": get_config_data(config),
-        "seed": seed,
-        "threads": threads,
-        "workdir": workdir,
-        "dry_run": dry_run,
-        "copy_input": copy_input,
-    }
+def write_snakemake_config(config_data, workdir, **settings):
+    snakemake_config = {"config": config_data, "workdir": workdir, **settings}
     Path(workdir).mkdir(parents=True, exist_ok=True)
     config_file = f"{workdir}/snakemake.cfg"
     with open(config_file, "w") as f:
@@ -67,14 +118,25 @@ def write_snakemake_config(config, seed, threads, workdir, dry_run, copy_input):
     return config_file
 
 
-def get_config_data(infile):
+def get_config_data(infile, threads=1, verbose=False):
+    start = time.perf_counter()
     data = toml.load(open(infile))
-    for sample_label, sample_data in data["samples"].items():
+    if "sample_sheet" in data:
+        data["sample_sheet"] = str(Path(infile).parent.resolve() / data["sample_sheet"])
+    patterns = dict()
+    for sample_label, sample_data in data.get("samples", {}).items():
         for readtype, reads in sample_data.items():
             if readtype not in READ_TYPES:
                 continue
             if isinstance(reads, str):
-                reads = Path(reads).resolve()
-                reads = list(reads.parent.glob(reads.name))
+                patterns[(sample_label, readtype)] = reads
+                continue
             data["samples"][sample_label][readtype] = [str(read) for read in reads]
+    matches, num_directories = resolve_globs(patterns.values(), threads)
+    for (sample_label, readtype), reads in patterns.items():
+        data["samples"][sample_label][readtype] = matches[reads]
+    if verbose:
+        elapsed = time.perf_counter() - start
+        message = f"[yeat] loaded {len(data.get('samples', {}))} samples from {infile}: resolved {len(patterns)} read paths in {num_directories} directories in {elapsed:.3f}s"
+        print(message, file=sys.stderr)
     return data
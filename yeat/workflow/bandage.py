@@ -0,0 +1,82 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from pathlib import Path
+import subprocess
+
+
+def graph_size(path, max_nodes=0, max_edges=0):
+    # Stops counting as soon as either limit is exceeded; the graph is skipped either way
+    nodes, edges = 0, 0
+    fastg = Path(path).suffix == ".fastg"
+    with open(path, "rb") as fh:
+        for line in fh:
+            if fastg:
+                if not line.startswith(b">"):
+                    continue
+                name, _, neighbors = line[1:].rstrip(b";\r\n").partition(b":")
+                if name.endswith(b"'"):
+                    continue
+                nodes += 1
+                edges += len(neighbors.split(b",")) if neighbors else 0
+            elif line.startswith(b"S\t"):
+                nodes += 1
+            elif line.startswith(b"L\t"):
+                edges += 1
+            if (max_nodes and nodes > max_nodes) or (max_edges and edges > max_edges):
+                break
+    return nodes, edges
+
+
+def render_graphs(graphs, label_dir, outdir, status, threads=1, max_nodes=0, max_edges=0):
+    jobs, rows = list(), list()
+    for graph in graphs:
+        graph = Path(graph)
+        if graph.stat().st_size == 0:
+            continue
+        nodes, edges = graph_size(graph, max_nodes, max_edges)
+        if (max_nodes and nodes > max_nodes) or (max_edges and edges > max_edges):
+            rows.append((graph, nodes, edges, "skipped"))
+            continue
+        image = Path(outdir) / graph.relative_to(label_dir).with_suffix(".jpg")
+        image.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append((graph, image))
+        rows.append((graph, nodes, edges, "rendered"))
+    with ThreadPoolExecutor(max_workers=max(threads, 1)) as pool:
+        for (graph, image), process in zip(jobs, pool.map(lambda job: render_graph(*job), jobs)):
+            if process.returncode != 0:
+                stderr = process.stderr.decode(errors="replace").strip()
+                message = f"Bandage failed to render {graph} (exit status {process.returncode})"
+                raise BandageError(f"{message}: {stderr}" if stderr else message)
+    with open(status, "w", newline="") as fh:
+        writer = csv.writer(fh, delimiter="\t", lineterminator="\n")
+        writer.writerow(("Graph", "Nodes", "Edges", "Status"))
+        writer.writerows(rows)
+    return rows
+
+
+def render_graph(graph, image):
+    return subprocess.run(["Bandage", "image", str(graph), str(image)], capture_output=True)
+
+
+def write_graph_manifest(graphs, path):
+    with open(path, "w") as fh:
+        for graph in graphs:
+            print(graph, file=fh)
+
+
+def read_graph_manifest(path):
+    with open(path, "r") as fh:
+        return [line.rstrip("\n") for line in fh if line.strip()]
+
+
+class BandageError(ValueError):
+    pass
@@ -7,20 +7,33 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
-from yeat.workflow.qc.aux import copy_input
+from yeat.workflow.qc.aux import copy_input, link_input
+from yeat.workflow.qc.compress import compress_command
+from yeat.workflow.qc.downsample import Downsample, downsample_long
+from yeat.workflow.qc.genome_size import write_genome_size_report
+from yeat.workflow.qc.outputs import checksum_outputs, intermediate
 
 
 rule copy_input:
     input:
         read=lambda wc: config["asm_cfg"].get_sample_input_files(wc.sample, wc.platform),
     output:
+        **checksum_outputs(config, read="analysis/{sample}/qc/{platform}/read.fastq.gz"),
         read="analysis/{sample}/qc/{platform}/read.fastq.gz",
     wildcard_constraints:
         platform="ont_simplex|ont_duplex|ont_ultralong|pacbio_hifi",
+    threads: config["asm_cfg"].get_rule_threads("copy_input")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("copy_input"),
+        runtime=config["asm_cfg"].get_rule_runtime("copy_input"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("copy_input", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         do_copy=config["copy_input"],
+        checksum=config["checksum"],
     run:
-        copy_input(input.read[0], output.read, params.do_copy)
+        copy_input(input.read, output.read, params.do_copy, params.checksum, threads)
 
 
 rule fastqc:
@@ -30,7 +43,10 @@ rule fastqc:
         html="analysis/{sample}/qc/{platform}/fastqc/read_fastqc.html",
     wildcard_constraints:
         platform="ont_simplex|ont_duplex|ont_ultralong|pacbio_hifi",
-    threads: 128
+    threads: config["asm_cfg"].get_rule_threads("fastqc")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("fastqc"),
+        runtime=config["asm_cfg"].get_rule_runtime("fastqc"),
     params:
         outdir="analysis/{sample}/qc/{platform}/fastqc",
     log:
@@ -45,35 +61,83 @@ rule chopper:
     input:
         read=rules.copy_input.output.read,
     output:
-        read="analysis/{sample}/qc/{platform}/chopper/read.fastq.gz",
+        read=intermediate("analysis/{sample}/qc/{platform}/chopper/read.fastq.gz", config),
     wildcard_constraints:
         platform="ont_simplex|ont_duplex|ont_ultralong|pacbio_hifi",
-    threads: 128
+    threads: config["asm_cfg"].get_rule_threads("chopper")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("chopper"),
+        runtime=config["asm_cfg"].get_rule_runtime("chopper"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("chopper", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         symlink_read="../read.fastq.gz",
         skip_filter=lambda wc: config["asm_cfg"].get_sample_skip_filter(wc.sample),
         quality=lambda wc: config["asm_cfg"].get_sample_quality(wc.sample),
         min_length=lambda wc: config["asm_cfg"].get_sample_min_length(wc.sample),
+        level=1 if config["temp_intermediates"] else config["compression_level"],
     run:
         if params.skip_filter:
             Path(output.read).symlink_to(params.symlink_read)
             return
-        shell("chopper -t {threads} -q {params.quality} -l {params.min_length} -i {input.read} | gzip > {output.read}")
+        compressor = compress_command(threads, params.level)
+        shell("chopper -t {threads} -q {params.quality} -l {params.min_length} -i {input.read} | {compressor} > {output.read}")
+
+
+rule genome_size:
+    input:
+        reads=lambda wc: config["asm_cfg"].get_sample_input_files(wc.sample, wc.platform),
+    output:
+        report="analysis/{sample}/qc/{platform}/genome_size/report.tsv",
+    wildcard_constraints:
+        platform="ont_simplex|ont_duplex|ont_ultralong|pacbio_hifi",
+    threads: config["asm_cfg"].get_rule_threads("genome_size")
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_genome_size_mem_mb(wc.sample, input.size_mb),
+        runtime=config["asm_cfg"].get_rule_runtime("genome_size"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("genome_size", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
+    params:
+        max_bases=lambda wc: config["asm_cfg"].get_sample_genome_size_bases(wc.sample),
+        skip=lambda wc: not config["asm_cfg"].get_sample_needs_genome_size(wc.sample),
+    run:
+        write_genome_size_report(input.reads, output.report, params.max_bases, params.skip)
 
 
 rule downsample:
     input:
         read=rules.chopper.output.read,
+        genome_size_report=rules.genome_size.output.report,
     output:
         read="analysis/{sample}/qc/{platform}/downsample/read.fastq.gz",
+        index=update("analysis/{sample}/qc/{platform}/downsample/read.fqidx"),
     wildcard_constraints:
         platform="ont_simplex|ont_duplex|ont_ultralong|pacbio_hifi",
+    threads: config["asm_cfg"].get_rule_threads("downsample")
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_downsample_mem_mb(wc.sample, input.size_mb),
+        runtime=config["asm_cfg"].get_rule_runtime("downsample"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("downsample", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         symlink_read="../chopper/read.fastq.gz",
         seed=config["seed"],
+        level=config["compression_level"],
+        keep_input=config["temp_intermediates"],
         target_num_reads=lambda wc: config["asm_cfg"].get_sample_target_num_reads(wc.sample),
+        genome_size=lambda wc: config["asm_cfg"].get_sample_genome_size(wc.sample),
+        target_coverage_depth=lambda wc: config["asm_cfg"].get_sample_target_coverage_depth(wc.sample),
+        prefer_longest=lambda wc: config["asm_cfg"].get_sample_prefer_longest(wc.sample),
     run:
+        Path(output.index).touch()
         if params.target_num_reads == -1:
-            Path(output.read).symlink_to(params.symlink_read)
+            if params.keep_input:
+                link_input(input.read, output.read)
+            else:
+                Path(output.read).symlink_to(params.symlink_read)
             return
-        shell("seqtk sample -s {params.seed} {input.read} {params.target_num_reads} | gzip > {output.read}")
+        downsample = Downsample.parse_long(params.genome_size, input.genome_size_report, params.target_coverage_depth, params.target_num_reads)
+        downsample_long(input.read, output.read, params.seed, params.target_num_reads, downsample.get_num_bases(), params.prefer_longest, threads, params.level, output.index)
@@ -7,21 +7,48 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
-from yeat.workflow.qc.aux import copy_input
-from yeat.workflow.qc.downsample import Downsample
+from yeat.workflow.qc.aux import copy_inputs
+from yeat.workflow.qc.downsample import Downsample, downsample_paired, filter_and_downsample
+from yeat.workflow.qc.genome_size import write_genome_size_report
+from yeat.workflow.qc.outputs import checksum_outputs, intermediate
+
+
+def downsample_reads(wildcards):
+    qc_dir = f"analysis/{wildcards.sample}/qc/illumina"
+    reads_dir = f"{qc_dir}/fastp"
+    if config["asm_cfg"].get_sample_fused_downsample(wildcards.sample):
+        reads_dir = qc_dir
+    return {
+        "r1": f"{reads_dir}/R1.fastq.gz",
+        "r2": f"{reads_dir}/R2.fastq.gz",
+    }
 
 
 rule copy_input:
     input:
         reads=lambda wc: config["asm_cfg"].get_sample_input_files(wc.sample, "illumina"),
     output:
+        **checksum_outputs(
+            config,
+            r1="analysis/{sample}/qc/illumina/R1.fastq.gz",
+            r2="analysis/{sample}/qc/illumina/R2.fastq.gz",
+        ),
         r1="analysis/{sample}/qc/illumina/R1.fastq.gz",
         r2="analysis/{sample}/qc/illumina/R2.fastq.gz",
+    threads: config["asm_cfg"].get_rule_threads("copy_input")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("copy_input"),
+        runtime=config["asm_cfg"].get_rule_runtime("copy_input"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("copy_input", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         do_copy=config["copy_input"],
+        checksum=config["checksum"],
+        mates=lambda wc: config["asm_cfg"].get_sample_read_groups(wc.sample, "illumina"),
     run:
-        copy_input(input.reads[0], output.r1, params.do_copy)
-        copy_input(input.reads[1], output.r2, params.do_copy)
+        jobs = [(params.mates[0], output.r1), (params.mates[1], output.r2)]
+        copy_inputs(jobs, params.do_copy, params.checksum, threads)
 
 
 rule fastqc:
@@ -31,7 +58,10 @@ rule fastqc:
     output:
         r1_html="analysis/{sample}/qc/illumina/fastqc/R1_fastqc.html",
         r2_html="analysis/{sample}/qc/illumina/fastqc/R2_fastqc.html",
-    threads: 128
+    threads: config["asm_cfg"].get_rule_threads("fastqc")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("fastqc"),
+        runtime=config["asm_cfg"].get_rule_runtime("fastqc"),
     params:
         outdir="analysis/{sample}/qc/illumina/fastqc",
     log:
@@ -47,8 +77,15 @@ rule fastp:
         r1=rules.copy_input.output.r1,
         r2=rules.copy_input.output.r2,
     output:
-        r1="analysis/{sample}/qc/illumina/fastp/R1.fastq.gz",
-        r2="analysis/{sample}/qc/illumina/fastp/R2.fastq.gz",
+        r1=intermediate("analysis/{sample}/qc/illumina/fastp/R1.fastq.gz", config),
+        r2=intermediate("analysis/{sample}/qc/illumina/fastp/R2.fastq.gz", config),
+    threads: config["asm_cfg"].get_rule_threads("fastp")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("fastp"),
+        runtime=config["asm_cfg"].get_rule_runtime("fastp"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("fastp", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         symlink_r1="../R1.fastq.gz",
         symlink_r2="../R2.fastq.gz",
@@ -57,51 +94,76 @@ rule fastp:
         txt_report="analysis/{sample}/qc/illumina/fastp/report.txt",
         skip_filter=lambda wc: config["asm_cfg"].get_sample_skip_filter(wc.sample),
         min_length=lambda wc: config["asm_cfg"].get_sample_min_length(wc.sample),
+        level=1 if config["temp_intermediates"] else config["compression_level"],
     run:
         if params.skip_filter:
             Path(output.r1).symlink_to(params.symlink_r1)
             Path(output.r2).symlink_to(params.symlink_r2)
             return
-        cmd = "fastp -i {input.r1} -I {input.r2} -o {output.r1} -O {output.r2} -l {params.min_length} --detect_adapter_for_pe --html {params.html_report} --json {params.json_report} 2> {params.txt_report}"
+        cmd = "fastp -i {input.r1} -I {input.r2} -o {output.r1} -O {output.r2} -l {params.min_length} -w {threads} -z {params.level} --detect_adapter_for_pe --html {params.html_report} --json {params.json_report} 2> {params.txt_report}"
         shell(cmd)
 
 
-rule mash:
+rule genome_size:
     input:
-        r1=rules.copy_input.output.r1,
+        reads=lambda wc: config["asm_cfg"].get_sample_input_files(wc.sample, "illumina"),
     output:
-        sketch="analysis/{sample}/qc/illumina/mash/R1.fastq.gz.msh",
-        mash_report="analysis/{sample}/qc/illumina/mash/report.tsv",
-    shell:
-        """
-        mash sketch {input.r1} -o {output.sketch}
-        mash info -t {output.sketch} > {output.mash_report}
-        """
+        report="analysis/{sample}/qc/illumina/genome_size/report.tsv",
+    threads: config["asm_cfg"].get_rule_threads("genome_size")
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_genome_size_mem_mb(wc.sample, input.size_mb),
+        runtime=config["asm_cfg"].get_rule_runtime("genome_size"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("genome_size", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
+    params:
+        max_bases=lambda wc: config["asm_cfg"].get_sample_genome_size_bases(wc.sample),
+        skip=lambda wc: not config["asm_cfg"].get_sample_needs_genome_size(wc.sample),
+    run:
+        write_genome_size_report(input.reads, output.report, params.max_bases, params.skip)
 
 
 rule downsample:
     input:
-        r1=rules.fastp.output.r1,
-        r2=rules.fastp.output.r2,
-        mash_report=rules.mash.output.mash_report,
+        unpack(downsample_reads),
+        genome_size_report=rules.genome_size.output.report,
     output:
         r1="analysis/{sample}/qc/illumina/downsample/R1.fastq.gz",
         r2="analysis/{sample}/qc/illumina/downsample/R2.fastq.gz",
+        r1_index=update("analysis/{sample}/qc/illumina/downsample/R1.fqidx"),
+        r2_index=update("analysis/{sample}/qc/illumina/downsample/R2.fqidx"),
+    threads: config["asm_cfg"].get_rule_threads("downsample")
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_downsample_mem_mb(wc.sample, input.size_mb),
+        runtime=config["asm_cfg"].get_rule_runtime("downsample"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("downsample", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         symlink_r1="../R1.fastq.gz",
         symlink_r2="../R2.fastq.gz",
         fastp_report="analysis/{sample}/qc/illumina/fastp/fastp.json",
-        outdir="analysis/{sample}/qc/illumina/downsample",
+        html_report="analysis/{sample}/qc/illumina/fastp/fastp.html",
+        txt_report="analysis/{sample}/qc/illumina/fastp/report.txt",
+        fused=lambda wc: config["asm_cfg"].get_sample_fused_downsample(wc.sample),
+        min_length=lambda wc: config["asm_cfg"].get_sample_min_length(wc.sample),
         seed=config["seed"],
+        level=config["compression_level"],
         target_num_reads=lambda wc: config["asm_cfg"].get_sample_target_num_reads(wc.sample),
         genome_size=lambda wc: config["asm_cfg"].get_sample_genome_size(wc.sample),
         target_coverage_depth=lambda wc: config["asm_cfg"].get_sample_target_coverage_depth(wc.sample),
     run:
+        Path(output.r1_index).touch()
+        Path(output.r2_index).touch()
         if params.target_num_reads == -1:
             Path(output.r1).symlink_to(params.symlink_r1)
             Path(output.r2).symlink_to(params.symlink_r2)
             return
-        downsample = Downsample.parse_data(params.genome_size, input.mash_report, params.fastp_report, params.target_coverage_depth, params.target_num_reads)
+        if params.fused:
+            downsample = Downsample.parse_reads(params.genome_size, input.genome_size_report, input.r1, params.target_coverage_depth, params.target_num_reads)
+            fastp_args = ["-l", params.min_length, "-w", threads, "--detect_adapter_for_pe", "--html", params.html_report, "--json", params.fastp_report]
+            filter_and_downsample([input.r1, input.r2], [output.r1, output.r2], downsample.get_num_reads(), params.seed, fastp_args, params.txt_report, threads, params.level)
+            return
+        downsample = Downsample.parse_data(params.genome_size, input.genome_size_report, params.fastp_report, params.target_coverage_depth, params.target_num_reads)
         num_reads = downsample.get_num_reads()
-        shell("seqtk sample -s {params.seed} {input.r1} {num_reads} | gzip > {params.outdir}/R1.fastq.gz")
-        shell("seqtk sample -s {params.seed} {input.r2} {num_reads} | gzip > {params.outdir}/R2.fastq.gz")
+        downsample_paired(input.r1, input.r2, output.r1, output.r2, num_reads, params.seed, threads, params.level, [output.r1_index, output.r2_index])
@@ -8,18 +8,37 @@
 # -------------------------------------------------------------------------------------------------
 
 from yeat.workflow.qc.aux import copy_input
-from yeat.workflow.qc.downsample import Downsample
+from yeat.workflow.qc.downsample import Downsample, downsample_long, filter_and_downsample
+from yeat.workflow.qc.genome_size import write_genome_size_report
+from yeat.workflow.qc.outputs import checksum_outputs, intermediate
+
+
+def downsample_reads(wildcards):
+    qc_dir = f"analysis/{wildcards.sample}/qc/illumina"
+    reads_dir = f"{qc_dir}/fastp"
+    if config["asm_cfg"].get_sample_fused_downsample(wildcards.sample):
+        reads_dir = qc_dir
+    return {"read": f"{reads_dir}/read.fastq.gz"}
 
 
 rule copy_input:
     input:
         read=lambda wc: config["asm_cfg"].get_sample_input_files(wc.sample, "illumina"),
     output:
+        **checksum_outputs(config, read="analysis/{sample}/qc/illumina/read.fastq.gz"),
         read="analysis/{sample}/qc/illumina/read.fastq.gz",
+    threads: config["asm_cfg"].get_rule_threads("copy_input")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("copy_input"),
+        runtime=config["asm_cfg"].get_rule_runtime("copy_input"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("copy_input", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         do_copy=config["copy_input"],
+        checksum=config["checksum"],
     run:
-        copy_input(input.read[0], output.read, params.do_copy)
+        copy_input(input.read, output.read, params.do_copy, params.checksum, threads)
 
 
 rule fastqc:
@@ -27,7 +46,10 @@ rule fastqc:
         read=rules.copy_input.output.read,
     output:
         html="analysis/{sample}/qc/illumina/fastqc/read_fastqc.html",
-    threads: 128
+    threads: config["asm_cfg"].get_rule_threads("fastqc")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("fastqc"),
+        runtime=config["asm_cfg"].get_rule_runtime("fastqc"),
     params:
         outdir="analysis/{sample}/qc/illumina/fastqc",
     log:
@@ -42,7 +64,14 @@ rule fastp:
     input:
         read=rules.copy_input.output.read,
     output:
-        read="analysis/{sample}/qc/illumina/fastp/read.fastq.gz",
+        read=intermediate("analysis/{sample}/qc/illumina/fastp/read.fastq.gz", config),
+    threads: config["asm_cfg"].get_rule_threads("fastp")
+    resources:
+        mem_mb=config["asm_cfg"].get_rule_mem_mb("fastp"),
+        runtime=config["asm_cfg"].get_rule_runtime("fastp"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("fastp", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         symlink_read="../read.fastq.gz",
         html_report="analysis/{sample}/qc/illumina/fastp/fastp.html",
@@ -50,45 +79,70 @@ rule fastp:
         txt_report="analysis/{sample}/qc/illumina/fastp/report.txt",
         skip_filter=lambda wc: config["asm_cfg"].get_sample_skip_filter(wc.sample),
         min_length=lambda wc: config["asm_cfg"].get_sample_min_length(wc.sample),
+        level=1 if config["temp_intermediates"] else config["compression_level"],
     run:
         if params.skip_filter:
             Path(output.read).symlink_to(params.symlink_read)
             return
-        cmd = "fastp -i {input.read} -o {output.read} -l {params.min_length} --detect_adapter_for_pe --html {params.html_report} --json {params.json_report} 2> {params.txt_report}"
+        cmd = "fastp -i {input.read} -o {output.read} -l {params.min_length} -w {threads} -z {params.level} --detect_adapter_for_pe --html {params.html_report} --json {params.json_report} 2> {params.txt_report}"
         shell(cmd)
 
 
-rule mash:
+rule genome_size:
     input:
-        read=rules.copy_input.output.read,
+        reads=lambda wc: config["asm_cfg"].get_sample_input_files(wc.sample, "illumina"),
     output:
-        sketch="analysis/{sample}/qc/illumina/mash/read.fastq.gz.msh",
-        mash_report="analysis/{sample}/qc/illumina/mash/report.tsv",
-    shell:
-        """
-        mash sketch {input.read} -o {output.sketch}
-        mash info -t {output.sketch} > {output.mash_report}
-        """
+        report="analysis/{sample}/qc/illumina/genome_size/report.tsv",
+    threads: config["asm_cfg"].get_rule_threads("genome_size")
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_genome_size_mem_mb(wc.sample, input.size_mb),
+        runtime=config["asm_cfg"].get_rule_runtime("genome_size"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("genome_size", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
+    params:
+        max_bases=lambda wc: config["asm_cfg"].get_sample_genome_size_bases(wc.sample),
+        skip=lambda wc: not config["asm_cfg"].get_sample_needs_genome_size(wc.sample),
+    run:
+        write_genome_size_report(input.reads, output.report, params.max_bases, params.skip)
 
 
 rule downsample:
     input:
-        read=rules.fastp.output.read,
-        mash_report=rules.mash.output.mash_report,
+        unpack(downsample_reads),
+        genome_size_report=rules.genome_size.output.report,
     output:
         read="analysis/{sample}/qc/illumina/downsample/read.fastq.gz",
+        index=update("analysis/{sample}/qc/illumina/downsample/read.fqidx"),
+    threads: config["asm_cfg"].get_rule_threads("downsample")
+    resources:
+        mem_mb=lambda wc, input: config["asm_cfg"].get_downsample_mem_mb(wc.sample, input.size_mb),
+        runtime=config["asm_cfg"].get_rule_runtime("downsample"),
+    priority: lambda wc: config["asm_cfg"].get_rule_priority("downsample", wc.sample)
+    group:
+        config["asm_cfg"].get_rule_group()
     params:
         symlink_read="../read.fastq.gz",
         fastp_report="analysis/{sample}/qc/illumina/fastp/fastp.json",
-        outdir="analysis/{sample}/qc/illumina/downsample",
+        html_report="analysis/{sample}/qc/illumina/fastp/fastp.html",
+        txt_report="analysis/{sample}/qc/illumina/fastp/report.txt",
+        fused=lambda wc: config["asm_cfg"].get_sample_fused_downsample(wc.sample),
+        min_length=lambda wc: config["asm_cfg"].get_sample_min_length(wc.sample),
         seed=config["seed"],
+        level=config["compression_level"],
         target_num_reads=lambda wc: config["asm_cfg"].get_sample_target_num_reads(wc.sample),
         genome_size=lambda wc: config["asm_cfg"].get_sample_genome_size(wc.sample),
         target_coverage_depth=lambda wc: config["asm_cfg"].get_sample_target_coverage_depth(wc.sample),
     run:
+        Path(output.index).touch()
         if params.target_num_reads == -1:
             Path(output.read).symlink_to(params.symlink_read)
             return
-        downsample = Downsample.parse_data(params.genome_size, input.mash_report, params.fastp_report, params.target_coverage_depth, params.target_num_reads)
+        if params.fused:
+            downsample = Downsample.parse_reads(params.genome_size, input.genome_size_report, input.read, params.target_coverage_depth, params.target_num_reads)
+            fastp_args = ["-l", params.min_length, "-w", threads, "--detect_adapter_for_pe", "--html", params.html_report, "--json", params.fastp_report]
+            filter_and_downsample([input.read], [output.read], downsample.get_num_reads(paired=False), params.seed, fastp_args, params.txt_report, threads, params.level)
+            return
+        downsample = Downsample.parse_data(params.genome_size, input.genome_size_report, params.fastp_report, params.target_coverage_depth, params.target_num_reads)
         num_reads = downsample.get_num_reads(paired=False)
-        shell("seqtk sample -s {params.seed} {input.read} {num_reads} | gzip > {params.outdir}/read.fastq.gz")
+        downsample_long(input.read, output.read, params.seed, num_reads, threads=threads, level=params.level, index_path=output.index)
@@ -7,12 +7,197 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
 from pathlib import Path
-from shutil import copy
+from shutil import copyfile, copyfileobj
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
-def copy_input(input, output, do_copy):
-    if do_copy:
-        copy(input, output)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+FICLONE = 0x40049409  # Linux ioctl cloning a whole file (XFS, Btrfs, bcachefs, ZFS 2.2+)
+CHUNK_SIZE = 64 * 1024**2  # bytes per task in a parallel copy
+BUFFER_SIZE = 1024**2
+CHECKSUMS = ("md5", "sha1", "sha256", "blake2b") + (("xxh64", "xxh3_64") if xxhash else ())
+
+
+def copy_inputs(jobs, do_copy, checksum=None, threads=1):
+    # jobs: (input, output) pairs, such as the R1 and R2 files of a sample, handled concurrently
+    with ThreadPoolExecutor(max_workers=max(1, min(threads, len(jobs)))) as executor:
+        workers = max(1, threads // len(jobs))
+        futures = [
+            executor.submit(copy_input, input, output, do_copy, checksum, workers)
+            for input, output in jobs
+        ]
+        for future in futures:
+            future.result()
+
+
+def copy_input(input, output, do_copy, checksum=None, threads=1):
+    inputs = [input] if isinstance(input, (str, os.PathLike)) else list(input)
+    if len(inputs) > 1:
+        digest = concatenate_input(inputs, output, checksum)
+    elif do_copy:
+        digest = copy_file(inputs[0], output, checksum, threads)
+    else:
+        Path(output).symlink_to(inputs[0])
+        digest = hash_file(inputs[0], checksum) if checksum else None
+    if checksum:
+        write_checksum(output, digest, checksum)
+
+
+def copy_file(source, output, checksum=None, threads=1):
+    # A reflink shares the data copy-on-write, so the copy is independent of the source but costs
+    # no I/O. A hardlink would share the inode, and Snakemake's touch of the finished output would
+    # then change the user's file, so anything else is copied byte for byte
+    source = os.path.realpath(source)
+    if reflink(source, output):
+        return hash_file(output, checksum) if checksum else None
+    if checksum:
+        return stream_copy([source], output, checksum)
+    chunked_copy(source, output, threads)
+    return None
+
+
+def reflink(source, output):
+    if fcntl is None:
+        return False  # pragma: no cover
+    with open(source, "rb") as src, open(output, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            pass
+    os.unlink(output)
+    return False
+
+
+def chunked_copy(source, output, threads=1):
+    size = os.path.getsize(source)
+    with open(source, "rb") as src, open(output, "wb") as dst:
+        dst.truncate(size)
+        offsets = range(0, size, CHUNK_SIZE)
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            tasks = [
+                executor.submit(copy_range, src.fileno(), dst.fileno(), offset, size)
+                for offset in offsets
+            ]
+            for task in tasks:
+                task.result()
+
+
+def copy_range(src_fd, dst_fd, offset, size):
+    end = min(offset + CHUNK_SIZE, size)
+    while offset < end:
+        try:
+            copied = os.copy_file_range(src_fd, dst_fd, end - offset, offset, offset)
+        except (AttributeError, OSError):
+            data = os.pread(src_fd, min(BUFFER_SIZE, end - offset), offset)
+            copied = os.pwrite(dst_fd, data, offset)
+        if copied == 0:
+            raise CopyInputError(f"unexpected end of file while copying at offset {offset}")
+        offset += copied
+
+
+def concatenate_input(inputs, output, checksum=None):
+    # A series of gzip members is itself a valid gzip file, so lanes are joined into one stream
+    # without decompressing them; copy_file_range keeps the copy in the kernel and lets
+    # filesystems that support it share extents instead of writing the data again
+    compressed = {is_gzip(path) for path in inputs}
+    if len(compressed) > 1:
+        message = f"cannot combine gzip-compressed and uncompressed FASTQ files: {inputs}"
+        raise CopyInputError(message)
+    if checksum:
+        return stream_copy(inputs, output, checksum)
+    with open(output, "wb", buffering=0) as out:
+        for path in inputs:
+            with open(path, "rb", buffering=0) as fh:
+                append_file(fh, out)
+    return None
+
+
+def append_file(fh, out):
+    remaining = os.fstat(fh.fileno()).st_size
+    if hasattr(os, "copy_file_range"):
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fh.fileno(), out.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            pass
+    copyfileobj(fh, out)
+
+
+def stream_copy(inputs, output, checksum):
+    # The checksum is computed from the same buffers that are written, while the previous buffer
+    # is being written, so the data are read once
+    hasher = new_hasher(checksum)
+    with open(output, "wb", buffering=0) as out, ThreadPoolExecutor(max_workers=1) as writer:
+        pending = None
+        for path in inputs:
+            with open(path, "rb", buffering=0) as fh:
+                while buffer := fh.read(BUFFER_SIZE):
+                    hasher.update(buffer)
+                    if pending:
+                        pending.result()
+                    pending = writer.submit(out.write, buffer)
+        if pending:
+            pending.result()
+    return hasher.hexdigest()
+
+
+def hash_file(path, checksum):
+    hasher = new_hasher(checksum)
+    with open(path, "rb", buffering=0) as fh:
+        while buffer := fh.read(BUFFER_SIZE):
+            hasher.update(buffer)
+    return hasher.hexdigest()
+
+
+def new_hasher(checksum):
+    if checksum not in CHECKSUMS:
+        raise CopyInputError(f"unsupported checksum '{checksum}'; expected one of {CHECKSUMS}")
+    if checksum.startswith("xxh"):
+        return getattr(xxhash, checksum)()
+    return hashlib.new(checksum)
+
+
+def write_checksum(output, digest, checksum):
+    # Same layout as sha256sum and friends, so `sha256sum -c R1.fastq.gz.sha256` verifies a copy
+    with open(f"{output}.{checksum}", "w") as fh:
+        print(f"{digest}  {os.path.basename(output)}", file=fh)
+
+
+def is_gzip(path):
+    with open(path, "rb") as fh:
+        return fh.read(2) == GZIP_MAGIC
+
+
+def link_input(input, output):
+    # The input is a temporary file that is about to be removed. If it is a symlink, its target
+    # outlives it and may be the user's reads, which a hardlink would expose to Snakemake's touch
+    # of the output, so the output points at the target instead; a file the workflow wrote itself
+    # is hardlinked, or copied across filesystems
+    if os.path.islink(input):
+        Path(output).symlink_to(os.path.realpath(input))
         return
-    Path(output).symlink_to(input)
+    try:
+        os.link(input, output)
+    except OSError:
+        copyfile(input, output)
+
+
+class CopyInputError(ValueError):
+    pass
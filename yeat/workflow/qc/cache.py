@@ -0,0 +1,116 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from hashlib import sha256
+from importlib.metadata import version
+import json
+import os
+from pathlib import Path
+from shutil import copy2, copytree, rmtree
+from uuid import uuid4
+from yeat.config.global_settings import GlobalSettings
+from yeat.config.sample import READ_TYPES
+
+
+class QCCache:
+    def __init__(self, root, max_size_gb=None):
+        self.root = Path(root)
+        self.entries = self.root / "entries"
+        self.max_size = None if max_size_gb is None else max_size_gb * 1024**3
+        self.entries.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(sample, read_type, seed, options=None):
+        # options: workflow options that change what QC writes, such as copy_input or the
+        # compression level, none of which are in the sample settings
+        inputs = list()
+        for read in sample.data[read_type]:
+            path = os.path.realpath(read)
+            stat = os.stat(path)
+            inputs.append((path, stat.st_size, stat.st_mtime_ns))
+        settings = {key: sample.data.get(key) for key in GlobalSettings.model_fields}
+        data = {
+            "version": version("yeat"),
+            "read_type": read_type,
+            "inputs": inputs,
+            "settings": settings,
+            "seed": seed if sample.target_num_reads != -1 else None,
+            "options": options or dict(),
+        }
+        return sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    def restore(self, key, destination):
+        entry = self.entries / key
+        if not (entry / "data").is_dir() or Path(destination).exists():
+            return False
+        Path(destination).parent.mkdir(parents=True, exist_ok=True)
+        copytree(entry / "data", destination, symlinks=True, copy_function=link_or_copy)
+        os.utime(entry / "entry.json")
+        return True
+
+    def store(self, key, source):
+        entry = self.entries / key
+        if entry.exists() or not Path(source).is_dir():
+            return False
+        staging = self.root / f"tmp-{uuid4().hex}"
+        copytree(source, staging / "data", symlinks=True, copy_function=link_or_copy)
+        with open(staging / "entry.json", "w") as fh:
+            json.dump({"size": directory_size(staging / "data")}, fh)
+        try:
+            staging.rename(entry)
+        except OSError:
+            rmtree(staging)
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        if self.max_size is None:
+            return
+        entries = list()
+        for entry in self.entries.iterdir():
+            metadata = entry / "entry.json"
+            with open(metadata, "r") as fh:
+                size = json.load(fh)["size"]
+            entries.append((metadata.stat().st_mtime, size, entry))
+        total_size = sum(size for last_used, size, entry in entries)
+        for last_used, size, entry in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            rmtree(entry)
+            total_size -= size
+
+    def restore_samples(self, asm_cfg, workdir, seed, options=None):
+        for sample, read_type, key in self._iter_keys(asm_cfg, seed, options):
+            self.restore(key, Path(workdir) / f"analysis/{sample.label}/qc/{read_type}")
+
+    def store_samples(self, asm_cfg, workdir, seed, options=None):
+        for sample, read_type, key in self._iter_keys(asm_cfg, seed, options):
+            self.store(key, Path(workdir) / f"analysis/{sample.label}/qc/{read_type}")
+
+    def _iter_keys(self, asm_cfg, seed, options=None):
+        for sample in asm_cfg.samples.values():
+            for read_type in READ_TYPES & sample.data.keys():
+                yield sample, read_type, self.key(sample, read_type, seed, options)
+
+
+def link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except OSError:
+        copy2(source, destination)
+
+
+def directory_size(path):
+    size = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            stat = os.lstat(os.path.join(dirpath, filename))
+            size += stat.st_size
+    return size
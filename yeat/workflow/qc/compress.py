@@ -0,0 +1,106 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from shutil import which
+import struct
+import zlib
+
+try:
+    from isal import isal_zlib as deflate_backend
+
+    MAX_LEVEL = 3
+except ImportError:
+    try:
+        from zlib_ng import zlib_ng as deflate_backend
+    except ImportError:
+        deflate_backend = zlib
+    MAX_LEVEL = 9
+
+
+BGZF_BLOCK_SIZE = 0xFF00
+BGZF_HEADER = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+BLOCKS_PER_TASK = 16
+
+
+def compress_command(threads=1, level=6):
+    if which("bgzip"):
+        return f"bgzip -c -@ {threads} -l {level}"
+    if which("pigz"):
+        return f"pigz -c -p {threads} -{level}"
+    return f"gzip -c -{max(1, level)}"
+
+
+def compress_block(data, level=6):
+    compressor = deflate_backend.compressobj(min(level, MAX_LEVEL), zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    block_size = len(BGZF_HEADER) + 2 + len(deflated) + 8
+    return b"".join(
+        (
+            BGZF_HEADER,
+            struct.pack("<H", block_size - 1),
+            deflated,
+            struct.pack("<II", deflate_backend.crc32(data), len(data)),
+        )
+    )
+
+
+def compress_blocks(data, level=6):
+    blocks = list()
+    for offset in range(0, len(data), BGZF_BLOCK_SIZE):
+        blocks.append(compress_block(data[offset : offset + BGZF_BLOCK_SIZE], level))
+    return b"".join(blocks)
+
+
+class BgzfWriter:
+    def __init__(self, path, threads=1, level=6):
+        self.handle = open(path, "wb")
+        self.level = level
+        self.threads = max(1, threads)
+        self.executor = ThreadPoolExecutor(self.threads) if self.threads > 1 else None
+        self.pending = deque()
+        self.buffer = bytearray()
+        self.chunk_size = BGZF_BLOCK_SIZE * BLOCKS_PER_TASK
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, data):
+        self.buffer += data
+        while len(self.buffer) >= self.chunk_size:
+            self._submit(bytes(self.buffer[: self.chunk_size]))
+            del self.buffer[: self.chunk_size]
+
+    def close(self):
+        if self.handle.closed:
+            return
+        if self.buffer:
+            self._submit(bytes(self.buffer))
+            self.buffer.clear()
+        self._drain(0)
+        self.handle.write(BGZF_EOF)
+        self.handle.close()
+        if self.executor:
+            self.executor.shutdown()
+
+    def _submit(self, chunk):
+        if self.executor is None:
+            self.handle.write(compress_blocks(chunk, self.level))
+            return
+        self.pending.append(self.executor.submit(compress_blocks, chunk, self.level))
+        self._drain(2 * self.threads)
+
+    def _drain(self, max_pending):
+        while len(self.pending) > max_pending:
+            self.handle.write(self.pending.popleft().result())
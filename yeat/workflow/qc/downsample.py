@@ -7,14 +7,37 @@
 # Development Center.
 # -------------------------------------------------------------------------------------------------
 
+from .compress import BgzfWriter
+from .fastq import (
+    FastqFormatError,
+    check_pair,
+    open_fastq,
+    read_fastq,
+    read_interleaved,
+    read_pairs,
+)
+from .mash import get_genome_size
+from .seek_index import FastqIndex, LineReader
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from heapq import heappop, heappush
+from itertools import islice
 import json
-import pandas as pd
+from math import exp, floor, log
+from pathlib import Path
 from pydantic import BaseModel
+from random import Random
+import subprocess
+from typing import Optional
+
+
+MIN_SAMPLED_CHUNKS = 64
+MAX_INDEXED_FRACTION = 0.5
 
 
 class Downsample(BaseModel):
     genome_size: int
-    average_read_length: int
+    average_read_length: Optional[int] = None
     target_coverage_depth: int
     target_num_reads: int
 
@@ -29,12 +52,30 @@ class Downsample(BaseModel):
             target_num_reads=target_num_reads,
         )
 
+    @classmethod
+    def parse_reads(
+        cls, genome_size, mash_report, read_path, target_coverage_depth, target_num_reads
+    ):
+        return cls(
+            genome_size=cls._get_genome_size(genome_size, mash_report),
+            average_read_length=cls._estimate_average_read_length(read_path),
+            target_coverage_depth=target_coverage_depth,
+            target_num_reads=target_num_reads,
+        )
+
+    @classmethod
+    def parse_long(cls, genome_size, mash_report, target_coverage_depth, target_num_reads):
+        return cls(
+            genome_size=cls._get_genome_size(genome_size, mash_report),
+            target_coverage_depth=target_coverage_depth,
+            target_num_reads=target_num_reads,
+        )
+
     @staticmethod
     def _get_genome_size(genome_size, mash_report):
         if genome_size != 0:
             return genome_size
-        df = pd.read_csv(mash_report, sep="\t")
-        return int(df["Length"].iloc[0])
+        return get_genome_size(mash_report)
 
     @staticmethod
     def _get_average_read_length(fastp_report):
@@ -44,8 +85,193 @@ class Downsample(BaseModel):
         read_count = data["summary"]["after_filtering"]["total_reads"]
         return base_count / read_count
 
+    @staticmethod
+    def _estimate_average_read_length(read_path, num_reads=10000):
+        with open_fastq(read_path) as fh:
+            lengths = [
+                len(record.split(b"\n", 2)[1]) for record in islice(read_fastq(fh), num_reads)
+            ]
+        if not lengths:
+            raise DownsampleError(f"no reads found in {read_path}")
+        return round(sum(lengths) / len(lengths))
+
     def get_num_reads(self, paired=True):
         if self.target_num_reads != 0:
             return self.target_num_reads
         avl = 2 * self.average_read_length if paired else self.average_read_length
         return int((self.genome_size * self.target_coverage_depth) / avl)
+
+    def get_num_bases(self):
+        return self.genome_size * self.target_coverage_depth
+
+
+def reservoir_sample(records, num_records, seed):
+    if num_records <= 0:
+        return list()
+    rng = Random(seed)
+    records = enumerate(records)
+    reservoir = list(islice(records, num_records))
+    if len(reservoir) < num_records:
+        return [record for index, record in reservoir]
+    weight = exp(log(_uniform(rng)) / num_records)
+    while weight < 1:
+        skip = floor(log(_uniform(rng)) / log(1 - weight))
+        selected = next(islice(records, skip, None), None)
+        if selected is None:
+            break
+        reservoir[rng.randrange(num_records)] = selected
+        weight *= exp(log(_uniform(rng)) / num_records)
+    reservoir.sort(key=lambda item: item[0])
+    return [record for index, record in reservoir]
+
+
+def sample_bases(records, num_bases, seed, longest=False):
+    if num_bases <= 0:
+        return list()
+    rng = Random(seed)
+    heap = list()  # max-heap of the kept reads, worst first
+    total_bases = 0
+    for index, record in enumerate(records):
+        length = len(record.split(b"\n", 2)[1])
+        priority = rng.random() - length if longest else rng.random()
+        if total_bases >= num_bases and priority >= -heap[0][0]:
+            continue
+        heappush(heap, (-priority, index, length, record))
+        total_bases += length
+        while total_bases - heap[0][2] >= num_bases:
+            total_bases -= heappop(heap)[2]
+    return [record for priority, index, length, record in sorted(heap, key=lambda item: item[1])]
+
+
+def _uniform(rng):
+    value = rng.random()
+    while value == 0.0:
+        value = rng.random()  # pragma: no cover
+    return value
+
+
+def indexed_sample(paths, indexes, num_records, seed, threads=1):
+    # Whole chunks between seek index restart points are drawn at random until they hold enough
+    # records, so a small fraction reads a matching slice of the file; None means the reads are
+    # better streamed: a file that is not indexed, too large a fraction, or too few chunks for the
+    # draw to be representative
+    if any(index is None for index in indexes):
+        return None
+    num_available = indexes[0].num_records
+    if any(index.num_records != num_available for index in indexes):
+        raise FastqFormatError("paired FASTQ files contain a different number of reads")
+    if num_records <= 0 or num_records >= num_available:
+        return None
+    fraction = num_records / num_available
+    if fraction > MAX_INDEXED_FRACTION or indexes[0].num_chunks * fraction < MIN_SAMPLED_CHUNKS:
+        return None
+    ranges = sample_ranges(indexes[0].chunk_bounds(), num_records, seed)
+    columns = list()
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        for path, index in zip(paths, indexes):
+            chunks = executor.map(lambda bounds: index.read_range(path, *bounds), ranges)
+            columns.append([record for chunk in chunks for record in chunk])
+    records = list(zip(*columns))
+    if len(paths) == 2:
+        for r1, r2 in records:
+            check_pair(r1, r2)
+    return reservoir_sample(records, num_records, seed)
+
+
+def sample_ranges(bounds, num_records, seed):
+    rng = Random(seed)
+    chunks = [chunk for chunk in range(len(bounds) - 1) if bounds[chunk + 1] > bounds[chunk]]
+    rng.shuffle(chunks)
+    selected, total = list(), 0
+    for chunk in chunks:
+        if total >= num_records:
+            break
+        selected.append(chunk)
+        total += bounds[chunk + 1] - bounds[chunk]
+    ranges = list()
+    for chunk in sorted(selected):
+        if ranges and ranges[-1][1] == bounds[chunk]:
+            ranges[-1] = (ranges[-1][0], bounds[chunk + 1])
+        else:
+            ranges.append((bounds[chunk], bounds[chunk + 1]))
+    return ranges
+
+
+def downsample_paired(
+    r1_in, r2_in, r1_out, r2_out, num_reads, seed, threads=1, level=6, index_paths=None
+):
+    paths = [r1_in, r2_in]
+    index_paths = index_paths or [None, None]
+    indexes = load_indexes(paths, index_paths, threads)
+    pairs = indexed_sample(paths, indexes, num_reads, seed, threads)
+    if pairs is None:
+        with LineReader(r1_in) as r1_handle, LineReader(r2_in) as r2_handle:
+            pairs = reservoir_sample(read_pairs(r1_handle, r2_handle), num_reads, seed)
+    write_records([r1_out, r2_out], pairs, threads, level)
+
+
+def downsample_long(
+    read_in,
+    read_out,
+    seed,
+    num_reads=0,
+    num_bases=0,
+    longest=False,
+    threads=1,
+    level=6,
+    index_path=None,
+):
+    # Only a sample of a given number of reads is drawn through the index
+    index_path = index_path if num_reads > 0 else None
+    indexes = load_indexes([read_in], [index_path], threads)
+    reads = indexed_sample([read_in], indexes, num_reads, seed, threads)
+    if reads is None:
+        with LineReader(read_in) as fh:
+            if num_reads > 0:
+                reads = reservoir_sample(read_fastq(fh), num_reads, seed)
+            else:
+                reads = sample_bases(read_fastq(fh), num_bases, seed, longest)
+            reads = [(read,) for read in reads]
+    write_records([read_out], reads, threads, level)
+
+
+def load_indexes(paths, index_paths, threads=1):
+    return [
+        FastqIndex.load(path, index_path, threads) if index_path else None
+        for path, index_path in zip(paths, index_paths)
+    ]
+
+
+def filter_and_downsample(inputs, outputs, num_reads, seed, fastp_args, log, threads=1, level=6):
+    command = ["fastp", "--stdout", "-i", inputs[0]]
+    if len(inputs) == 2:
+        command.extend(("-I", inputs[1]))
+    command = list(map(str, command + list(fastp_args)))
+    Path(log).parent.mkdir(parents=True, exist_ok=True)
+    with open(log, "w") as log_handle:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=log_handle) as process:
+            if len(inputs) == 2:
+                records = read_interleaved(process.stdout)
+            else:
+                records = ((record,) for record in read_fastq(process.stdout))
+            sample = reservoir_sample(records, num_reads, seed)
+            for _ in process.stdout:
+                pass  # drain the stream so fastp can finish its reports
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    write_records(outputs, sample, threads, level)
+
+
+def write_records(outputs, records, threads=1, level=6):
+    writer_threads = max(1, threads // len(outputs))
+    with ExitStack() as stack:
+        writers = [
+            stack.enter_context(BgzfWriter(path, writer_threads, level)) for path in outputs
+        ]
+        for record in records:
+            for writer, mate in zip(writers, record):
+                writer.write(mate)
+
+
+class DownsampleError(ValueError):
+    pass
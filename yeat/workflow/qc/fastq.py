@@ -0,0 +1,69 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import gzip
+from itertools import zip_longest
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_fastq(path):
+    with open(path, "rb") as fh:
+        magic = fh.read(2)
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_fastq(handle):
+    lines = iter(handle)
+    for header in lines:
+        try:
+            record = header + next(lines) + next(lines) + next(lines)
+        except StopIteration:
+            raise FastqFormatError(f"truncated FASTQ record: {header.decode().strip()}")
+        yield record
+
+
+def read_name(record):
+    name = record[1 : record.index(b"\n")].split(maxsplit=1)[0]
+    if name.endswith((b"/1", b"/2")):
+        return name[:-2]
+    return name
+
+
+def read_pairs(r1_handle, r2_handle):
+    for r1, r2 in zip_longest(read_fastq(r1_handle), read_fastq(r2_handle)):
+        if r1 is None or r2 is None:
+            raise FastqFormatError("paired FASTQ files contain a different number of reads")
+        check_pair(r1, r2)
+        yield r1, r2
+
+
+def read_interleaved(handle):
+    records = read_fastq(handle)
+    for r1 in records:
+        r2 = next(records, None)
+        if r2 is None:
+            raise FastqFormatError("interleaved FASTQ contains an odd number of reads")
+        check_pair(r1, r2)
+        yield r1, r2
+
+
+def check_pair(r1, r2):
+    if read_name(r1) != read_name(r2):
+        message = (
+            f"paired reads out of sync: {read_name(r1).decode()} vs. {read_name(r2).decode()}"
+        )
+        raise FastqFormatError(message)
+
+
+class FastqFormatError(ValueError):
+    pass
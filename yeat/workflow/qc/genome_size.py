@@ -0,0 +1,166 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from .fastq import open_fastq, read_fastq
+from .mash import write_mash_report
+from math import exp, factorial
+
+KMER_SIZE = 21
+SCALE = 64
+MIN_COUNT = 2
+CHUNK_BASES = 4 * 1024**2
+
+
+def write_genome_size_report(paths, report, max_bases=0, skip=False):
+    if skip:
+        write_mash_report(report, 0, 0, paths[0], "[estimate skipped]")
+        return
+    estimate = GenomeSizeEstimate.from_fastq(paths, max_bases)
+    comment = f"[{estimate.num_reads} seqs] [{estimate.num_bases} bases] k-mer estimate"
+    write_mash_report(report, estimate.num_hashes, estimate.genome_size, paths[0], comment)
+
+
+class GenomeSizeEstimate:
+    def __init__(self, k=KMER_SIZE, scale=SCALE, min_count=MIN_COUNT):
+        self.k = k
+        self.scale = scale
+        self.min_count = min_count
+        self.hashes = list()
+        self.num_reads = 0
+        self.num_bases = 0
+
+    @classmethod
+    def from_fastq(cls, paths, max_bases=0, **kwargs):
+        estimate = cls(**kwargs)
+        for sequences in read_sequence_chunks(paths, max_bases):
+            estimate.add(sequences)
+        return estimate
+
+    def add(self, sequences):
+        self.num_reads += len(sequences)
+        self.num_bases += sum(len(sequence) for sequence in sequences)
+        self.hashes.append(sketch(b"N".join(sequences), self.k, self.scale))
+
+    @property
+    def num_hashes(self):
+        return sum(len(hashes) for hashes in self.hashes)
+
+    @property
+    def genome_size(self):
+        import numpy as np
+
+        if not self.hashes:
+            return 0
+        hashes, counts = np.unique(np.concatenate(self.hashes), return_counts=True)
+        solid = counts[counts >= self.min_count]
+        if len(solid) == 0:
+            return int(len(hashes) * self.scale)
+        coverage = kmer_coverage(solid.mean(), self.min_count)
+        corrected = len(solid) / poisson_sf(self.min_count, coverage)
+        return int(min(corrected, len(hashes)) * self.scale)
+
+
+def read_sequence_chunks(paths, max_bases=0):
+    chunk, chunk_bases, total_bases = list(), 0, 0
+    for path in paths:
+        with open_fastq(path) as fh:
+            for record in read_fastq(fh):
+                sequence = record.split(b"\n", 2)[1].rstrip(b"\r")
+                chunk.append(sequence)
+                chunk_bases += len(sequence)
+                total_bases += len(sequence)
+                if max_bases and total_bases >= max_bases:
+                    yield chunk
+                    return
+                if chunk_bases >= CHUNK_BASES:
+                    yield chunk
+                    chunk, chunk_bases = list(), 0
+    if chunk:
+        yield chunk
+
+
+def sketch(sequence, k=KMER_SIZE, scale=SCALE):
+    import numpy as np
+
+    lookup = np.full(256, 4, dtype=np.uint8)
+    for code, bases in enumerate((b"Aa", b"Cc", b"Gg", b"Tt")):
+        lookup[list(bases)] = code
+    codes = lookup[np.frombuffer(sequence, dtype=np.uint8)]
+    num_kmers = len(codes) - k + 1
+    if num_kmers <= 0:
+        return np.empty(0, dtype=np.uint64)
+    invalid = codes == 4
+    codes = np.where(invalid, 0, codes).astype(np.uint64)
+    forward = pack_kmers(codes, k)
+    reverse = pack_kmers(3 - codes, k, reverse=True)
+    num_invalid = np.concatenate(([0], np.cumsum(invalid)))
+    valid = num_invalid[k:] == num_invalid[:-k]
+    hashes = mix64(np.minimum(forward, reverse)[valid])
+    if scale == 1:
+        return hashes
+    return hashes[hashes < np.uint64(2**64 // scale)]
+
+
+def pack_kmers(codes, k, reverse=False):
+    # Pack k-mers from words of length 1, 2, 4, ... in O(log k) array operations
+    words = {1: codes}
+    length = 1
+    while length * 2 <= k:
+        word = words[length]
+        size = len(codes) - 2 * length + 1
+        words[2 * length] = join_words(word[:size], word[length:], length, length, reverse)
+        length *= 2
+    kmers, kmer_length = None, 0
+    for length in sorted(words, reverse=True):
+        if not (k - kmer_length) & length:
+            continue
+        if kmers is None:
+            kmers, kmer_length = words[length], length
+            continue
+        size = len(codes) - kmer_length - length + 1
+        tail = words[length][kmer_length:]
+        kmers = join_words(kmers[:size], tail, kmer_length, length, reverse)
+        kmer_length += length
+    return kmers
+
+
+def join_words(head, tail, head_length, tail_length, reverse=False):
+    import numpy as np
+
+    tail = tail[: len(head)]
+    if reverse:
+        return head | (tail << np.uint64(2 * head_length))
+    return (head << np.uint64(2 * tail_length)) | tail
+
+
+def mix64(values):
+    import numpy as np
+
+    values = values ^ (values >> np.uint64(33))
+    values = values * np.uint64(0xFF51AFD7ED558CCD)
+    values = values ^ (values >> np.uint64(33))
+    values = values * np.uint64(0xC4CEB9FE1A85EC53)
+    return values ^ (values >> np.uint64(33))
+
+
+def poisson_sf(min_count, mean):
+    return 1 - sum(exp(-mean) * mean**i / factorial(i) for i in range(min_count))
+
+
+def kmer_coverage(solid_mean, min_count, tolerance=1e-6):
+    # Solve E[X | X >= min_count] = solid_mean for the Poisson mean of X
+    low, high = 0.0, float(solid_mean)
+    while high - low > tolerance:
+        mean = (low + high) / 2
+        truncated_mean = mean * poisson_sf(min_count - 1, mean) / poisson_sf(min_count, mean)
+        if truncated_mean < solid_mean:
+            low = mean
+        else:
+            high = mean
+    return (low + high) / 2
@@ -0,0 +1,38 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import csv
+
+
+def read_mash_report(path):
+    with open(path, "r", newline="") as fh:
+        reader = csv.reader(fh, delimiter="\t")
+        header = next(reader, None)
+        if header is None:
+            raise MashReportError(f"empty mash report: {path}")
+        header = [column.lstrip("#") for column in header]
+        return [dict(zip(header, row)) for row in reader if row]
+
+
+def get_genome_size(path):
+    rows = read_mash_report(path)
+    if not rows or "Length" not in rows[0]:
+        raise MashReportError(f"no sketch length in mash report: {path}")
+    return int(rows[0]["Length"])
+
+
+def write_mash_report(path, hashes, length, identifier, comment=""):
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh, delimiter="\t", lineterminator="\n")
+        writer.writerow(("#Hashes", "Length", "ID", "Comment"))
+        writer.writerow((hashes, length, identifier, comment))
+
+
+class MashReportError(ValueError):
+    pass
@@ -0,0 +1,22 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from snakemake.io import temp
+
+
+def intermediate(path, config):
+    if config["temp_intermediates"]:
+        return temp(path)
+    return path
+
+
+def checksum_outputs(config, **paths):
+    if not config["checksum"]:
+        return dict()
+    return {f"{name}_checksum": f"{path}.{config['checksum']}" for name, path in paths.items()}
@@ -0,0 +1,253 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+from .fastq import read_fastq
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+from itertools import islice
+import os
+import struct
+import zlib
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+INDEX_MAGIC = b"YEATFQI1"
+INDEX_HEADER = struct.Struct("<8sQqQB")
+BUFFER_SIZE = 1024**2
+PLAIN_CHUNK_SIZE = 1024**2
+BGZF_BLOCKS_PER_TASK = 64
+
+
+class FastqIndex:
+    # Restart points are places where reading can begin without any earlier data: BGZF blocks,
+    # gzip members, or fixed-size chunks of an uncompressed file. Each is stored with the number
+    # of newlines before it, which is enough to find the start of any record from there.
+    def __init__(self, offsets, newlines, size=0, mtime_ns=0, gzipped=True):
+        self.offsets = offsets
+        self.newlines = newlines
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.gzipped = gzipped
+
+    @classmethod
+    def load(cls, path, index_path, threads=1):
+        # BGZF and uncompressed files are indexed in parallel without inflating anything serially;
+        # a gzip file of ordinary members gets None, since finding its members means inflating all
+        # of it. Whether a file has an index thus depends on the file alone, not on what is cached
+        stat = os.stat(path)
+        with open(path, "rb") as fh:
+            header = fh.read(18)
+        if header[:2] == GZIP_MAGIC and not is_bgzf(header):
+            return None
+        if os.path.exists(index_path):
+            index = cls.read(index_path)
+            if index and (index.size, index.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return index
+        index = cls.build(path, threads)
+        index.write(index_path)
+        return index
+
+    @classmethod
+    def build(cls, path, threads=1):
+        stat = os.stat(path)
+        with open(path, "rb") as fh:
+            header = fh.read(18)
+            gzipped = header[:2] == GZIP_MAGIC
+            fh.seek(0)
+            if is_bgzf(header):
+                offsets, counts = index_bgzf(fh, threads)
+            elif gzipped:
+                offsets, counts = index_gzip_members(fh)
+            else:
+                offsets, counts = index_plain(fh, stat.st_size, threads)
+        newlines = array("Q", [0])
+        for count in counts:
+            newlines.append(newlines[-1] + count)
+        return cls(array("Q", offsets), newlines, stat.st_size, stat.st_mtime_ns, gzipped)
+
+    @classmethod
+    def read(cls, path):
+        with open(path, "rb") as fh:
+            header = fh.read(INDEX_HEADER.size)
+            if len(header) != INDEX_HEADER.size:
+                return None
+            magic, size, mtime_ns, num_chunks, gzipped = INDEX_HEADER.unpack(header)
+            if magic != INDEX_MAGIC:
+                return None
+            offsets, newlines = array("Q"), array("Q")
+            try:
+                offsets.fromfile(fh, num_chunks)
+                newlines.fromfile(fh, num_chunks + 1)
+            except EOFError:
+                return None
+        return cls(offsets, newlines, size, mtime_ns, bool(gzipped))
+
+    def write(self, path):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as fh:
+            header = (INDEX_MAGIC, self.size, self.mtime_ns, self.num_chunks, self.gzipped)
+            fh.write(INDEX_HEADER.pack(*header))
+            self.offsets.tofile(fh)
+            self.newlines.tofile(fh)
+        os.replace(temp_path, path)
+
+    @property
+    def num_chunks(self):
+        return len(self.offsets)
+
+    @property
+    def num_records(self):
+        return (self.newlines[-1] + 3) // 4
+
+    def chunk_bounds(self):
+        # Record j is read from the last restart point with fewer than 4j newlines before it
+        num_records = self.num_records
+        bounds = [0]
+        bounds.extend(min(count // 4 + 1, num_records) for count in self.newlines[1:-1])
+        bounds.append(num_records)
+        return bounds
+
+    def read_range(self, path, start, stop):
+        if start >= stop:
+            return list()
+        chunk = max(0, bisect_left(self.newlines, 4 * start, hi=self.num_chunks) - 1)
+        with open(path, "rb") as fh:
+            fh.seek(self.offsets[chunk])
+            handle = gzip.GzipFile(fileobj=fh) if self.gzipped else fh
+            lines = iter(handle)
+            skip = 4 * start - self.newlines[chunk]
+            next(islice(lines, skip, skip), None)
+            return list(islice(read_fastq(lines), stop - start))
+
+
+class LineReader:
+    # Iterates over the lines of a FASTQ file like open_fastq, but splits the inflated blocks into
+    # lines itself, which streams gzip data about twice as fast as gzip.open
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self.fh = open(self.path, "rb")
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fh.close()
+
+    def __iter__(self):
+        gzipped = self.fh.read(2) == GZIP_MAGIC
+        self.fh.seek(0)
+        partial = b""
+        for offset, data in read_blocks(self.fh, gzipped):
+            lines = (partial + data).splitlines(keepends=True)
+            partial = lines.pop() if lines and not lines[-1].endswith(b"\n") else b""
+            yield from lines
+        if partial:
+            yield partial
+
+
+def is_bgzf(header):
+    return (
+        header[:4] == b"\x1f\x8b\x08\x04"
+        and header[10:12] == b"\x06\x00"
+        and header[12:14] == b"BC"
+        and header[14:16] == b"\x02\x00"
+    )
+
+
+def index_bgzf(fh, threads=1):
+    # Block sizes are in the block headers, so the blocks are located without inflating anything
+    # and then inflated independently, in parallel, to count their lines
+    blocks = list()
+    offset = 0
+    while header := fh.read(18):
+        if not is_bgzf(header):
+            raise FastqIndexError(f"invalid BGZF block at offset {offset} in {fh.name}")
+        size = struct.unpack_from("<H", header, 16)[0] + 1
+        blocks.append((offset, size))
+        offset += size
+        fh.seek(offset)
+    batches = [
+        blocks[start : start + BGZF_BLOCKS_PER_TASK]
+        for start in range(0, len(blocks), BGZF_BLOCKS_PER_TASK)
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        tasks = [executor.submit(count_bgzf_lines, fh.fileno(), batch) for batch in batches]
+        counts = [count for task in tasks for count in task.result()]
+    return [offset for offset, size in blocks], counts
+
+
+def count_bgzf_lines(fd, blocks):
+    start = blocks[0][0]
+    end = blocks[-1][0] + blocks[-1][1]
+    data = os.pread(fd, end - start, start)
+    counts = list()
+    for offset, size in blocks:
+        block = data[offset - start + 18 : offset - start + size - 8]
+        counts.append(zlib.decompress(block, -15).count(b"\n"))
+    return counts
+
+
+def index_gzip_members(fh):
+    offsets, counts = list(), list()
+    for offset, data in read_blocks(fh, gzipped=True):
+        if offset is not None:
+            offsets.append(offset)
+            counts.append(0)
+        counts[-1] += data.count(b"\n")
+    return offsets, counts
+
+
+def read_blocks(fh, gzipped):
+    # Yields the data of a file piece by piece, each with the offset of the restart point it starts
+    # if there is one: every gzip member, whose boundaries are only known once the member before
+    # it has been inflated, or every PLAIN_CHUNK_SIZE bytes of an uncompressed file
+    if not gzipped:
+        offset = 0
+        while data := fh.read(PLAIN_CHUNK_SIZE):
+            yield offset, data
+            offset += len(data)
+        return
+    offset, start = 0, 0
+    restart = start
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    data = fh.read(BUFFER_SIZE)
+    while data:
+        yield restart, decompressor.decompress(data)
+        restart = None
+        if not decompressor.eof:
+            offset += len(data)
+            data = fh.read(BUFFER_SIZE)
+            continue
+        unused = decompressor.unused_data
+        offset += len(data) - len(unused)
+        data = unused or fh.read(BUFFER_SIZE)
+        if not data.strip(b"\x00"):
+            return
+        start = restart = offset
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    if offset:
+        raise FastqIndexError(f"truncated gzip member at offset {start} in {fh.name}")
+
+
+def index_plain(fh, size, threads=1):
+    offsets = list(range(0, size, PLAIN_CHUNK_SIZE)) or [0]
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        counts = list(
+            executor.map(
+                lambda offset: os.pread(fh.fileno(), PLAIN_CHUNK_SIZE, offset).count(b"\n"),
+                offsets,
+            )
+        )
+    return offsets, counts
+
+
+class FastqIndexError(ValueError):
+    pass
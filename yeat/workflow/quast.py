@@ -0,0 +1,47 @@
+# -------------------------------------------------------------------------------------------------
+# Copyright (c) 2025, DHS. This file is part of YEAT: http://github.com/bioforensics/yeat
+#
+# This software was prepared for the Department of Homeland Security (DHS) by the Battelle National
+# Biodefense Institute, LLC (BNBI) as part of contract HSHQDC-15-C-00064 to manage and operate the
+# National Biodefense Analysis and Countermeasures Center (NBACC), a Federally Funded Research and
+# Development Center.
+# -------------------------------------------------------------------------------------------------
+
+import csv
+import os
+from pathlib import Path
+
+
+def read_quast_report(path):
+    with open(path, "r", newline="") as fh:
+        rows = list(csv.reader(fh, delimiter="\t"))
+    if not rows or rows[0][0] != "Assembly":
+        raise QuastReportError(f"not a QUAST report: {path}")
+    labels = rows[0][1:]
+    return {label: [(row[0], row[i]) for row in rows[1:]] for i, label in enumerate(labels, 1)}
+
+
+def split_quast_report(report, html, label, outdir):
+    metrics = read_quast_report(report)
+    if label not in metrics:
+        labels = ", ".join(metrics)
+        raise QuastReportError(f"assembly '{label}' not found in {report}; found: {labels}")
+    metrics = metrics[label]
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    with open(outdir / "report.tsv", "w", newline="") as fh:
+        writer = csv.writer(fh, delimiter="\t", lineterminator="\n")
+        writer.writerow(("Assembly", label))
+        writer.writerows(metrics)
+    width = max([len("Assembly")] + [len(name) for name, value in metrics])
+    with open(outdir / "report.txt", "w") as fh:
+        for name, value in [("Assembly", label)] + metrics:
+            print(f"{name:<{width}}  {value}", file=fh)
+    html_link = outdir / "report.html"
+    if html_link.is_symlink() or html_link.exists():
+        html_link.unlink()
+    html_link.symlink_to(os.path.relpath(html, outdir))
+
+
+class QuastReportError(ValueError):
+    pass